@@ -0,0 +1,60 @@
+"""
+Runs the benchmarks without asv, reporting the time taken to import Ciw,
+and events per second and peak memory (as measured by tracemalloc) for
+each model and size:
+
+    python -m benchmarks [name ...]
+"""
+import itertools
+import subprocess
+import sys
+import time
+import tracemalloc
+from . import bench_engine, bench_import
+
+
+def benchmark_classes(names):
+    for name, obj in vars(bench_engine).items():
+        if isinstance(obj, type) and not name.startswith("_") and hasattr(obj, "simulate"):
+            if not names or name in names:
+                yield name, obj
+
+
+def time_in_fresh_interpreter(code, repeats=5):
+    """
+    Returns the fastest of a number of runs of the code in a fresh
+    interpreter, less the time taken to start the interpreter.
+    """
+    def fastest(code):
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", code], check=True)
+            times.append(time.perf_counter() - start)
+        return min(times)
+    return fastest(code) - fastest("pass")
+
+
+def main(names):
+    for name, obj in vars(bench_import).items():
+        if name.startswith("timeraw_") and (not names or name in names):
+            print(f"{name:<42}{time_in_fresh_interpreter(obj()):>10.3f}s")
+    classes = list(benchmark_classes(names))
+    if classes:
+        print(f"{'benchmark':<42}{'events':>10}{'events/s':>12}{'peak MiB':>10}")
+    for name, cls in classes:
+        bench = cls()
+        params = cls.params if isinstance(cls.params[0], list) else [cls.params]
+        for combination in itertools.product(*params):
+            tracemalloc.start()
+            start = time.perf_counter()
+            Q, number_of_events = bench.simulate(*combination)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            tracemalloc.stop()
+            label = f"{name}{list(combination)}"
+            print(f"{label:<42}{number_of_events:>10}{number_of_events / elapsed:>12.0f}{peak:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
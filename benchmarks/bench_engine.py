@@ -0,0 +1,206 @@
+"""
+Benchmarks of the simulation engine over its main scaling dimensions.
+
+These follow the conventions of airspeed velocity (asv): `time_` methods
+are timed, `peakmem_` methods report the peak memory of the process, and
+`track_` methods report the returned value. They can also be run without
+asv using `python -m benchmarks`.
+"""
+import time
+import ciw
+from . import models
+
+
+class _CountingSimulation(ciw.Simulation):
+    """
+    A simulation that counts its events as they are carried out, for
+    benchmarks that cannot count them through iter_events. Unlike a
+    profiler, this does not wrap any node methods.
+    """
+    number_of_events = 0
+
+    def event_and_return_nextnode(self, next_active_node):
+        self.number_of_events += 1
+        return super().event_and_return_nextnode(next_active_node)
+
+
+class _SimulationBenchmark:
+    """
+    Simulates a canonical model, for each size in params.
+    """
+    model = None
+    timeout = 120
+
+    def simulate(self, *params):
+        ciw.seed(0)
+        N, kwargs, max_time = self.model(*params)
+        Q = ciw.Simulation(N, **kwargs)
+        number_of_events = sum(1 for _ in Q.iter_events(max_time))
+        return Q, number_of_events
+
+    def time_simulate(self, *params):
+        self.simulate(*params)
+
+    def peakmem_simulate(self, *params):
+        self.simulate(*params)
+
+    def track_events_per_second(self, *params):
+        start = time.perf_counter()
+        Q, number_of_events = self.simulate(*params)
+        return number_of_events / (time.perf_counter() - start)
+
+    track_events_per_second.unit = "events/s"
+
+
+class MMC(_SimulationBenchmark):
+    model = staticmethod(models.mmc)
+    params = [1, 10, 100, 1000]
+    param_names = ["number_of_servers"]
+
+
+class TandemWithBlocking(_SimulationBenchmark):
+    model = staticmethod(models.tandem_with_blocking)
+    params = [2, 10, 50]
+    param_names = ["number_of_nodes"]
+
+
+class WideNetwork(_SimulationBenchmark):
+    model = staticmethod(models.wide_network)
+    params = [[5, 25, 100], [1, 5]]
+    param_names = ["number_of_nodes", "number_of_classes"]
+
+
+class SparseNetwork(_SimulationBenchmark):
+    model = staticmethod(models.sparse_network)
+    params = [10, 100, 800]
+    param_names = ["number_of_nodes"]
+
+
+class JoinShortestQueue(_SimulationBenchmark):
+    model = staticmethod(models.join_shortest_queue)
+    params = [[10, 100, 500], ["scan", "indexed", "power of 2"]]
+    param_names = ["number_of_nodes", "method"]
+
+
+class LongRoutes(_SimulationBenchmark):
+    model = staticmethod(models.long_routes)
+    params = [[100, 1000, 10000], ["list", "route table"]]
+    param_names = ["route_length", "routes"]
+
+
+class HeavyReneging(_SimulationBenchmark):
+    model = staticmethod(models.heavy_reneging)
+    params = [0.1, 0.01, 0.001]
+    param_names = ["reneging_rate"]
+
+
+class DynamicClasses(_SimulationBenchmark):
+    model = staticmethod(models.dynamic_classes)
+    params = [2, 5, 10]
+    param_names = ["number_of_classes"]
+
+
+class PreemptivePriorities(_SimulationBenchmark):
+    model = staticmethod(models.preemptive_priorities)
+    params = [1, 10, 100]
+    param_names = ["number_of_servers"]
+
+
+class ManyPriorities(_SimulationBenchmark):
+    model = staticmethod(models.many_priorities)
+    params = [2, 50, 500]
+    param_names = ["number_of_classes"]
+
+
+class ShortestProcessingTime(_SimulationBenchmark):
+    model = staticmethod(models.shortest_processing_time)
+    params = ["list", "heap"]
+    param_names = ["discipline"]
+
+
+class Baulking(_SimulationBenchmark):
+    model = staticmethod(models.baulking)
+    params = ["function", "table"]
+    param_names = ["method"]
+
+
+class BatchArrivals(_SimulationBenchmark):
+    model = staticmethod(models.batch_arrivals)
+    params = [1, 10, 100]
+    param_names = ["batch_size"]
+
+
+class PoissonIntervals(_SimulationBenchmark):
+    model = staticmethod(models.poisson_intervals)
+    params = [10 ** 4, 10 ** 6]
+    param_names = ["max_sample_date"]
+
+
+class TimeDependentService(_SimulationBenchmark):
+    model = staticmethod(models.time_dependent_service)
+    params = ["conditions", "piecewise"]
+    param_names = ["method"]
+
+
+class ProcessorSharing(_SimulationBenchmark):
+    model = staticmethod(models.processor_sharing)
+    params = [0.5, 0.9, 0.98]
+    param_names = ["traffic_intensity"]
+
+
+class SlottedSchedule(_SimulationBenchmark):
+    model = staticmethod(models.slotted_schedule)
+    params = [10, 100, 1000]
+    param_names = ["number_of_slots"]
+
+
+class PreemptiveShifts(_SimulationBenchmark):
+    model = staticmethod(models.preemptive_shifts)
+    params = [1, 10, 100]
+    param_names = ["number_of_servers"]
+
+
+class DeadlockDetection(_SimulationBenchmark):
+    model = staticmethod(models.deadlocking_ring)
+    params = [2, 5, 10]
+    param_names = ["number_of_nodes"]
+
+    def simulate(self, *params):
+        ciw.seed(0)
+        N, kwargs, max_time = self.model(*params)
+        Q = _CountingSimulation(N, **kwargs)
+        Q.simulate_until_deadlock()
+        return Q, Q.number_of_events
+
+
+class Tandem(_SimulationBenchmark):
+    model = staticmethod(models.tandem)
+    params = [2, 10, 50]
+    param_names = ["number_of_nodes"]
+
+
+class FastPathMMC(_SimulationBenchmark):
+    """
+    The same M/M/c queues as MMC, using the vectorised fast path. The
+    number of events counted is the number of arrivals and service ends
+    the event engine would have carried out.
+    """
+    model = staticmethod(models.mmc)
+    params = [1, 10, 100, 1000]
+    param_names = ["number_of_servers"]
+
+    def simulate(self, *params):
+        ciw.seed(0)
+        N, kwargs, max_time = self.model(*params)
+        Q = ciw.Simulation(N, fast_path=True, **kwargs)
+        Q.simulate_until_max_time(max_time)
+        return Q, Q.nodes[0].number_of_individuals + len(Q.get_all_records())
+
+
+class FastPathTandem(FastPathMMC):
+    """
+    The same tandem lines as Tandem, using the vectorised fast path.
+    """
+    model = staticmethod(models.tandem)
+    params = [2, 10, 50]
+    param_names = ["number_of_nodes"]
@@ -0,0 +1,22 @@
+"""
+Benchmarks of the time taken to import Ciw, each measured in a fresh
+interpreter.
+"""
+
+SIMULATE = """
+import ciw
+N = ciw.create_network(
+    arrival_distributions=[ciw.dists.Exponential(1.0)],
+    service_distributions=[ciw.dists.Exponential(2.0)],
+    number_of_servers=[1],
+)
+ciw.Simulation(N).simulate_until_max_time(10)
+"""
+
+
+def timeraw_import_ciw():
+    return "import ciw"
+
+
+def timeraw_import_ciw_and_simulate():
+    return SIMULATE
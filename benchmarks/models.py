@@ -0,0 +1,407 @@
+"""
+Canonical models used by the benchmarks.
+
+Each function takes the size of the model and returns a tuple of
+(network, simulation keyword arguments, max simulation time). Where
+possible the max simulation time is scaled so that each size carries out
+a comparable number of events, so events per second reflect per-event cost.
+"""
+import ciw
+
+EVENTS = 20000
+
+
+def mmc(number_of_servers):
+    """
+    An M/M/c queue at 90% utilisation.
+    """
+    N = ciw.create_network(
+        arrival_distributions=[ciw.dists.Exponential(0.9 * number_of_servers)],
+        service_distributions=[ciw.dists.Exponential(1.0)],
+        number_of_servers=[number_of_servers],
+    )
+    return N, {}, EVENTS / (2 * 0.9 * number_of_servers)
+
+
+def tandem_with_blocking(number_of_nodes):
+    """
+    A long line of single server nodes with small queueing capacities,
+    so that customers are frequently blocked.
+    """
+    N = ciw.create_network(
+        arrival_distributions=[ciw.dists.Exponential(1.0)] + [None] * (number_of_nodes - 1),
+        service_distributions=[ciw.dists.Exponential(1.2) for _ in range(number_of_nodes)],
+        number_of_servers=[1] * number_of_nodes,
+        queue_capacities=[float("inf")] + [2] * (number_of_nodes - 1),
+        routing=ciw.routing.NetworkRouting(
+            routers=[ciw.routing.Direct(to=i + 2) for i in range(number_of_nodes - 1)] + [ciw.routing.Leave()]
+        ),
+    )
+    return N, {}, EVENTS / (number_of_nodes + 1)
+
+
+def tandem(number_of_nodes):
+    """
+    A long line of single server nodes with infinite queueing capacities.
+    """
+    N = ciw.create_network(
+        arrival_distributions=[ciw.dists.Exponential(1.0)] + [None] * (number_of_nodes - 1),
+        service_distributions=[ciw.dists.Exponential(1.2) for _ in range(number_of_nodes)],
+        number_of_servers=[1] * number_of_nodes,
+        routing=ciw.routing.NetworkRouting(
+            routers=[ciw.routing.Direct(to=i + 2) for i in range(number_of_nodes - 1)] + [ciw.routing.Leave()]
+        ),
+    )
+    return N, {}, EVENTS / (number_of_nodes + 1)
+
+
+def wide_network(number_of_nodes, number_of_classes):
+    """
+    A network of many multi-server nodes and customer classes, where
+    every node routes to every other node.
+    """
+    class_names = [f"Class {i}" for i in range(number_of_classes)]
+    row = [0.5 / number_of_nodes] * number_of_nodes
+    N = ciw.create_network(
+        arrival_distributions={
+            clss: [ciw.dists.Exponential(1.0 / number_of_classes)] * number_of_nodes for clss in class_names
+        },
+        service_distributions={
+            clss: [ciw.dists.Exponential(1.0)] * number_of_nodes for clss in class_names
+        },
+        number_of_servers=[3] * number_of_nodes,
+        routing={clss: [row[:] for _ in range(number_of_nodes)] for clss in class_names},
+    )
+    return N, {}, EVENTS / (5 * number_of_nodes)
+
+
+def sparse_network(number_of_nodes):
+    """
+    A large network where each node routes to only three others, with
+    the transition matrix given sparsely as a dictionary of rows.
+    """
+    N = ciw.create_network(
+        arrival_distributions=[ciw.dists.Exponential(10.0 / number_of_nodes)] * number_of_nodes,
+        service_distributions=[ciw.dists.Exponential(1.0)] * number_of_nodes,
+        number_of_servers=[3] * number_of_nodes,
+        routing=ciw.routing.TransitionMatrix({
+            node: {(node + step - 1) % number_of_nodes + 1: 0.25 for step in (1, 7, 31)}
+            for node in range(1, number_of_nodes + 1)
+        }),
+    )
+    return N, {}, EVENTS / 80
+
+
+def join_shortest_queue(number_of_nodes, method):
+    """
+    A dispatcher sending customers to many parallel single server
+    nodes at 90% utilisation, using join the shortest queue. The method
+    is one of "scan", comparing every node for each decision, "indexed",
+    keeping an index of the nodes by queue size, or "power of 2",
+    sampling two nodes for each decision.
+    """
+    router_kwargs = {"scan": {}, "indexed": {"indexed": True}, "power of 2": {"sample_size": 2}}[method]
+    N = ciw.create_network(
+        arrival_distributions=[ciw.dists.Exponential(0.9 * number_of_nodes)] + [None] * number_of_nodes,
+        service_distributions=[ciw.dists.Deterministic(0.0)] + [ciw.dists.Exponential(1.0)] * number_of_nodes,
+        number_of_servers=[float("inf")] + [1] * number_of_nodes,
+        routing=ciw.routing.NetworkRouting(
+            routers=[ciw.routing.JoinShortestQueue(destinations=list(range(2, number_of_nodes + 2)), **router_kwargs)]
+            + [ciw.routing.Leave()] * number_of_nodes
+        ),
+    )
+    return N, {}, EVENTS / (4 * 0.9 * number_of_nodes)
+
+
+def long_routes(route_length, routes):
+    """
+    Customers following long process-based routes around a ring of
+    infinite server nodes, so that many long routes are held at once.
+    The routes are one of "list", a new list for each customer, or
+    "route table", ids of ten routes shared by all customers.
+    """
+    number_of_nodes = 10
+    table = [[(start + step) % number_of_nodes + 1 for step in range(route_length)] for start in range(number_of_nodes)]
+    if routes == "list":
+        routing = ciw.routing.ProcessBased(lambda ind, simulation: list(table[ind.id_number % number_of_nodes]))
+    else:
+        routing = ciw.routing.ProcessBased(lambda ind, simulation: ind.id_number % number_of_nodes, routes=table)
+    N = ciw.create_network(
+        arrival_distributions=[ciw.dists.Exponential(100.0)] + [None] * (number_of_nodes - 1),
+        service_distributions=[ciw.dists.Exponential(1.0)] * number_of_nodes,
+        number_of_servers=[float("inf")] * number_of_nodes,
+        routing=routing,
+    )
+    return N, {}, 20.0
+
+
+def heavy_reneging(reneging_rate):
+    """
+    An overloaded single server queue where waiting customers renege
+    slowly, so the queue grows to roughly 1 / reneging_rate customers.
+    """
+    N = ciw.create_network(
+        arrival_distributions=[ciw.dists.Exponential(2.0)],
+        service_distributions=[ciw.dists.Exponential(1.0)],
+        number_of_servers=[1],
+        reneging_time_distributions=[ciw.dists.Exponential(reneging_rate)],
+    )
+    return N, {}, EVENTS / 4
+
+
+def dynamic_classes(number_of_classes):
+    """
+    A single server queue where waiting customers are promoted through
+    a chain of priority classes while they wait.
+    """
+    class_names = [f"Class {i}" for i in range(number_of_classes)]
+    N = ciw.create_network(
+        arrival_distributions={
+            clss: [ciw.dists.Exponential(0.95 / number_of_classes)] for clss in class_names
+        },
+        service_distributions={clss: [ciw.dists.Exponential(1.0)] for clss in class_names},
+        number_of_servers=[1],
+        priority_classes={clss: number_of_classes - 1 - i for i, clss in enumerate(class_names)},
+        class_change_time_distributions={
+            class_names[i]: {class_names[i + 1]: ciw.dists.Exponential(0.5)}
+            for i in range(number_of_classes - 1)
+        },
+    )
+    return N, {}, EVENTS / 4
+
+
+def preemptive_priorities(number_of_servers):
+    """
+    A multi-server queue with two priority classes, where high priority
+    customers preempt low priority customers.
+    """
+    N = ciw.create_network(
+        arrival_distributions={
+            "High": [ciw.dists.Exponential(0.3 * number_of_servers)],
+            "Low": [ciw.dists.Exponential(0.65 * number_of_servers)],
+        },
+        service_distributions={
+            "High": [ciw.dists.Exponential(1.0)],
+            "Low": [ciw.dists.Exponential(1.0)],
+        },
+        number_of_servers=[number_of_servers],
+        priority_classes=({"High": 0, "Low": 1}, ["resample"]),
+    )
+    return N, {}, EVENTS / (2 * 0.95 * number_of_servers)
+
+
+def many_priorities(number_of_classes):
+    """
+    A single server queue where each customer class has its own priority
+    class, so that most priority classes are empty at any time.
+    """
+    N = ciw.create_network(
+        arrival_distributions={
+            f"Class {i}": [ciw.dists.Exponential(0.9 / number_of_classes)]
+            for i in range(number_of_classes)
+        },
+        service_distributions={
+            f"Class {i}": [ciw.dists.Exponential(1.0)] for i in range(number_of_classes)
+        },
+        number_of_servers=[1],
+        priority_classes={f"Class {i}": i for i in range(number_of_classes)},
+    )
+    return N, {}, EVENTS / (2 * 0.9)
+
+
+def shortest_processing_time(discipline):
+    """
+    An overloaded single server queue, whose queue grows throughout,
+    serving the customer with the shortest service time next, either by the built in SPT discipline,
+    or by a discipline function taking the minimum of the waiting list.
+    """
+    if discipline == "heap":
+        service_discipline = ciw.disciplines.SPT()
+    else:
+        def service_discipline(individuals, t):
+            return min(individuals, key=lambda ind: ind.presampled_service_time)
+        service_discipline.presample_service_time = True
+    N = ciw.create_network(
+        arrival_distributions=[ciw.dists.Exponential(1.5)],
+        service_distributions=[ciw.dists.Exponential(1.0)],
+        number_of_servers=[1],
+        service_disciplines=[service_discipline],
+    )
+    return N, {}, EVENTS / 2.5
+
+
+def baulking(method):
+    """
+    A heavily loaded single server queue where customers baulk with a
+    probability depending on the queue length, given either by a baulking
+    function or by the equivalent table.
+    """
+    def probability_of_baulking(n, Q=None, next_ind=None, next_node=None):
+        return min(n / 50, 1.0)
+
+    if method == "table":
+        baulking_function = [n / 50 for n in range(51)]
+    else:
+        baulking_function = probability_of_baulking
+    N = ciw.create_network(
+        arrival_distributions=[ciw.dists.Exponential(1.5)],
+        service_distributions=[ciw.dists.Exponential(1.0)],
+        number_of_servers=[1],
+        baulking_functions=[baulking_function],
+    )
+    return N, {}, EVENTS / 2.5
+
+
+def batch_arrivals(batch_size):
+    """
+    Batches of customers arriving at a single server queue of limited
+    capacity, where each batch fills what space is left and the rest of
+    the batch is rejected.
+    """
+    N = ciw.create_network(
+        arrival_distributions=[ciw.dists.Exponential(1.0)],
+        service_distributions=[ciw.dists.Exponential(1.0)],
+        batching_distributions=[ciw.dists.Deterministic(batch_size)],
+        number_of_servers=[1],
+        queue_capacities=[10],
+    )
+    return N, {}, EVENTS / (2 + batch_size / 10)
+
+
+def poisson_intervals(max_sample_date):
+    """
+    A single server queue with arrivals whose rate changes every time
+    unit, that may go on until max_sample_date, simulated for a fixed time.
+    """
+    N = ciw.create_network(
+        arrival_distributions=[
+            ciw.dists.PoissonIntervals(rates=[1.2, 0.6], endpoints=[1, 2], max_sample_date=max_sample_date)
+        ],
+        service_distributions=[ciw.dists.Exponential(1.0)],
+        number_of_servers=[1],
+    )
+    return N, {}, EVENTS / 1.8
+
+
+class _TimeDependentService(ciw.dists.Distribution):
+    """
+    Exponential service times whose rate changes four times a day, chosen
+    with a chain of conditions on every sample.
+    """
+    def __init__(self):
+        self.dists = [ciw.dists.Exponential(rate) for rate in [1.2, 0.9, 1.1, 1.4]]
+
+    def seed(self, z, antithetic=False):
+        for i, dist in enumerate(self.dists):
+            dist.seed(ciw.derive_seed(z, i), antithetic)
+
+    def sample(self, t=None, ind=None):
+        t = t % 24
+        if t < 6:
+            return self.dists[0].sample()
+        if t < 12:
+            return self.dists[1].sample()
+        if t < 18:
+            return self.dists[2].sample()
+        return self.dists[3].sample()
+
+
+def time_dependent_service(method):
+    """
+    A single server queue whose service rate changes four times a day,
+    with a custom distribution using a chain of conditions, or with the
+    equivalent Piecewise distribution.
+    """
+    if method == "piecewise":
+        service_distribution = ciw.dists.Piecewise(
+            [ciw.dists.Exponential(rate) for rate in [1.2, 0.9, 1.1, 1.4]],
+            breakpoints=[6, 12, 18],
+            cycle_length=24,
+        )
+    else:
+        service_distribution = _TimeDependentService()
+    N = ciw.create_network(
+        arrival_distributions=[ciw.dists.Exponential(0.8)],
+        service_distributions=[service_distribution],
+        number_of_servers=[1],
+    )
+    return N, {}, EVENTS / 1.6
+
+
+def processor_sharing(traffic_intensity):
+    """
+    A processor sharing queue, with an expected number of customers
+    sharing the server of rho / (1 - rho).
+    """
+    N = ciw.create_network(
+        arrival_distributions=[ciw.dists.Exponential(traffic_intensity)],
+        service_distributions=[ciw.dists.Exponential(1.0)],
+        number_of_servers=[float("inf")],
+    )
+    return N, {"node_class": ciw.PSNode}, EVENTS / (2 * traffic_intensity)
+
+
+def slotted_schedule(number_of_slots):
+    """
+    A queue with capacitated slotted services cycling through
+    number_of_slots slots per unit of time.
+    """
+    N = ciw.create_network(
+        arrival_distributions=[ciw.dists.Exponential(5.0)],
+        service_distributions=[ciw.dists.Exponential(5.0)],
+        number_of_servers=[
+            ciw.Slotted(
+                slots=[(i + 1) / number_of_slots for i in range(number_of_slots)],
+                slot_sizes=[1 + (10 * i) // number_of_slots for i in range(number_of_slots)],
+                capacitated=True,
+            )
+        ],
+    )
+    return N, {}, EVENTS / (10 + number_of_slots)
+
+
+def preemptive_shifts(number_of_servers):
+    """
+    A multi-server queue with two priority classes, whose servers go
+    off duty for every other unit of time, preempting all customers in
+    service, so that long queues of interrupted customers build up.
+    """
+    N = ciw.create_network(
+        arrival_distributions={
+            "Class 0": [ciw.dists.Exponential(0.15 * number_of_servers)],
+            "Class 1": [ciw.dists.Exponential(0.3 * number_of_servers)],
+        },
+        service_distributions={
+            "Class 0": [ciw.dists.Exponential(1.0)],
+            "Class 1": [ciw.dists.Exponential(1.0)],
+        },
+        number_of_servers=[
+            ciw.Schedule(
+                numbers_of_servers=[number_of_servers, 0],
+                shift_end_dates=[1.0, 2.0],
+                preemption="resume",
+            )
+        ],
+        priority_classes={"Class 0": 0, "Class 1": 1},
+    )
+    return N, {}, EVENTS / (2 * 0.45 * number_of_servers)
+
+
+def deadlocking_ring(number_of_nodes):
+    """
+    A ring of single server nodes with small capacities, which eventually
+    deadlocks, simulated with deadlock detection.
+    """
+    N = ciw.create_network(
+        arrival_distributions=[ciw.dists.Exponential(0.5)] * number_of_nodes,
+        service_distributions=[ciw.dists.Exponential(2.0)] * number_of_nodes,
+        number_of_servers=[1] * number_of_nodes,
+        queue_capacities=[3] * number_of_nodes,
+        routing=ciw.routing.NetworkRouting(
+            routers=[
+                ciw.routing.Probabilistic(destinations=[(i + 1) % number_of_nodes + 1], probs=[0.9])
+                for i in range(number_of_nodes)
+            ]
+        ),
+    )
+    return N, {"deadlock_detector": ciw.deadlock.StateDigraph()}, None
@@ -5,11 +5,14 @@ from .auxiliary import *
 from .simulation import Simulation
 from .data_record import DataRecord
 from .server import Server
+from .priority_queues import PriorityQueues
 from .individual import Individual
 from .arrival_node import ArrivalNode
 from .exit_node import ExitNode
 from .node import Node
 from .processor_sharing import PSNode
+from .profiler import Profiler
+from .replication import replicate, PairedEstimate
 from .exactnode import *
 from .import_params import *
 from .network import *
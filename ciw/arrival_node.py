@@ -1,4 +1,3 @@
-from random import random
 from .individual import Individual
 
 
@@ -24,6 +23,8 @@ class ArrivalNode:
             The simulation to which this arrival node belongs.
         """
         self.simulation = simulation
+        self.id_number = 0
+        self.next_event_type = "arrival"
         self.number_of_individuals = 0
         self.number_of_individuals_per_class = {clss: 0 for clss in self.simulation.network.customer_class_names}
         self.number_accepted_individuals = 0
@@ -47,13 +48,21 @@ class ArrivalNode:
     def decide_baulk(self, next_node, next_individual):
         """
         Either makes an individual baulk, or sends the individual
-        to the next node.
+        to the next node. Baulking probabilities are given either by a
+        baulking function, or by a table indexed by the number of
+        individuals at the node, whose last entry holds for larger numbers.
         """
         if next_node.baulking_functions[self.next_class] is None:
             self.send_individual(next_node, next_individual)
         else:
-            rnd_num = random()
-            if rnd_num < next_node.baulking_functions[self.next_class](next_node.number_of_individuals, Q=self.simulation, next_ind=next_individual, next_node=next_node):
+            rnd_num = next_node.baulking_rng.random()
+            table = next_node.baulking_tables.get(self.next_class)
+            n = next_node.number_of_individuals
+            if table is not None:
+                probability_of_baulking = table[n] if n < len(table) else table[-1]
+            else:
+                probability_of_baulking = next_node.baulking_functions[self.next_class](n, Q=self.simulation, next_ind=next_individual, next_node=next_node)
+            if rnd_num < probability_of_baulking:
                 self.record_baulk(next_node, next_individual)
                 self.simulation.nodes[-1].accept(next_individual, completed=False)
             else:
@@ -80,22 +89,22 @@ class ArrivalNode:
         """
         Finds a batch size. Creates that many Individuals and send
         them to the relevent node. Then updates the event_dates_dict.
+        Batches are released in bulk if the router can route them all at
+        once and there is no baulking, otherwise one at a time.
         """
         batch = self.batch_size(self.next_node, self.next_class)
-        for _ in range(batch):
-            self.number_of_individuals += 1
-            self.number_of_individuals_per_class[self.next_class] += 1
-            priority_class = self.simulation.network.priority_class_mapping[self.next_class]
-            next_individual = self.simulation.IndividualType(
-                self.number_of_individuals,
-                self.next_class,
-                priority_class,
-                simulation=self.simulation,
-            )
-            next_node = self.simulation.transitive_nodes[self.next_node - 1]
-            next_individual.starting_node = next_node.id_number
-            self.simulation.routers[next_individual.customer_class].initialise_individual(next_individual)
-            self.release_individual(next_node, next_individual)
+        next_node = self.simulation.transitive_nodes[self.next_node - 1]
+        router = self.simulation.routers[self.next_class]
+        if batch > 1 and getattr(router, "initialises_batches", False) and next_node.baulking_functions[self.next_class] is None:
+            individuals = self.create_individuals(next_node, batch)
+            router.initialise_individuals(individuals)
+            self.release_batch(next_node, individuals)
+        else:
+            for _ in range(batch):
+                next_individual = self.create_individuals(next_node, 1)[0]
+                self.count_arrivals(1)
+                router.initialise_individual(next_individual)
+                self.release_individual(next_node, next_individual)
 
         self.event_dates_dict[self.next_node][self.next_class] = self.increment_time(
             self.event_dates_dict[self.next_node][self.next_class],
@@ -103,6 +112,31 @@ class ArrivalNode:
         )
         self.find_next_event_date()
 
+    def create_individuals(self, next_node, number):
+        """
+        Creates the next number of individuals of the next class arriving
+        at the next node, numbered on from the individuals counted so far.
+        """
+        clss = self.next_class
+        simulation = self.simulation
+        priority_class = simulation.network.priority_class_mapping[clss]
+        initialise_individual = simulation.inter_arrival_times[self.next_node][clss].initialise_individual
+        IndividualType = simulation.IndividualType
+        individuals = []
+        for id_number in range(self.number_of_individuals + 1, self.number_of_individuals + number + 1):
+            next_individual = IndividualType(id_number, clss, priority_class, simulation=simulation)
+            next_individual.starting_node = next_node.id_number
+            initialise_individual(next_individual)
+            individuals.append(next_individual)
+        return individuals
+
+    def count_arrivals(self, number):
+        """
+        Counts that number of individuals of the next class as having arrived.
+        """
+        self.number_of_individuals += number
+        self.number_of_individuals_per_class[self.next_class] += number
+
     def increment_time(self, original, increment):
         """
         Increments the original time by the increment.
@@ -149,6 +183,12 @@ class ArrivalNode:
         """
         next_node.write_baulking_or_rejection_record(individual, record_type="rejection")
 
+    def record_rejections(self, next_node, individuals):
+        """
+        Adds a batch of individuals to the rejection dictionary at once.
+        """
+        next_node.write_rejection_records(individuals)
+
     def release_individual(self, next_node, next_individual):
         """
         Either rejects the next_individual die to lack of capacity,
@@ -160,6 +200,28 @@ class ArrivalNode:
         else:
             self.decide_baulk(next_node, next_individual)
 
+    def release_batch(self, next_node, individuals):
+        """
+        Sends as many of a batch of individuals as there is space for to
+        the next_node, and rejects the rest all at once. Only used when
+        there is no baulking, so that no individual is sent to the
+        next_node once one has been rejected.
+        """
+        in_system = self.number_of_individuals - self.simulation.nodes[-1].number_of_individuals
+        space = min(
+            next_node.node_capacity - next_node.number_of_individuals,
+            self.system_capacity - in_system,
+        )
+        number_admitted = int(max(0, min(len(individuals), space)))
+        for next_individual in individuals[:number_admitted]:
+            self.count_arrivals(1)
+            self.send_individual(next_node, next_individual)
+        rejected = individuals[number_admitted:]
+        if rejected:
+            self.count_arrivals(len(rejected))
+            self.record_rejections(next_node, rejected)
+            self.simulation.nodes[-1].accept_all(rejected, completed=False)
+
     def send_individual(self, next_node, next_individual):
         """
         Sends the next_individual to the next_node.
@@ -1,3 +1,4 @@
+import hashlib
 import random
 import numpy as np
 import ciw
@@ -14,15 +15,49 @@ def seed(z):
     ciw.rng = np.random.default_rng(seed=z)
 
 
-def random_choice(array, probs=None):
+def derive_seed(z, *key):
+    """
+    Derives a seed for an individual random number stream, identified by
+    key, from the master seed z. The same master seed and key always give
+    the same seed, regardless of what other streams exist.
+    """
+    digest = hashlib.sha256(repr((z,) + key).encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+class AntitheticRandom(random.Random):
+    """
+    A random number stream that gives 1 - U in place of every uniform U
+    given by a random.Random stream with the same seed. Samples drawn by
+    inversion from the two streams are negatively correlated.
+    """
+    def random(self):
+        u = super().random()
+        if u == 0.0:
+            return u
+        return 1.0 - u
+
+
+def random_stream(z, antithetic=False):
+    """
+    Returns a random number stream seeded with z, which is antithetic
+    if antithetic is True.
+    """
+    if antithetic:
+        return AntitheticRandom(z)
+    return random.Random(z)
+
+
+def random_choice(array, probs=None, rng=random):
     """
     This function takes in an array of values to make a choice from,
     and an pdf corresponding to those values. It returns a random choice
-    from that array, using the probs as weights.
+    from that array, using the probs as weights, sampled from the rng
+    random number stream.
     """
     # If no pdf provided, assume uniform dist:
     if probs == None:
-        index = int(random.random() * len(array))
+        index = int(rng.random() * len(array))
         return array[index]
 
     # A common case, guaranteed to reach the Exit node;
@@ -31,7 +66,7 @@ def random_choice(array, probs=None):
         return array[-1]
 
     # Sample a random value from using pdf
-    rdm_num = random.random()
+    rdm_num = rng.random()
     i, p = 0, probs[0]
     while rdm_num > p:
         i += 1
@@ -39,16 +74,16 @@ def random_choice(array, probs=None):
     return array[i]
 
 
-def truncated_normal(mean, sd):
+def truncated_normal(mean, sd, rng=random):
     """
         Sample from a Normal distribution, with mean and standard
         deviation (sd). This truncates the distribution at 0 (lower bound
         of 0). If samples less than 0 are sampled, they are resampled
     until a positive value is sampled.
     """
-    sample = random.normalvariate(mean, sd)
+    sample = rng.normalvariate(mean, sd)
     while sample <= 0.0:
-        sample = random.normalvariate(mean, sd)
+        sample = rng.normalvariate(mean, sd)
     return sample
 
 
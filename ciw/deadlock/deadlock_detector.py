@@ -1,6 +1,3 @@
-import networkx as nx
-
-
 class NoDetection:
     """
     A generic class for all deadlock detector classes to inherit from.
@@ -61,6 +58,7 @@ class StateDigraph(NoDetection):
         """
         Initialises the state digraph detection mechanism class.
         """
+        import networkx as nx
         self.statedigraph = nx.DiGraph()
 
     def initialise_at_node(self, node):
@@ -78,6 +76,7 @@ class StateDigraph(NoDetection):
         and adapted from the NetworkX Developer Zone Ticket
         #663 knot.py (09/06/2015).
         """
+        import networkx as nx
         knots = []
         for c in nx.strongly_connected_components(self.statedigraph):
             subgraph = self.statedigraph.subgraph(c)
@@ -106,11 +105,7 @@ class StateDigraph(NoDetection):
             it needs to be added back in.
         """
         for blq in node.blocked_queue:
-            inds = [
-                ind for ind in node.simulation.nodes[blq[0]].all_individuals
-                if ind.id_number == blq[1]
-            ]
-            ind = inds[0]
+            ind = node.blocked_individuals[blq]
             if ind != individual:
                 self.statedigraph.add_edge(str(ind.server), str(server))
 
@@ -1,4 +1,6 @@
-from typing import List
+import random
+from operator import attrgetter
+from typing import Callable, List, Union
 
 from ciw.individual import Individual
 from ciw.auxiliary import random_choice
@@ -20,20 +22,25 @@ def FIFO(individuals: List[Individual], t: float) -> Individual:
     return individuals[0]
 
 
-def SIRO(individuals: List[Individual], t: float) -> Individual:
+def SIRO(individuals: List[Individual], t: float, rng=random) -> Individual:
     """
     SIRO: Service In Random Order (SIRO)
 
-    Returns a random individual from the queue.
+    Returns a random individual from the queue. Nodes call it with their
+    own discipline random number stream, as it has takes_rng set.
 
     Parameters:
     - individuals (List[Individual]): List of individuals in the queue.
     - t (float): The current simulation time
+    - rng: The random number stream to sample from.
 
     Returns:
     - Individual: A randomly selected individual from the queue.
     """
-    return random_choice(individuals)
+    return random_choice(individuals, rng=rng)
+
+
+SIRO.takes_rng = True
 
 
 def LIFO(individuals: List[Individual], t: float) -> Individual:
@@ -50,3 +57,61 @@ def LIFO(individuals: List[Individual], t: float) -> Individual:
     - Individual: The individual who joined the queue most recently.
     """
     return individuals[-1]
+
+
+class StaticKey:
+    """
+    StaticKey: Serves the waiting individual with the smallest key.
+
+    The key is a function of the individual, found once when they arrive,
+    and ties are broken first in, first out. Nodes keep their waiting
+    individuals in heaps ordered by key, so that choosing the next
+    individual takes O(log n) time.
+
+    Parameters:
+    - key (Callable[[Individual], float]): The key of an individual.
+    - presample_service_time (bool): Whether to sample service times when
+      individuals arrive, as their presampled_service_time, so that they
+      can be used by the key.
+    """
+
+    def __init__(self, key: Callable[[Individual], float], presample_service_time: bool = False):
+        self.key = key
+        self.presample_service_time = presample_service_time
+
+    def __call__(self, individuals: List[Individual], t: float) -> Individual:
+        """
+        Returns the individual with the smallest key, for when the
+        discipline is used as a function.
+        """
+        return min(individuals, key=self.key)
+
+
+class SPT(StaticKey):
+    """
+    SPT: Shortest Processing Time (SPT)
+
+    Service times are sampled when individuals arrive, and the individual
+    with the shortest service time is served next.
+    """
+
+    def __init__(self):
+        super().__init__(key=attrgetter("presampled_service_time"), presample_service_time=True)
+
+
+class EDF(StaticKey):
+    """
+    EDF: Earliest Deadline First (EDF)
+
+    The individual with the earliest due date is served next.
+
+    Parameters:
+    - due_date (Union[str, Callable[[Individual], float]]): The name of the
+      individual's due date attribute, or a function of the individual
+      giving their due date.
+    """
+
+    def __init__(self, due_date: Union[str, Callable[[Individual], float]] = "due_date"):
+        if isinstance(due_date, str):
+            due_date = attrgetter(due_date)
+        super().__init__(key=due_date)
@@ -3,17 +3,10 @@
 import copy
 import math
 import random
+from bisect import bisect_right
 from math import sqrt, exp, pi, erf
 from itertools import cycle
 from operator import add, mul, sub, truediv
-from random import (
-    expovariate,
-    uniform,
-    triangular,
-    gammavariate,
-    lognormvariate,
-    weibullvariate,
-) 
 from typing import List, NoReturn
 
 import numpy as np
@@ -25,13 +18,42 @@ from ciw.individual import Individual
 class Distribution(object):
     """
     A general distribution from which all other distirbutions will inherit.
+
+    Samples are drawn from `rng`, which is the `random` module unless
+    the distribution has been given its own streams with `seed`, and
+    from `numpy_rng`, which is `ciw.rng` unless seeded.
     """
+    rng = random
+    _numpy_rng = None
+
     def __repr__(self):
         return "Distribution"
 
+    @property
+    def numpy_rng(self):
+        """The NumPy random number generator used for sampling."""
+        return ciw.rng if self._numpy_rng is None else self._numpy_rng
+
+    def seed(self, z, antithetic=False):
+        """
+        Gives the distribution its own random number streams, seeded with z.
+        If antithetic, the random module stream gives 1 - U in place of
+        every uniform U given by the stream with the same seed, and the
+        NumPy stream is independent of it.
+        """
+        self.rng = random_stream(z, antithetic)
+        self._numpy_rng = np.random.default_rng(derive_seed(z, "antithetic") if antithetic else z)
+
     def sample(self, t=None, ind=None):
         pass
 
+    def initialise_individual(self, ind):
+        """
+        A method that is called at the arrival node when an individual
+        arriving with an inter-arrival time from this distribution is spawned.
+        """
+        pass
+
     def _sample(self, t=None, ind=None):
         """
         Performs vaildity checks before sampling.
@@ -115,6 +137,10 @@ class CombinedDistribution(Distribution):
         s2 = self.d2.sample(t, ind)
         return self.operator(s1, s2)
 
+    def seed(self, z, antithetic=False):
+        self.d1.seed(derive_seed(z, 1), antithetic)
+        self.d2.seed(derive_seed(z, 2), antithetic)
+
     @property
     def mean(self):
         m1 = self.d1.mean
@@ -185,7 +211,10 @@ class Uniform(Distribution):
         return f"Uniform(lower={self.lower}, upper={self.upper})"
 
     def sample(self, t=None, ind=None):
-        return uniform(self.lower, self.upper)
+        return self.rng.uniform(self.lower, self.upper)
+
+    def sample_many(self, n):
+        return self.numpy_rng.uniform(self.lower, self.upper, n)
 
     @property
     def mean(self):
@@ -230,6 +259,9 @@ class Deterministic(Distribution):
     def sample(self, t=None, ind=None):
         return self.value
 
+    def sample_many(self, n):
+        return np.full(n, self.value, dtype=float)
+
     @property
     def mean(self):
         """Returns the mean of the Deterministic distribution."""
@@ -279,7 +311,12 @@ class Triangular(Distribution):
         return f"Triangular(lower={self.lower}, mode={self.mode}, upper={self.upper})"
 
     def sample(self, t=None, ind=None):
-        return triangular(self.lower, self.upper, self.mode)
+        return self.rng.triangular(self.lower, self.upper, self.mode)
+
+    def sample_many(self, n):
+        if self.lower == self.upper:
+            return np.full(n, self.lower, dtype=float)
+        return self.numpy_rng.triangular(self.lower, self.mode, self.upper, n)
 
     @property
     def mean(self):
@@ -328,7 +365,10 @@ class Exponential(Distribution):
         return f"Exponential(rate={self.rate})"
 
     def sample(self, t=None, ind=None):
-        return expovariate(self.rate)
+        return self.rng.expovariate(self.rate)
+
+    def sample_many(self, n):
+        return self.numpy_rng.exponential(1 / self.rate, n)
 
     @property
     def mean(self):
@@ -370,7 +410,10 @@ class Gamma(Distribution):
         return f"Gamma(shape={self.shape}, scale={self.scale})"
 
     def sample(self, t=None, ind=None):
-        return gammavariate(self.shape, self.scale)
+        return self.rng.gammavariate(self.shape, self.scale)
+
+    def sample_many(self, n):
+        return self.numpy_rng.gamma(self.shape, self.scale, n)
 
     @property
     def mean(self):
@@ -407,7 +450,15 @@ class Normal(Distribution):
         return f"Normal(mean={self._mean}, sd={self._sd})"
 
     def sample(self, t=None, ind=None):
-        return truncated_normal(self._mean, self._sd)
+        return truncated_normal(self._mean, self._sd, rng=self.rng)
+
+    def sample_many(self, n):
+        samples = self.numpy_rng.normal(self._mean, self._sd, n)
+        resample = samples <= 0.0
+        while resample.any():
+            samples[resample] = self.numpy_rng.normal(self._mean, self._sd, resample.sum())
+            resample = samples <= 0.0
+        return samples
 
     @property
     def mean(self):
@@ -457,7 +508,10 @@ class Lognormal(Distribution):
         return f"Lognormal(mean={self._mean}, sd={self._sd})"
 
     def sample(self, t=None, ind=None):
-        return lognormvariate(self._mean, self._sd)
+        return self.rng.lognormvariate(self._mean, self._sd)
+
+    def sample_many(self, n):
+        return self.numpy_rng.lognormal(self._mean, self._sd, n)
 
     @property
     def mean(self):
@@ -496,7 +550,10 @@ class Weibull(Distribution):
         return f"Weibull(shape={self.shape}, scale={self.scale})"
 
     def sample(self, t=None, ind=None):
-        return weibullvariate(self.scale, self.shape)
+        return self.rng.weibullvariate(self.scale, self.shape)
+
+    def sample_many(self, n):
+        return self.scale * self.numpy_rng.weibull(self.shape, n)
 
     @property
     def mean(self):
@@ -541,7 +598,10 @@ class Empirical(Distribution):
         return "Empirical"
 
     def sample(self, t=None, ind=None):
-        return random_choice(self.observations)
+        return random_choice(self.observations, rng=self.rng)
+
+    def sample_many(self, n):
+        return self.numpy_rng.choice(np.asarray(self.observations, dtype=float), n)
 
     @property
     def mean(self):
@@ -600,6 +660,9 @@ class Sequential(Distribution):
     def sample(self, t=None, ind=None):
         return next(self.generator)
 
+    def sample_many(self, n):
+        return np.fromiter((next(self.generator) for _ in range(n)), dtype=float, count=n)
+
     @property
     def mean(self):
         """Returns the mean of the Sequential distribution."""
@@ -633,6 +696,178 @@ class Sequential(Distribution):
         return min(self.sequence)
 
 
+class Trace(Distribution):
+    """
+    A distribution that replays a trace of values, such as the inter-arrival
+    or service times of a real system, stored in a NumPy array or a `.npy`
+    file. Files are memory-mapped, and values are read in chunks, so the
+    trace is never loaded into memory in full.
+
+    Takes:
+      - `trace` a filename of a `.npy` file, or an array (such as a
+        `numpy.memmap`)
+      - `column` the column of the values, for two dimensional arrays (an
+        index) or structured arrays (a field name)
+      - `attributes` a dictionary mapping attribute names to columns, or a
+        list of field names; these are given to each individual sampled for
+        or arriving with a value from the same row
+      - `timestamps` whether the values are timestamps rather than times
+        between events, in which case the differences are sampled
+      - `cycle` whether to return to the start of the trace once all values
+        have been sampled, otherwise infinity is sampled
+      - `chunk_size` the number of values read at a time
+    """
+    def __init__(self, trace, column=None, attributes=None, timestamps=False, cycle=True, chunk_size=65536):
+        if isinstance(trace, np.ndarray):
+            self.filename = None
+            array = trace
+        else:
+            self.filename = str(trace)
+            array = np.load(self.filename, mmap_mode="r")
+        if array.dtype.names is not None:
+            if column is None:
+                raise ValueError("Trace distributions of structured arrays must be given a column.")
+            self.values = array[column]
+        elif array.ndim == 2:
+            self.values = array[:, 0 if column is None else column]
+        else:
+            self.values = array
+        if attributes is None:
+            attributes = {}
+        elif not isinstance(attributes, dict):
+            attributes = {name: name for name in attributes}
+        self.attribute_columns = {
+            name: array[col] if array.dtype.names is not None else array[:, col]
+            for name, col in attributes.items()
+        }
+        if len(self.values) == 0:
+            raise ValueError("Trace distributions must have at least one value.")
+        self.timestamps = timestamps
+        self.cycle = cycle
+        self.chunk_size = chunk_size
+        self.position = 0
+        self.last_timestamp = 0.0
+        self.buffer = []
+        self.buffer_index = 0
+        self.attribute_buffers = {}
+        self.next_attributes = {}
+
+    def __repr__(self):
+        if self.filename is not None:
+            return f"Trace({self.filename})"
+        return "Trace"
+
+    def __deepcopy__(self, memo):
+        """
+        Copies the position in the trace, sharing the (read-only) trace itself.
+        """
+        new = copy.copy(self)
+        new.buffer = list(self.buffer)
+        new.attribute_buffers = {name: list(b) for name, b in self.attribute_buffers.items()}
+        new.next_attributes = dict(self.next_attributes)
+        return new
+
+    def read(self, n):
+        """
+        Reads the next n values from the trace, and returns them along
+        with the rows they were read from (None for rows past the end of
+        a trace that does not cycle).
+        """
+        length = len(self.values)
+        rows = np.arange(self.position, self.position + n)
+        self.position += n
+        if self.cycle:
+            rows %= length
+            if rows[-1] - rows[0] == n - 1:
+                values = np.array(self.values[rows[0]:rows[-1] + 1], dtype=float)
+            else:
+                values = np.array(self.values[rows], dtype=float)
+        else:
+            rows = rows[rows < length]
+            values = np.full(n, np.inf)
+            values[:len(rows)] = self.values[rows[0]:rows[-1] + 1] if len(rows) > 0 else []
+        if self.timestamps:
+            timestamps = values[:len(rows)]
+            previous = np.concatenate(([self.last_timestamp], timestamps[:-1]))
+            previous[rows == 0] = 0.0
+            if len(rows) > 0:
+                self.last_timestamp = float(timestamps[-1])
+            values[:len(rows)] = timestamps - previous
+        if (values < 0).any():
+            raise ValueError("Trace distribution must sample positive numbers only.")
+        return values, rows
+
+    def fill_buffer(self):
+        """
+        Reads the next chunk of values, and their attributes, from the trace.
+        """
+        values, rows = self.read(self.chunk_size)
+        self.buffer = values.tolist()
+        self.buffer_index = 0
+        self.attribute_buffers = {
+            name: np.asarray(column[rows]).tolist() for name, column in self.attribute_columns.items()
+        }
+
+    def sample(self, t=None, ind=None):
+        if self.buffer_index == len(self.buffer):
+            self.fill_buffer()
+        value = self.buffer[self.buffer_index]
+        if self.attribute_buffers:
+            self.next_attributes = {
+                name: b[self.buffer_index] for name, b in self.attribute_buffers.items()
+                if self.buffer_index < len(b)
+            }
+        self.buffer_index += 1
+        if ind is not None:
+            self.initialise_individual(ind)
+        return value
+
+    def sample_many(self, n):
+        leftover = self.buffer[self.buffer_index:self.buffer_index + n]
+        self.buffer_index += len(leftover)
+        if len(leftover) == n:
+            return np.array(leftover, dtype=float)
+        values, rows = self.read(n - len(leftover))
+        return np.concatenate((leftover, values))
+
+    def initialise_individual(self, ind):
+        """
+        Gives the individual the attributes of the row last sampled.
+        """
+        for name, value in self.next_attributes.items():
+            setattr(ind, name, value)
+
+    def chunks(self):
+        """
+        Yields the values of the whole trace, chunk by chunk.
+        """
+        last_timestamp = 0.0
+        for start in range(0, len(self.values), self.chunk_size):
+            values = np.array(self.values[start:start + self.chunk_size], dtype=float)
+            if self.timestamps:
+                values, last_timestamp = np.diff(values, prepend=last_timestamp), values[-1]
+            yield values
+
+    @property
+    def mean(self):
+        """Returns the mean of the values in the trace."""
+        return sum(float(chunk.sum()) for chunk in self.chunks()) / len(self.values)
+
+    @property
+    def variance(self):
+        """Returns the variance of the values in the trace."""
+        m = self.mean
+        return sum(float(((chunk - m) ** 2).sum()) for chunk in self.chunks()) / len(self.values)
+
+    @property
+    def upper_limit(self):
+        return max(float(chunk.max()) for chunk in self.chunks())
+
+    @property
+    def lower_limit(self):
+        return min(float(chunk.min()) for chunk in self.chunks())
+
+
 class Pmf(Distribution):
     """
     A distribution defined by a probability mass function (pmf).
@@ -655,7 +890,11 @@ class Pmf(Distribution):
         return f"Pmf(values={self.values}, probs={self.probs})"
 
     def sample(self, t=None, ind=None):
-        return random_choice(self.values, self.probs)
+        return random_choice(self.values, self.probs, rng=self.rng)
+
+    def sample_many(self, n):
+        probs = np.asarray(self.probs, dtype=float)
+        return self.numpy_rng.choice(np.asarray(self.values, dtype=float), n, p=probs / probs.sum())
 
     @property
     def mean(self):
@@ -736,11 +975,11 @@ class PhaseType(Distribution):
     def sample_transition(self, rate): 
         if rate <= 0.0: 
             return float("Inf") 
-        return expovariate(rate) 
+        return self.rng.expovariate(rate) 
 
     def sample(self, t=None, ind=None): 
         cumulative_time = 0 
-        current_state = random_choice(self.states, probs=self.initial_state) 
+        current_state = random_choice(self.states, probs=self.initial_state, rng=self.rng) 
         while current_state != self.states[-1]: 
             potential_transitions = [ 
                 self.sample_transition(r) for r in self.absorbing_matrix[current_state] 
@@ -752,6 +991,9 @@ class PhaseType(Distribution):
             current_state = idx 
         return cumulative_time 
 
+    def sample_many(self, n):
+        return np.fromiter((self.sample() for _ in range(n)), dtype=float, count=n)
+
     @property
     def mean(self):
         Q = np.array(self.absorbing_matrix)[:-1, :-1]
@@ -938,7 +1180,7 @@ class Coxian(PhaseType):
         return "Coxian"
 
 
-class PoissonIntervals(Sequential):
+class PoissonIntervals(Distribution):
     """
     A time-dependant Poission distribution for arrivals.
 
@@ -951,8 +1193,11 @@ class PoissonIntervals(Sequential):
     interval from a Poisson distribution. Then to randomly distribute
     those arrival dates within the interval using a Uniform distribution.
     Then to take consecutive differences of these arrivals as the
-    inter-arrival times, and use Ciw's Sequential distribution to output
-    them.
+    inter-arrival times.
+
+    The arrival dates of each interval are only sampled once the previous
+    interval's arrivals have all been sampled, so only one interval's
+    arrival dates are held at a time.
     """
     def __init__(self, rates, endpoints, max_sample_date):
         if any(r < 0.0 for r in rates):
@@ -972,45 +1217,114 @@ class PoissonIntervals(Sequential):
         self.rates = rates
         self.endpoints = endpoints
         self.max_sample_date = max_sample_date
-        self.get_intervals()
-        self.get_dates()
-        self.inter_arrivals = [t - s for s, t in zip(self.dates, self.dates[1:])] + [float('inf')]
-        super().__init__(self.inter_arrivals)
+        self.num_intervals = len(self.endpoints)
+        self.restart()
 
     def __repr__(self):
         return "PoissonIntervals"
 
-    def get_intervals(self):
-        self.num_intervals = len(self.endpoints)
-        self.intervals = [(0, self.endpoints[0])]
-        i, t1, t2 = 0, 0, 0
-        while self.intervals[-1][-1] < self.max_sample_date:
-            if i % self.num_intervals == self.num_intervals - 1:
-                t2 = t1 + self.endpoints[-1]
-            self.intervals.append(
-                (
-                    t1 + self.endpoints[i % self.num_intervals],
-                    min(
-                        t2 + self.endpoints[(i + 1) % self.num_intervals],
-                        self.max_sample_date,
-                    ),
-                )
-            )
-            i += 1
-            t1 = t2
-
-    def get_dates(self):
-        self.dates = [0.0]
-        for i, interval in enumerate(self.intervals):
-            n = ciw.rng.poisson(
-                self.rates[i % self.num_intervals] * (interval[1] - interval[0])
-            )
-            interval_dates = [
-                random.uniform(interval[0], interval[1]) for _ in range(n)
-            ]
-            interval_dates = sorted(interval_dates)
-            self.dates += interval_dates
-    
+    def seed(self, z, antithetic=False):
+        """
+        Gives the distribution its own random number streams, seeded
+        with z, and starts sampling arrival dates again from the first
+        interval.
+        """
+        super().seed(z, antithetic)
+        self.restart()
+
+    def restart(self):
+        """
+        Goes back to before the first interval, with no arrival dates
+        sampled yet.
+        """
+        self.interval = None
+        self.interval_number = 0
+        self.cycle_start = 0
+        self.next_cycle_start = 0
+        self.last_date = 0.0
+        self.interval_dates = []
+        self.date_index = 0
+
+    def next_interval(self):
+        """
+        Moves on to the next time interval, returning False if there are
+        none left before the max_sample_date. The interval (0, endpoints[0])
+        always comes first, and the intervals after it repeat the endpoints
+        shifted on by endpoints[-1] each cycle.
+        """
+        if self.interval is None:
+            self.interval = (0, self.endpoints[0])
+            return True
+        if self.interval[1] >= self.max_sample_date:
+            return False
+        i = self.interval_number
+        if i % self.num_intervals == self.num_intervals - 1:
+            self.next_cycle_start = self.cycle_start + self.endpoints[-1]
+        self.interval = (
+            self.cycle_start + self.endpoints[i % self.num_intervals],
+            min(
+                self.next_cycle_start + self.endpoints[(i + 1) % self.num_intervals],
+                self.max_sample_date,
+            ),
+        )
+        self.interval_number += 1
+        self.cycle_start = self.next_cycle_start
+        return True
+
+    def sample_interval_dates(self):
+        """
+        Samples the sorted arrival dates of the current interval.
+        """
+        start, end = self.interval
+        rate = self.rates[self.interval_number % self.num_intervals]
+        n = self.numpy_rng.poisson(rate * (end - start))
+        return sorted([self.rng.uniform(start, end) for _ in range(n)])
+
+    def next_date(self):
+        """
+        Returns the next arrival date, sampling the arrival dates of later
+        intervals as they are reached, or infinity if there are no more.
+        """
+        while self.date_index == len(self.interval_dates):
+            if not self.next_interval():
+                return float('inf')
+            self.interval_dates = self.sample_interval_dates()
+            self.date_index = 0
+        self.date_index += 1
+        return self.interval_dates[self.date_index - 1]
+
+    def sample(self, t=None, ind=None):
+        date = self.next_date()
+        if math.isinf(date):
+            return date
+        inter_arrival = date - self.last_date
+        self.last_date = date
+        return inter_arrival
+
+    def sample_many(self, n):
+        return np.fromiter((self.sample() for _ in range(n)), dtype=float, count=n)
+
+    @property
+    def dates(self):
+        """
+        The date of the last arrival sampled, 0 to begin with, followed by
+        the dates of all the arrivals still to come. This samples the
+        arrival dates of every interval not yet reached, and so is meant
+        for inspecting the distribution rather than for simulating.
+        """
+        while self.next_interval():
+            self.interval_dates = self.interval_dates[self.date_index:] + self.sample_interval_dates()
+            self.date_index = 0
+        return [self.last_date] + self.interval_dates[self.date_index:]
+
+    @property
+    def inter_arrivals(self):
+        """
+        The inter-arrival times still to come, as given by `dates`.
+        """
+        dates = self.dates
+        return [t - s for s, t in zip(dates, dates[1:])] + [float('inf')]
+
     @property
     def overall_rate(self):
         deltas = [self.endpoints[0]] + [
@@ -1043,6 +1357,110 @@ class PoissonIntervals(Sequential):
         return 0
 
     
+class Piecewise(Distribution):
+    """
+    A time-dependent distribution, that samples from a different
+    distribution in each interval of time.
+
+    Takes:
+      - `distributions` a list of distributions, one for each interval
+      - `breakpoints` the dates at which each interval but the last ends,
+        strictly increasing
+      - `cycle_length` optionally, the length of time after which the
+        intervals repeat, later than the last breakpoint
+      - `chunk_size` optionally, the number of values sampled at a time
+        from distributions that can sample many values at once
+
+    The interval of a date is found by bisecting the breakpoints. Each
+    interval's distribution is sampled as it would be on its own, unless
+    given a chunk_size, in which case distributions that can sample many
+    values at once are sampled in chunks, from their NumPy streams, and
+    their values handed out one at a time. These values are floats, so
+    chunks are not for batching distributions. Chunks are never used with
+    antithetic streams, and as they do not follow the random module
+    stream, chunked samples are not paired with antithetic samples.
+    """
+    def __init__(self, distributions, breakpoints, cycle_length=None, chunk_size=None):
+        if len(distributions) != len(breakpoints) + 1:
+            raise ValueError("Piecewise distributions need one more distribution than breakpoints.")
+        if any(b <= 0.0 for b in breakpoints):
+            raise ValueError("All breakpoints must be positive.")
+        if any(s >= t for s, t in zip(breakpoints, breakpoints[1:])):
+            raise ValueError("Breakpoints must be strictly increasing.")
+        if cycle_length is not None and cycle_length <= (breakpoints[-1] if breakpoints else 0.0):
+            raise ValueError("The cycle length must be later than the last breakpoint.")
+        self.distributions = [copy.deepcopy(dist) for dist in distributions]
+        self.breakpoints = [float(b) for b in breakpoints]
+        self.cycle_length = cycle_length
+        self.chunk_size = chunk_size
+        self.clear_buffers()
+
+    def __repr__(self):
+        return "Piecewise"
+
+    def can_sample_in_chunks(self, dist):
+        """
+        Whether a distribution's values can be sampled in chunks ahead of
+        time. Traces that give individuals attributes need sampling one
+        at a time, and antithetic streams are only followed by sampling
+        one at a time.
+        """
+        return (
+            self.chunk_size is not None
+            and hasattr(dist, "sample_many")
+            and not getattr(dist, "attribute_columns", None)
+            and not isinstance(dist.rng, AntitheticRandom)
+        )
+
+    def clear_buffers(self):
+        """
+        Forgets any values sampled ahead of time, and finds which
+        distributions are sampled in chunks.
+        """
+        self.chunked = [self.can_sample_in_chunks(dist) for dist in self.distributions]
+        self.buffers = [[] for _ in self.distributions]
+        self.buffer_indices = [0 for _ in self.distributions]
+
+    def seed(self, z, antithetic=False):
+        """
+        Gives each interval's distribution its own random number streams,
+        seeded from z.
+        """
+        for i, dist in enumerate(self.distributions):
+            dist.seed(derive_seed(z, i), antithetic)
+        self.clear_buffers()
+
+    def find_interval(self, t):
+        """
+        Returns the index of the interval the date t is in.
+        """
+        if t is None:
+            return 0
+        if self.cycle_length is not None:
+            t = t % self.cycle_length
+        return bisect_right(self.breakpoints, t)
+
+    def sample(self, t=None, ind=None):
+        i = self.find_interval(t)
+        if not self.chunked[i]:
+            return self.distributions[i].sample(t, ind)
+        buffer = self.buffers[i]
+        index = self.buffer_indices[i]
+        if index == len(buffer):
+            buffer = self.buffers[i] = self.distributions[i].sample_many(self.chunk_size).tolist()
+            index = 0
+        self.buffer_indices[i] = index + 1
+        return buffer[index]
+
+    @property
+    def upper_limit(self):
+        return max(dist.upper_limit for dist in self.distributions)
+
+    @property
+    def lower_limit(self):
+        return min(dist.lower_limit for dist in self.distributions)
+
+
 class Poisson(Distribution):
     """
     The Poisson distribution.
@@ -1057,7 +1475,7 @@ class Poisson(Distribution):
         self.rate = rate
 
     def sample(self, t=None, ind=None):
-        return ciw.rng.poisson(lam=self.rate)
+        return self.numpy_rng.poisson(lam=self.rate)
 
     def __repr__(self):
         return f"Poisson(rate={self.rate})"
@@ -1099,7 +1517,7 @@ class Geometric(Distribution):
         self.prob = prob
 
     def sample(self, t=None, ind=None):
-        return ciw.rng.geometric(p=self.prob)
+        return self.numpy_rng.geometric(p=self.prob)
 
     def __repr__(self):
         return f"Geometric(prob={self.prob})"
@@ -1147,7 +1565,7 @@ class Binomial(Distribution):
         self.prob = prob
 
     def sample(self, t=None, ind=None):
-        return ciw.rng.binomial(n=self.n, p=self.prob)
+        return self.numpy_rng.binomial(n=self.n, p=self.prob)
 
     def __repr__(self):
         return f"Binomial(n={self.n}, prob={self.prob})"
@@ -1216,7 +1634,7 @@ class MixtureDistribution(Distribution):
         """
         Generate a random sample from the mixture distribution.
         """
-        chosen_dist = random.choices(
+        chosen_dist = self.rng.choices(
             population=self.dists,
             weights=self.probs,
             k=1
@@ -1224,6 +1642,11 @@ class MixtureDistribution(Distribution):
 
         return chosen_dist.sample(t, ind)
 
+    def seed(self, z, antithetic=False):
+        super().seed(z, antithetic)
+        for i, dist in enumerate(self.dists):
+            dist.seed(derive_seed(z, i), antithetic)
+
     def __repr__(self):
         return "MixtureDistribution"
 
@@ -26,6 +26,17 @@ class ExitNode:
         if completed:
             self.number_of_completed_individuals += 1
 
+    def accept_all(self, individuals, completed=True):
+        """
+        Adds a number of individuals to the list of completed individuals.
+        """
+        self.all_individuals.extend(individuals)
+        for individual in individuals:
+            individual.node = -1
+        self.number_of_individuals += len(individuals)
+        if completed:
+            self.number_of_completed_individuals += len(individuals)
+
     def update_next_event_date(self):
         """
         Finds the time of the next event at this node
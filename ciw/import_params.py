@@ -135,12 +135,12 @@ def fill_out_dictionary(params):
         srv_dists = params["service_distributions"]
         params["service_distributions"] = {"Customer": srv_dists}
     if "routing" in params:
-        if isinstance(params["routing"], list):
+        if isinstance(params["routing"], list) or hasattr(params["routing"], "tocsr"):
             transition_matrix = params["routing"]
             params["routing"] = {"Customer": routing.TransitionMatrix(transition_matrix=transition_matrix)}
         elif isinstance(params["routing"], dict):
             for clss in params["routing"]:
-                if isinstance(params["routing"][clss], list):
+                if isinstance(params["routing"][clss], list) or hasattr(params["routing"][clss], "tocsr"):
                     transition_matrix = params["routing"][clss]
                     params["routing"][clss] = routing.TransitionMatrix(transition_matrix=transition_matrix)
         else:
@@ -276,6 +276,13 @@ def validify_dictionary(params):
                 "Ensure consistant customer classes used in class_change_time_distributions."
             )
 
+    if "baulking_functions" in params:
+        for baulking_functions in params['baulking_functions'].values():
+            for baulking_function in baulking_functions:
+                if baulking_function is not None and not callable(baulking_function):
+                    if len(baulking_function) == 0 or any(not 0.0 <= p <= 1.0 for p in baulking_function):
+                        raise ValueError("Baulking tables must be non-empty lists of probabilities.")
+
     if not isinstance(params['system_capacity'], int) and params['system_capacity'] != float('inf'):
         raise ValueError("Ensure system capacity is a positive integer.")
     if params['system_capacity'] <= 0:
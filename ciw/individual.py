@@ -56,6 +56,16 @@ class Individual(object):
         The node in the network where the individual is located.
     simulation : bool or Simulation object
         A flag indicating whether the individual is part of a simulation.
+    route_nodes : tuple
+        The process-based route of the individual, which may be shared with other individuals.
+    route_cursor : int
+        The position of the next node on the route.
+    route_unvisited : None or list
+        For flexible routes where all nodes of a set must be visited, those of the current set not yet visited.
+    route : list
+        The remainder of the route not yet visited.
+    presampled_service_time : bool or float
+        A service time sampled on arrival, for service disciplines that need it, used when service begins.
 
     Methods
     -------
@@ -75,6 +85,16 @@ class Individual(object):
     For more details on the attributes and methods, please refer to the class documentation.
     """
 
+    route_nodes = ()
+    route_cursor = 0
+    route_unvisited = None
+    reneging_entry = None
+    class_change_entry = None
+    interrupted_entry = None
+    discipline_entry = None
+    discipline_key = None
+    presampled_service_time = False
+
     def __init__(self, id_number, customer_class='Customer', priority_class=0, simulation=False):
         """
         Initialise an individual.
@@ -100,6 +120,21 @@ class Individual(object):
         self.node = False
         self.simulation = simulation
 
+    @property
+    def route(self):
+        """The remainder of the individual's process-based route.
+        """
+        route = list(self.route_nodes[self.route_cursor:])
+        if self.route_unvisited is not None:
+            route[0] = list(self.route_unvisited)
+        return route
+
+    @route.setter
+    def route(self, route):
+        self.route_nodes = tuple(route)
+        self.route_cursor = 0
+        self.route_unvisited = None
+
     def __repr__(self):
         """Represents an Individual instance as a string.
         """
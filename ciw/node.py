@@ -1,9 +1,12 @@
-from random import random
+import random
+from heapq import heapify, heappush, heappop
+from itertools import count
 from math import isinf, nan
-import networkx as nx
-from .auxiliary import random_choice, flatten_list
+from .auxiliary import random_choice
 from .data_record import DataRecord
 from .server import Server
+from .disciplines import StaticKey
+from .priority_queues import PriorityQueues
 from .schedules import *
 
 
@@ -17,22 +20,28 @@ class Node(object):
         Initialise a node.
         """
         self.simulation = simulation
+        self.hooks = simulation.hooks
         node = self.simulation.network.service_centres[id_ - 1]
         self.server_priority_function = node.server_priority_function
         self.service_discipline = node.service_discipline
+        self.discipline_heaps = {} if isinstance(self.service_discipline, StaticKey) else None
+        self.discipline_entry_numbers = count()
+        self.presample_service_times = getattr(self.service_discipline, "presample_service_time", False)
+        self.discipline_takes_rng = getattr(self.service_discipline, "takes_rng", False)
         self.next_event_type = None
         if isinstance(node.number_of_servers, Schedule):
             self.schedule = node.number_of_servers
-            self.schedule.initialise()
-            self.c = self.schedule.c
+            self.schedule_index = 0
+            self.c = 0
             if self.schedule.schedule_type == 'slotted':
                 self.slotted = True
-                self.next_event_date = self.schedule.next_slot_date
+                self.next_slot_date, self.slot_size = self.schedule.get_change(0)
+                self.next_event_date = self.next_slot_date
                 self.next_event_type = 'slotted_service'
             else:
                 self.slotted = False
-                self.next_event_date = self.schedule.next_shift_change_date
-                self.next_shift_change = self.schedule.next_shift_change_date
+                self.next_shift_change, self.next_c = self.schedule.get_change(0)
+                self.next_event_date = self.next_shift_change
                 self.next_event_type = 'shift_change'
         else:
             self.c = node.number_of_servers
@@ -42,7 +51,7 @@ class Node(object):
             self.next_shift_change = float("Inf")
         self.node_capacity = node.queueing_capacity + self.c
         self.class_change = node.class_change_matrix
-        self.individuals = [[] for _ in range(simulation.number_of_priority_classes)]
+        self.all_individuals = PriorityQueues()
         self.number_of_individuals = 0
         self.number_in_service = 0
         self.id_number = id_
@@ -50,22 +59,43 @@ class Node(object):
             clss: self.simulation.network.customer_classes[clss].baulking_functions[id_ - 1]
             for clss in self.simulation.network.customer_class_names
         }
-        self.overtime = []
+        self.baulking_tables = {
+            clss: [float(p) for p in baulking_function]
+            for clss, baulking_function in self.baulking_functions.items()
+            if baulking_function is not None and not callable(baulking_function)
+        }
         self.blocked_queue = []
+        self.blocked_individuals = {}
         self.len_blocked_queue = 0
         if not isinf(self.c):
             self.servers = self.create_starting_servers()
         self.highest_id = self.c
         self.simulation.deadlock_detector.initialise_at_node(self)
         self.priority_preempt = node.priority_preempt
-        self.interrupted_individuals = []
+        self.preemption_index = []
+        self.preemption_index_size = 0
+        self.preemption_entry_numbers = count()
+        self.interrupted_queue = []
+        self.interrupted_entry_numbers = count()
         self.number_interrupted_individuals = 0
-        self.all_servers_total = []
-        self.all_servers_busy = []
+        self.killed_servers_total_time = 0
+        self.killed_servers_busy_time = 0
+        self.killed_servers_overtime = 0
+        self.number_of_killed_servers = 0
+        self.server_pool = []
         self.reneging = node.reneging
+        self.reneging_calendar = []
+        self.reneging_entry_numbers = count()
         self.dynamic_classes = node.class_change_time
         self.next_class_change_date = float("Inf")
+        self.next_class_change_ind = None
+        self.class_change_calendar = []
+        self.class_change_entry_numbers = count()
         self.next_individual = None
+        self.class_change_rng = random
+        self.baulking_rng = random
+        self.discipline_rng = random
+        self.queue_size_watchers = []
 
     @property
     def now(self):
@@ -75,10 +105,26 @@ class Node(object):
         return self.simulation.current_time
 
     @property
-    def all_individuals(self):
-        if self.simulation.number_of_priority_classes == 1:
-            return self.individuals[0]
-        return flatten_list(self.individuals)
+    def interrupted_individuals(self):
+        """
+        The interrupted individuals, in the order they will restart service.
+        This is for inspection only: it sorts the whole interrupted queue on
+        every access, so the simulation itself never uses it, and instead
+        pops individuals from the heap with pop_interrupted_individual.
+        """
+        return [entry[-1] for entry in sorted(self.interrupted_queue) if self.is_current_interrupted_entry(entry)]
+
+    @property
+    def individuals(self):
+        """
+        The individuals at the node, as a live list-like view for each
+        priority class, so changes to them change all_individuals.
+        """
+        return self.all_individuals.as_lists(self.simulation.number_of_priority_classes)
+
+    @individuals.setter
+    def individuals(self, levels):
+        self.all_individuals = PriorityQueues(levels)
 
     def __repr__(self):
         """
@@ -99,18 +145,84 @@ class Node(object):
         next_individual.is_blocked = False
         next_individual.original_class = next_individual.customer_class
         next_individual.queue_size_at_arrival = self.number_of_individuals
-        self.individuals[next_individual.priority_class].append(next_individual)
+        self.all_individuals.append(next_individual)
         self.number_of_individuals += 1
+        if self.queue_size_watchers:
+            self.update_queue_size_watchers()
+        if self.hooks:
+            self.simulation.run_hooks("on_arrival", self, next_individual)
         self.begin_service_if_possible_accept(next_individual)
         self.simulation.statetracker.change_state_accept(self, next_individual)
 
+    def add_to_reneging_calendar(self, individual):
+        """
+        Adds the individual's reneging date to the reneging calendar, a
+        heap of (reneging date, entry number, individual). Any earlier
+        entries for the individual are no longer current, and are
+        removed when they reach the top of the heap.
+        """
+        individual.reneging_entry = None
+        if not isinf(individual.reneging_date) and not isinf(self.c):
+            entry = (individual.reneging_date, next(self.reneging_entry_numbers), individual)
+            individual.reneging_entry = entry
+            heappush(self.reneging_calendar, entry)
+
+    def add_to_class_change_calendar(self, individual):
+        """
+        Adds the individual's class change date to the class change
+        calendar, a heap of (class change date, entry number, individual).
+        Any earlier entries for the individual are no longer current, and
+        are removed when they reach the top of the heap.
+        """
+        individual.class_change_entry = None
+        if not isinf(individual.class_change_date) and not isinf(self.c):
+            entry = (individual.class_change_date, next(self.class_change_entry_numbers), individual)
+            individual.class_change_entry = entry
+            heappush(self.class_change_calendar, entry)
+
+    def add_to_preemption_index(self, server, priority_class, service_start_date):
+        """
+        Adds a server to the preemption index, a heap of (minus priority
+        class, minus service start date, server id, entry number, server)
+        of the servers' customers, so that the customer to preempt is at the
+        top. Of those with the same priority and service start date, the
+        lowest server id is at the top. The server keeps its current entry
+        as its preemption_key, and entries that are no longer current are
+        removed when they reach the top, or when they outnumber the current
+        entries, so that updates take O(log c) amortised time.
+        """
+        server.preemption_key = (-priority_class, -service_start_date, server.id_number, next(self.preemption_entry_numbers), server)
+        heappush(self.preemption_index, server.preemption_key)
+        self.preemption_index_size += 1
+
+    def find_customer_to_preempt(self):
+        """
+        Returns the current entry at the top of the preemption index,
+        popping entries that are no longer current on the way.
+        """
+        while self.preemption_index[0][-1].preemption_key is not self.preemption_index[0]:
+            heappop(self.preemption_index)
+        return self.preemption_index[0]
+
     def add_new_servers(self, num_servers):
         """
         Add appropriate amount of servers for the given shift.
         """
         for i in range(num_servers):
             self.highest_id += 1
-            self.servers.append(self.simulation.ServerType(self, self.highest_id, self.now))
+            self.servers.append(self.recycle_server(self.highest_id))
+
+    def recycle_server(self, id_number):
+        """
+        Returns a server with the given id, starting now, reusing a server
+        from the pool of killed servers if there is one.
+        """
+        while self.server_pool:
+            srvr = self.server_pool.pop()
+            if not srvr.busy:
+                srvr.__init__(self, id_number, self.now)
+                return srvr
+        return self.simulation.ServerType(self, id_number, self.now)
 
     def attach_server(self, server, individual):
         """
@@ -119,6 +231,8 @@ class Node(object):
         server.cust = individual
         server.busy = True
         individual.server = server
+        if self.priority_preempt != False and not server.offduty:
+            self.add_to_preemption_index(server, individual.priority_class, self.now)
         self.simulation.deadlock_detector.action_at_attach_server(self, server, individual)
 
     def begin_service_if_possible_accept(self, next_individual):
@@ -131,8 +245,13 @@ class Node(object):
             - Update the server's end date (only when servers are not infinite)
         """
         next_individual.arrival_date = self.now
+        if self.presample_service_times:
+            next_individual.presampled_service_time = self.get_service_time(next_individual)
+        if self.discipline_heaps is not None:
+            self.add_to_discipline_heap(next_individual)
         if self.reneging is True:
             next_individual.reneging_date = self.get_reneging_date(next_individual)
+            self.add_to_reneging_calendar(next_individual)
         self.decide_class_change(next_individual)
 
         if isinf(self.c):
@@ -151,20 +270,25 @@ class Node(object):
                 ind.service_time = self.get_service_time(ind)
                 ind.service_end_date = self.now + ind.service_time
                 self.number_in_service += 1
+                if self.queue_size_watchers:
+                    self.update_queue_size_watchers()
                 self.reset_class_change(ind)
                 if not isinf(self.c):
                     free_server.next_end_service_date = ind.service_end_date
+                if self.hooks:
+                    self.simulation.run_hooks("on_service_start", self, ind)
 
     def begin_interrupted_individuals_service(self, srvr):
         """
         Restarts the next interrupted individual's service (by
         resampling service time)
         """
-        ind = [i for i in self.interrupted_individuals][0]
+        ind = self.pop_interrupted_individual()
         if ind.is_blocked:
             node_blocked_to = self.simulation.nodes[ind.destination]
             ind.destination = False
             node_blocked_to.blocked_queue.remove((self.id_number, ind.id_number))
+            del node_blocked_to.blocked_individuals[(self.id_number, ind.id_number)]
             node_blocked_to.len_blocked_queue -= 1
             ind.is_blocked = False
         self.attach_server(srvr, ind)
@@ -173,9 +297,11 @@ class Node(object):
         ind.service_end_date = self.now + ind.service_time
         ind.interrupted = False
         self.number_in_service += 1
+        if self.queue_size_watchers:
+            self.update_queue_size_watchers()
         srvr.next_end_service_date = ind.service_end_date
-        self.interrupted_individuals.remove(ind)
-        self.number_interrupted_individuals -= 1
+        if self.hooks:
+            self.simulation.run_hooks("on_service_start", self, ind)
 
     def begin_service_if_possible_change_shift(self):
         """
@@ -197,8 +323,12 @@ class Node(object):
                     self.give_individual_a_service_time(ind)
                     ind.service_end_date = self.increment_time(ind.service_start_date, ind.service_time)
                     self.number_in_service += 1
+                    if self.queue_size_watchers:
+                        self.update_queue_size_watchers()
                     self.reset_class_change(ind)
                     srvr.next_end_service_date = ind.service_end_date
+                    if self.hooks:
+                        self.simulation.run_hooks("on_service_start", self, ind)
 
     def begin_service_if_possible_release(self, next_individual, newly_free_server):
         """
@@ -211,7 +341,7 @@ class Node(object):
           - attach server to individual
         """
 
-        if newly_free_server is not None and newly_free_server in self.servers:
+        if newly_free_server is not None and not newly_free_server.killed:
             if self.number_interrupted_individuals > 0:
                 self.begin_interrupted_individuals_service(newly_free_server)
             else:
@@ -222,8 +352,12 @@ class Node(object):
                     self.give_individual_a_service_time(ind)
                     ind.service_end_date = self.increment_time(ind.service_start_date, ind.service_time)
                     self.number_in_service += 1
+                    if self.queue_size_watchers:
+                        self.update_queue_size_watchers()
                     self.reset_class_change(ind)
                     newly_free_server.next_end_service_date = ind.service_end_date
+                    if self.hooks:
+                        self.simulation.run_hooks("on_service_start", self, ind)
 
     def block_individual(self, individual, next_node):
         """
@@ -238,9 +372,12 @@ class Node(object):
         individual.is_blocked = True
         self.simulation.statetracker.change_state_block(self, next_node, individual)
         next_node.blocked_queue.append((self.id_number, individual.id_number))
+        next_node.blocked_individuals[(self.id_number, individual.id_number)] = individual
         next_node.len_blocked_queue += 1
         self.simulation.deadlock_detector.action_at_blockage(individual, next_node)
         self.simulation.unchecked_blockage = True
+        if self.hooks:
+            self.simulation.run_hooks("on_block", self, individual)
 
     def change_customer_class(self, individual):
         """
@@ -252,9 +389,13 @@ class Node(object):
             individual.customer_class = random_choice(
                 self.simulation.network.customer_class_names,
                 [self.class_change[individual.previous_class][clss_name] for clss_name in self.simulation.network.customer_class_names],
+                rng=self.class_change_rng,
             )
             individual.prev_priority_class = individual.priority_class
             individual.priority_class = self.simulation.network.priority_class_mapping[individual.customer_class]
+            if individual.server and individual.server.preemption_key is not None:
+                self.remove_from_preemption_index(individual.server)
+                self.add_to_preemption_index(individual.server, individual.priority_class, individual.service_start_date)
 
     def change_customer_class_while_waiting(self):
         """
@@ -275,8 +416,10 @@ class Node(object):
         """
         Moves an individual from their old priority queue to their new priority queue.
         """
-        self.individuals[individual.prev_priority_class].remove(individual)
-        self.individuals[individual.priority_class].append(individual)
+        self.all_individuals.remove(individual, individual.prev_priority_class)
+        self.all_individuals.append(individual)
+        if self.discipline_heaps is not None:
+            self.add_to_discipline_heap(individual)
 
     def change_shift(self):
         """
@@ -284,11 +427,13 @@ class Node(object):
          - adds / deletes servers, or indicates which servers should go off duty
          - begin any new services if free servers
         """
-        self.schedule.get_next_shift()
-        self.next_shift_change = self.schedule.next_shift_change_date
-        self.c = self.schedule.c
+        self.c = self.next_c
+        self.schedule_index += 1
+        self.next_shift_change, self.next_c = self.schedule.get_change(self.schedule_index)
         self.take_servers_off_duty(preemption=self.schedule.preemption)
-        self.add_new_servers(self.schedule.c)
+        self.add_new_servers(self.c)
+        if self.hooks:
+            self.simulation.run_hooks("on_shift_change", self, None)
         self.begin_service_if_possible_change_shift()
 
     def find_number_of_slotted_services(self):
@@ -296,8 +441,8 @@ class Node(object):
         Finds the number of slotted services to start in this slot
         """
         if self.schedule.capacitated:
-            return min(max(self.schedule.slot_size - self.number_in_service, 0), self.number_of_individuals)
-        return min(self.schedule.slot_size, self.number_of_individuals)
+            return min(max(self.slot_size - self.number_in_service, 0), self.number_of_individuals)
+        return min(self.slot_size, self.number_of_individuals)
 
     def interrupt_slotted_services(self):
         """
@@ -305,7 +450,7 @@ class Node(object):
         due to not enough capacity at the current slot, and interrupt their services
         """
         if self.schedule.capacitated and self.schedule.preemption is not False:
-            number_to_interrupt = self.number_in_service - self.schedule.slot_size
+            number_to_interrupt = self.number_in_service - self.slot_size
             if number_to_interrupt > 0:
                 inds_to_interrupt = sorted(
                     [ind for ind in self.all_individuals if ind.service_start_date is not False],
@@ -324,9 +469,7 @@ class Node(object):
         self.interrupt_slotted_services()
         for i in range(number_of_slotted_services):
             if self.number_interrupted_individuals > 0:
-                ind = self.interrupted_individuals[0]
-                self.interrupted_individuals.remove(ind)
-                self.number_interrupted_individuals -= 1
+                ind = self.pop_interrupted_individual()
             else:
                 ind = self.choose_next_customer()
             if ind is not None:
@@ -335,18 +478,76 @@ class Node(object):
                 ind.service_end_date = self.now + ind.service_time
                 ind.server = True
                 self.number_in_service += 1
+                if self.queue_size_watchers:
+                    self.update_queue_size_watchers()
                 self.reset_class_change(ind)
-        self.schedule.get_next_slot()
+                if self.hooks:
+                    self.simulation.run_hooks("on_service_start", self, ind)
+        self.schedule_index += 1
+        self.next_slot_date, self.slot_size = self.schedule.get_change(self.schedule_index)
 
     def choose_next_customer(self):
         """
         Chooses which customer will be next to be served.
         """
-        for priority_individuals in self.individuals:
-            waiting_individuals = [ind for ind in priority_individuals if not ind.server]
+        if self.discipline_heaps is not None:
+            return self.choose_next_customer_by_key()
+        for priority_class in self.all_individuals.priority_classes:
+            waiting_individuals = [ind for ind in self.all_individuals.levels[priority_class] if not ind.server]
             if len(waiting_individuals) > 0:
+                if self.discipline_takes_rng:
+                    return self.service_discipline(waiting_individuals, self.now, rng=self.discipline_rng)
                 return self.service_discipline(waiting_individuals, self.now)
 
+    def choose_next_customer_by_key(self):
+        """
+        Chooses the waiting customer with the smallest key in the highest
+        priority class that has waiting customers, from the tops of the
+        discipline heaps. Entries of customers who are in service are
+        popped on the way.
+        """
+        for priority_class in self.all_individuals.priority_classes:
+            heap = self.discipline_heaps.get(priority_class, ())
+            while heap:
+                entry = heap[0]
+                individual = entry[-1]
+                if individual.discipline_entry is entry and not individual.server:
+                    return individual
+                heappop(heap)
+                if individual.discipline_entry is entry:
+                    individual.discipline_entry = None
+
+    def add_to_discipline_heap(self, individual):
+        """
+        Finds the individual's key, and adds them to the heap of waiting
+        individuals of their priority class. Entries are (key, entry
+        number, individual), the entry number breaking ties in the order
+        individuals joined their priority class.
+        """
+        individual.discipline_key = (self.service_discipline.key(individual), next(self.discipline_entry_numbers))
+        self.push_discipline_entry(individual)
+
+    def push_discipline_entry(self, individual):
+        """
+        Pushes an entry for the individual, with their key, onto the
+        discipline heap of their priority class.
+        """
+        entry = individual.discipline_key + (individual,)
+        individual.discipline_entry = entry
+        heap = self.discipline_heaps.get(individual.priority_class)
+        if heap is None:
+            self.discipline_heaps[individual.priority_class] = [entry]
+        else:
+            heappush(heap, entry)
+
+    def requeue_by_key(self, individual):
+        """
+        Returns an individual whose service was interrupted to the discipline
+        heap, with their original key, if their entry has been popped.
+        """
+        if self.discipline_heaps is not None and individual.discipline_entry is None:
+            self.push_discipline_entry(individual)
+
     def create_starting_servers(self):
         """
         Initialise the servers.
@@ -360,39 +561,32 @@ class Node(object):
         if self.dynamic_classes is True:
             next_time = float('inf')
             next_class = next_individual.customer_class
-            for clss, dist in self.simulation.network.customer_classes[next_individual.customer_class].class_change_time_distributions.items():
-                if dist is not None:
-                    t = dist.sample()
-                    if t < next_time:
-                        next_time = t
-                        next_class = clss
+            for clss, dist in self.simulation.class_change_candidates[next_individual.customer_class]:
+                t = dist.sample()
+                if t < next_time:
+                    next_time = t
+                    next_class = clss
             next_individual.next_class = next_class
             next_individual.class_change_date = self.increment_time(self.now, next_time)
-            self.find_next_class_change()
+            self.add_to_class_change_calendar(next_individual)
 
     def decide_preempt(self, individual):
         """
         Decides if priority preemption is needed, finds the individual to preempt, and preempt them.
+        The individual to preempt is at the top of the preemption index: the
+        latest to start service of the lowest priority customers in service.
         """
-        if self.priority_preempt != False:
-            least_priority = max(s.cust.priority_class for s in self.servers)
-            if individual.priority_class < least_priority:
-                least_prioritised_individuals = [
-                    s.cust
-                    for s in self.servers
-                    if s.cust.priority_class == least_priority
-                ]
-                individual_to_preempt = max(
-                    [ind for ind in least_prioritised_individuals],
-                    key=lambda cust: cust.service_start_date,
-                )
-                self.preempt(individual_to_preempt, individual)
+        if self.priority_preempt != False and self.preemption_index_size > 0:
+            least_priority, service_start_date, server_id, entry_number, server = self.find_customer_to_preempt()
+            if individual.priority_class < -least_priority:
+                self.preempt(server.cust, individual)
 
     def detatch_server(self, server, individual):
         """
         Detaches a server from an individual, and vice versa.
         """
         self.simulation.deadlock_detector.action_at_detatch_server(server)
+        self.remove_from_preemption_index(server)
         server.cust = False
         server.busy = False
         individual.server = False
@@ -418,27 +612,60 @@ class Node(object):
                 return svr
         return None
 
+    def update_queue_size_watchers(self):
+        """
+        Tells any routers that keep an index of queue sizes that the
+        number of individuals at this node, or in service, has changed.
+        """
+        for router in self.queue_size_watchers:
+            router.update_queue_size(self.id_number)
+
     def decide_between_simultaneous_individuals(self):
         """
         Finds the next individual that should now finish service.
         """
         if len(self.next_individual) > 1:
-            next_individual = random_choice(self.next_individual)
+            next_individual = random_choice(self.next_individual, rng=self.simulation.rng)
         else:
             next_individual = self.next_individual[0]
         return next_individual
 
     def find_next_class_change(self):
         """
-        Updates the next_class_change_date and next_class_change_ind
-        """
-        self.next_class_change_date = float('inf')
-        self.next_class_change_ind = None
-        for ind in self.all_individuals:
-            if (ind.class_change_date < self.next_class_change_date) and not ind.server:
-                next_class_change = (ind, ind.class_change_date)
-                self.next_class_change_ind = ind
-                self.next_class_change_date = ind.class_change_date
+        Updates the next_class_change_date and next_class_change_ind,
+        first removing entries from the top of the class change calendar
+        that are no longer current.
+        """
+        calendar = self.class_change_calendar
+        while calendar and not self.is_current_class_change_entry(calendar[0]):
+            heappop(calendar)
+        if calendar:
+            self.next_class_change_date = calendar[0][0]
+            self.next_class_change_ind = self.find_individuals_in_calendar_at(
+                calendar, self.next_class_change_date, self.is_current_class_change_entry
+            )[0]
+        else:
+            self.next_class_change_date = float('inf')
+            self.next_class_change_ind = None
+
+    def find_individuals_in_calendar_at(self, calendar, date, is_current):
+        """
+        Finds the individuals with current entries at the given date, the
+        earliest in the calendar, in the order they are found in the
+        queue. Entries equal to the earliest form a subtree at the top of
+        the heap, so only that subtree is searched.
+        """
+        individuals = []
+        positions = [0]
+        while positions:
+            position = positions.pop()
+            if position < len(calendar) and calendar[position][0] == date:
+                if is_current(calendar[position]):
+                    individuals.append(calendar[position][2])
+                positions += [2 * position + 1, 2 * position + 2]
+        if len(individuals) > 1:
+            individuals = [ind for ind in self.all_individuals if ind in individuals]
+        return individuals
 
     def find_server_utilisation(self):
         """
@@ -447,10 +674,12 @@ class Node(object):
         if isinf(self.c) or self.c == 0:
             self.server_utilisation = None
         else:
+            total_time = self.killed_servers_total_time
+            busy_time = self.killed_servers_busy_time
             for server in self.servers:
-                self.all_servers_total.append(server.total_time)
-                self.all_servers_busy.append(server.busy_time)
-            self.server_utilisation = sum(self.all_servers_busy) / sum(self.all_servers_total)
+                total_time += server.total_time
+                busy_time += server.busy_time
+            self.server_utilisation = busy_time / total_time
 
     def finish_service(self):
         """
@@ -465,6 +694,8 @@ class Node(object):
         self.change_customer_class(next_individual)
         next_node = self.next_node(next_individual)
         next_individual.destination = next_node.id_number
+        if self.hooks:
+            self.simulation.run_hooks("on_service_end", self, next_individual)
         if not isinf(self.c) and self.c > 0:
             next_individual.server.next_end_service_date = float("Inf")
         if next_node.number_of_individuals < next_node.node_capacity:
@@ -519,12 +750,25 @@ class Node(object):
         """
         Kills a server when they go off duty.
         """
+        self.retire_server(srvr)
+        self.servers.remove(srvr)
+
+    def retire_server(self, srvr):
+        """
+        Records a killed server's time and overtime, and adds them to the
+        pool of servers to reuse if no customer still refers to them.
+        Does not remove them from the list of servers.
+        """
         srvr.total_time = self.increment_time(self.next_event_date, -srvr.start_date)
-        self.overtime.append(self.increment_time(self.next_event_date, -srvr.shift_end))
-        self.all_servers_busy.append(srvr.busy_time)
-        self.all_servers_total.append(srvr.total_time)
-        indx = self.servers.index(srvr)
-        del self.servers[indx]
+        overtime = self.increment_time(self.next_event_date, -srvr.shift_end)
+        self.killed_servers_overtime = self.increment_time(self.killed_servers_overtime, overtime)
+        self.number_of_killed_servers += 1
+        self.killed_servers_busy_time += srvr.busy_time
+        self.killed_servers_total_time += srvr.total_time
+        self.remove_from_preemption_index(srvr)
+        srvr.killed = True
+        if srvr.cust is False:
+            self.server_pool.append(srvr)
 
     def next_node(self, ind):
         """
@@ -559,6 +803,9 @@ class Node(object):
             individual_to_preempt.service_time = self.priority_preempt
             individual_to_preempt.service_end_date = False
             self.detatch_server(server, individual_to_preempt)
+            self.requeue_by_key(individual_to_preempt)
+            if self.reneging is True:
+                self.add_to_reneging_calendar(individual_to_preempt)
             self.decide_class_change(individual_to_preempt)
         self.attach_server(server, next_individual)
         next_individual.service_start_date = self.now
@@ -566,6 +813,8 @@ class Node(object):
         next_individual.service_end_date = self.now + next_individual.service_time
         self.reset_class_change(next_individual)
         server.next_end_service_date = next_individual.service_end_date
+        if self.hooks:
+            self.simulation.run_hooks("on_service_start", self, next_individual)
 
     def release(self, next_individual, next_node, reroute=False):
         """
@@ -580,9 +829,11 @@ class Node(object):
           - send individual to next destination
           - release any individuals blocked by this node
         """
-        self.individuals[next_individual.prev_priority_class].remove(next_individual)
+        self.all_individuals.remove(next_individual, next_individual.prev_priority_class)
         self.number_of_individuals -= 1
         self.number_in_service -= 1
+        if self.queue_size_watchers:
+            self.update_queue_size_watchers()
         next_individual.queue_size_at_departure = self.number_of_individuals
         next_individual.exit_date = self.now
         if not reroute:
@@ -615,17 +866,12 @@ class Node(object):
         """
         if (self.len_blocked_queue > 0) and (self.number_of_individuals < self.node_capacity):
             node_to_receive_from = self.simulation.nodes[self.blocked_queue[0][0]]
-            individual_to_receive_index = [
-                ind.id_number for ind in node_to_receive_from.all_individuals
-            ].index(self.blocked_queue[0][1])
-            individual_to_receive = node_to_receive_from.all_individuals[individual_to_receive_index]
-            self.blocked_queue.pop(0)
+            individual_to_receive = self.blocked_individuals.pop(self.blocked_queue.pop(0))
             self.len_blocked_queue -= 1
             if individual_to_receive.interrupted:
                 individual_to_receive.interrupted = False
                 individual_to_receive.service_start_date = individual_to_receive.original_service_start_date
                 individual_to_receive.service_end_date = individual_to_receive.service_start_date + individual_to_receive.original_service_time
-                node_to_receive_from.interrupted_individuals.remove(individual_to_receive)
                 node_to_receive_from.number_interrupted_individuals -= 1
             node_to_receive_from.release(individual_to_receive, self)
 
@@ -635,8 +881,20 @@ class Node(object):
         """
         if self.dynamic_classes:
             individual.class_change_date = float('inf')
-            if individual == self.next_class_change_ind:
-                self.find_next_class_change()
+            individual.class_change_entry = None
+
+    def remove_from_preemption_index(self, server):
+        """
+        Removes a server from the preemption index, if it is there, by
+        forgetting its entry, and rebuilds the heap from the current entries
+        if they are outnumbered.
+        """
+        if server.preemption_key is not None:
+            server.preemption_key = None
+            self.preemption_index_size -= 1
+            if len(self.preemption_index) > 2 * self.preemption_index_size + 32:
+                self.preemption_index = [entry for entry in self.preemption_index if entry[-1].preemption_key is entry]
+                heapify(self.preemption_index)
 
     def renege(self):
         """
@@ -647,11 +905,15 @@ class Node(object):
         reneging_individual = self.decide_between_simultaneous_individuals()
         reneging_individual.reneging_date = float("Inf")
         next_node = self.next_node_for_jockeying(reneging_individual)
-        self.individuals[reneging_individual.prev_priority_class].remove(reneging_individual)
+        self.all_individuals.remove(reneging_individual, reneging_individual.prev_priority_class)
         self.number_of_individuals -= 1
+        if self.queue_size_watchers:
+            self.update_queue_size_watchers()
         reneging_individual.queue_size_at_departure = self.number_of_individuals
         reneging_individual.exit_date = self.now
         self.write_reneging_record(reneging_individual)
+        if self.hooks:
+            self.simulation.run_hooks("on_renege", self, reneging_individual)
         self.reset_individual_attributes(reneging_individual)
         self.simulation.statetracker.change_state_renege(self, next_node, reneging_individual, False)
         next_node.accept(reneging_individual, completed=False)
@@ -661,15 +923,20 @@ class Node(object):
         """
         Returns the reneging date for a given individual.
         """
-        dist = self.simulation.network.customer_classes[ind.customer_class].reneging_time_distributions[self.id_number - 1]
+        dist = self.simulation.reneging_times[self.id_number][ind.customer_class]
         if dist is None:
             return float("inf")
         return self.now + dist.sample(t=self.now, ind=ind)
 
     def get_service_time(self, ind):
         """
-        Returns a service time for the given customer class.
+        Returns a service time for the given customer class, or the one
+        sampled on arrival if the service discipline needed it.
         """
+        if ind.presampled_service_time is not False:
+            service_time = ind.presampled_service_time
+            ind.presampled_service_time = False
+            return service_time
         return self.simulation.service_times[self.id_number][ind.customer_class].sample(t=self.now, ind=ind)
 
     def take_servers_off_duty(self, preemption=False):
@@ -690,9 +957,9 @@ class Node(object):
                 s.shift_end = self.next_event_date
                 if s.cust is not False:
                     self.interrupt_service(s.cust)
-            self.sort_interrupted_individuals()
         for obs in to_delete:
-            self.kill_server(obs)
+            self.retire_server(obs)
+        self.servers = [srvr for srvr in self.servers if not srvr.killed]
 
     def interrupt_service(self, individual):
         """
@@ -703,9 +970,9 @@ class Node(object):
         if self.schedule.preemption == 'reroute':
             self.reroute(individual)
         else:
-            self.interrupted_individuals.append(individual)
             individual.interrupted = True
-            self.number_interrupted_individuals += 1
+            self.push_interrupted_individual(individual)
+            self.requeue_by_key(individual)
             self.write_interruption_record(individual)
             individual.original_service_start_date = individual.service_start_date
             individual.service_start_date = False
@@ -713,12 +980,45 @@ class Node(object):
             individual.service_time = self.schedule.preemption
             individual.service_end_date = False
             self.number_in_service -= 1
+            if self.queue_size_watchers:
+                self.update_queue_size_watchers()
+
+    def push_interrupted_individual(self, individual):
+        """
+        Adds an interrupted individual to the interrupted queue, a heap of
+        (priority class, arrival date, entry number, individual) after a
+        shift change, so that they restart service in that order. Slotted
+        services restart in the order they were interrupted, so there the
+        entries are (entry number, individual).
+        """
+        if self.slotted:
+            entry = (next(self.interrupted_entry_numbers), individual)
+        else:
+            entry = (individual.priority_class, individual.arrival_date, next(self.interrupted_entry_numbers), individual)
+        individual.interrupted_entry = entry
+        heappush(self.interrupted_queue, entry)
+        self.number_interrupted_individuals += 1
 
-    def sort_interrupted_individuals(self):
+    def is_current_interrupted_entry(self, entry):
         """
-        Sorts the list of interrupted individuals by priority class and arrival date.
+        Checks if an entry of the interrupted queue is the individual's
+        latest, and that they are still interrupted.
         """
-        self.interrupted_individuals.sort(key=lambda x: (x.priority_class, x.arrival_date))
+        individual = entry[-1]
+        return individual.interrupted_entry is entry and individual.interrupted
+
+    def pop_interrupted_individual(self):
+        """
+        Removes and returns the next interrupted individual to restart
+        service, skipping entries that are no longer current, such as
+        those of interrupted individuals who were blocked and then released.
+        """
+        while not self.is_current_interrupted_entry(self.interrupted_queue[0]):
+            heappop(self.interrupted_queue)
+        individual = heappop(self.interrupted_queue)[-1]
+        individual.interrupted_entry = None
+        self.number_interrupted_individuals -= 1
+        return individual
 
     def reroute(self, individual):
         """
@@ -755,24 +1055,45 @@ class Node(object):
                 elif (s.next_end_service_date == next_end_service_date) and (not isinf(next_end_service_date)):
                     self.possible_next_events['end_service'][0].append(s.cust)
 
+    def is_current_reneging_entry(self, entry):
+        """
+        Checks if an entry of the reneging calendar is the individual's
+        latest, and that they are still waiting at this node.
+        """
+        individual = entry[2]
+        return individual.reneging_entry is entry and individual.node == self.id_number and not individual.server
+
     def update_next_renege_time(self):
         """
-        Updates the next renege time in the `possible_next_events` dictionary.
+        Updates the next renege time in the `possible_next_events` dictionary,
+        first removing entries from the top of the reneging calendar
+        that are no longer current.
         """
         if not isinf(self.c) and self.reneging is True:
-            next_renege_date = float('Inf')
-            for ind in self.all_individuals:
-                if (ind.reneging_date < next_renege_date) and not ind.server:
-                    self.possible_next_events['renege'] = ([ind], ind.reneging_date)
-                    next_renege_date = ind.reneging_date
-                elif (ind.reneging_date == next_renege_date) and (not ind.server) and (not isinf(next_renege_date)):
-                    self.possible_next_events['renege'][0].append(ind)
+            calendar = self.reneging_calendar
+            while calendar and not self.is_current_reneging_entry(calendar[0]):
+                heappop(calendar)
+            if calendar:
+                next_renege_date = calendar[0][0]
+                self.possible_next_events['renege'] = (
+                    self.find_individuals_in_calendar_at(calendar, next_renege_date, self.is_current_reneging_entry),
+                    next_renege_date
+                )
+
+    def is_current_class_change_entry(self, entry):
+        """
+        Checks if an entry of the class change calendar is the
+        individual's latest, and that they are still waiting at this node.
+        """
+        individual = entry[2]
+        return individual.class_change_entry is entry and individual.node == self.id_number and not individual.server
 
     def update_next_class_change_while_waiting(self):
         """
         Updates the next time to change a customer's class while waiting in the `possible_next_events` dictionary.
         """
         if self.dynamic_classes is True and not isinf(self.c):
+            self.find_next_class_change()
             self.possible_next_events['class_change'] = (self.next_class_change_ind, self.next_class_change_date)
 
     def update_next_shift_change_or_slot_time(self):
@@ -783,7 +1104,7 @@ class Node(object):
             if self.schedule.schedule_type == 'schedule':
                 self.possible_next_events['shift_change'] = (None, self.next_shift_change)
             if self.schedule.schedule_type == 'slotted':
-                self.possible_next_events['slotted_service'] = (None, self.schedule.next_slot_date)
+                self.possible_next_events['slotted_service'] = (None, self.next_slot_date)
 
     def update_next_event_date(self):
         """
@@ -988,6 +1309,16 @@ class Node(object):
         )
         individual.data_records.append(record)
 
+    def write_rejection_records(self, individuals):
+        """
+        Writes the rejection records of a batch of individuals of the
+        same class, all rejected at once, from a single record.
+        """
+        self.write_baulking_or_rejection_record(individuals[0], record_type="rejection")
+        fields = individuals[0].data_records[-1][1:]
+        for individual in individuals[1:]:
+            individual.data_records.append(DataRecord(individual.id_number, *fields))
+
     def reset_individual_attributes(self, individual):
         """
         Resets the attributes of an individual
@@ -1000,3 +1331,5 @@ class Node(object):
         individual.queue_size_at_arrival = False
         individual.queue_size_at_departure = False
         individual.destination = False
+        individual.discipline_entry = None
+        individual.presampled_service_time = False
@@ -0,0 +1,302 @@
+from bisect import bisect_left, insort
+from collections.abc import MutableSequence
+from itertools import chain, compress
+
+
+class PriorityLevel:
+    """
+    The individuals of one priority class, in the order they joined.
+
+    Removing an individual leaves a gap, found from an index of positions,
+    and the gaps are closed up once they outnumber the individuals, so
+    appending and removing take O(1) amortised time. Iterating skips the
+    gaps using a flag for each slot. The individual at a given position is
+    found with a Fenwick tree of those flags, built the first time it is
+    needed and kept up to date after that, in O(log n) time.
+    """
+
+    def __init__(self, individuals=()):
+        self.slots = list(individuals)
+        self.present = bytearray(b"\x01") * len(self.slots)
+        self.positions = {individual: slot for slot, individual in enumerate(self.slots)}
+        self.size = len(self.slots)
+        self.counts = None
+
+    def append(self, individual):
+        """
+        Adds an individual to the back of the queue.
+        """
+        self.positions[individual] = len(self.slots)
+        self.slots.append(individual)
+        self.present.append(1)
+        self.size += 1
+        if self.counts is not None:
+            self.extend_counts()
+
+    def remove(self, individual):
+        """
+        Removes an individual from the queue, leaving a gap, and closes up
+        the gaps if they outnumber the individuals.
+        """
+        slot = self.positions.pop(individual)
+        self.slots[slot] = None
+        self.present[slot] = 0
+        self.size -= 1
+        if self.counts is not None:
+            self.add_to_counts(slot, -1)
+        if len(self.slots) > 2 * self.size + 32:
+            self.close_gaps()
+
+    def close_gaps(self):
+        """
+        Moves the individuals up to fill the gaps left by removals.
+        """
+        self.slots = list(self)
+        self.present = bytearray(b"\x01") * self.size
+        self.positions = {individual: slot for slot, individual in enumerate(self.slots)}
+        if self.counts is not None:
+            self.build_counts()
+
+    def build_counts(self):
+        """
+        Builds the Fenwick tree, where entry i counts the individuals in
+        the slots from i - (i & -i) up to, but not including, i.
+        """
+        counts = [0] + list(self.present)
+        for i in range(1, len(counts)):
+            parent = i + (i & -i)
+            if parent < len(counts):
+                counts[parent] += counts[i]
+        self.counts = counts
+
+    def extend_counts(self):
+        """
+        Adds the Fenwick tree entry for a newly appended individual.
+        """
+        counts = self.counts
+        i = len(counts)
+        total = 1
+        j = i - 1
+        while j > i - (i & -i):
+            total += counts[j]
+            j -= j & -j
+        counts.append(total)
+
+    def add_to_counts(self, slot, change):
+        """
+        Changes the count of individuals in a slot.
+        """
+        counts = self.counts
+        i = slot + 1
+        while i < len(counts):
+            counts[i] += change
+            i += i & -i
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return compress(self.slots, self.present)
+
+    def __contains__(self, individual):
+        return individual in self.positions
+
+    def __getitem__(self, index):
+        if not isinstance(index, int):
+            return list(self)[index]
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("PriorityLevel index out of range")
+        if self.counts is None:
+            self.build_counts()
+        counts = self.counts
+        slot = 0
+        step = 1 << ((len(counts) - 1).bit_length() - 1)
+        while step:
+            if slot + step < len(counts) and counts[slot + step] <= index:
+                slot += step
+                index -= counts[slot]
+            step >>= 1
+        return self.slots[slot]
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, PriorityLevel, PriorityClassView)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class PriorityClassView(MutableSequence):
+    """
+    A live view of the individuals of one priority class, which reads and
+    changes the queues like a list, even while the priority class is empty.
+    """
+
+    def __init__(self, queues, priority_class):
+        self.queues = queues
+        self.priority_class = priority_class
+
+    @property
+    def level(self):
+        return self.queues.levels.get(self.priority_class, ())
+
+    def __len__(self):
+        return len(self.level)
+
+    def __iter__(self):
+        return iter(self.level)
+
+    def __contains__(self, individual):
+        return individual in self.level
+
+    def __getitem__(self, index):
+        if isinstance(index, int) and not self.level:
+            raise IndexError("list index out of range")
+        return self.level[index]
+
+    def __setitem__(self, index, individual):
+        individuals = list(self)
+        individuals[index] = individual
+        self.queues.replace_level(self.priority_class, individuals)
+
+    def __delitem__(self, index):
+        individuals = self[index] if isinstance(index, slice) else [self[index]]
+        for individual in individuals:
+            self.queues.remove(individual, self.priority_class)
+
+    def insert(self, index, individual):
+        individuals = list(self)
+        individuals.insert(index, individual)
+        self.queues.replace_level(self.priority_class, individuals)
+
+    def append(self, individual):
+        self.queues.append_to(individual, self.priority_class)
+
+    def remove(self, individual):
+        if individual not in self:
+            raise ValueError("list.remove(x): x not in list")
+        self.queues.remove(individual, self.priority_class)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, PriorityLevel, PriorityClassView)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class PriorityQueues:
+    """
+    The individuals at a node, held in one queue per priority class.
+
+    Each queue is a PriorityLevel, which keeps its individuals in the order
+    they were added, and lets any individual be removed without searching
+    through the queue. Only priority classes with individuals in them have
+    a queue, and a sorted list of those priority classes is kept, so models
+    with many priority classes pay nothing for the empty ones. Iterating
+    goes through the individuals in priority order, and in order of arrival
+    within each priority class, without copying them into a new list. The
+    number of individuals is kept as they are added and removed.
+    """
+
+    def __init__(self, levels=()):
+        """
+        Initialises the queues, optionally from a list of lists of
+        individuals, one for each priority class.
+        """
+        self.levels = {}
+        self.priority_classes = []
+        self.size = 0
+        for priority_class, level in enumerate(levels):
+            self.replace_level(priority_class, level)
+
+    def append(self, individual):
+        """
+        Adds an individual to the back of their priority class's queue.
+        """
+        self.append_to(individual, individual.priority_class)
+
+    def append_to(self, individual, priority_class):
+        """
+        Adds an individual to the back of the given priority class's queue.
+        """
+        level = self.levels.get(priority_class)
+        if level is None:
+            self.levels[priority_class] = PriorityLevel([individual])
+            insort(self.priority_classes, priority_class)
+        else:
+            level.append(individual)
+        self.size += 1
+
+    def remove(self, individual, priority_class):
+        """
+        Removes an individual from the given priority class's queue, and
+        forgets the queue if it is now empty.
+        """
+        level = self.levels[priority_class]
+        level.remove(individual)
+        self.size -= 1
+        if not level:
+            self.forget_level(priority_class)
+
+    def replace_level(self, priority_class, individuals):
+        """
+        Replaces the given priority class's queue with the individuals.
+        """
+        level = PriorityLevel(individuals)
+        if priority_class in self.levels:
+            self.size -= len(self.levels[priority_class])
+            self.forget_level(priority_class)
+        if level:
+            self.levels[priority_class] = level
+            insort(self.priority_classes, priority_class)
+            self.size += len(level)
+
+    def forget_level(self, priority_class):
+        """
+        Forgets the given priority class's queue.
+        """
+        del self.levels[priority_class]
+        del self.priority_classes[bisect_left(self.priority_classes, priority_class)]
+
+    def as_lists(self, number_of_priority_classes):
+        """
+        Returns a live list-like view of the individuals of each priority
+        class, including the empty ones.
+        """
+        if self.priority_classes:
+            number_of_priority_classes = max(number_of_priority_classes, self.priority_classes[-1] + 1)
+        return [PriorityClassView(self, priority_class) for priority_class in range(number_of_priority_classes)]
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        if len(self.priority_classes) == 1:
+            return iter(self.levels[self.priority_classes[0]])
+        return chain.from_iterable(self.levels[priority_class] for priority_class in self.priority_classes)
+
+    def __contains__(self, individual):
+        return any(individual in level for level in self.levels.values())
+
+    def __getitem__(self, index):
+        if isinstance(index, int) and index >= 0:
+            for priority_class in self.priority_classes:
+                level = self.levels[priority_class]
+                if index < len(level):
+                    return level[index]
+                index -= len(level)
+            raise IndexError("PriorityQueues index out of range")
+        return list(self)[index]
+
+    def __eq__(self, other):
+        if isinstance(other, (list, PriorityQueues)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
@@ -65,6 +65,8 @@ class PSNode(Node):
             next_individual.time_left = next_individual.service_time
             next_individual.with_server = True
             self.update_all_service_end_dates()
+            if self.hooks:
+                self.simulation.run_hooks("on_service_start", self, next_individual)
 
     def begin_service_if_possible_release(self, ind=None, server=None):
         """
@@ -82,4 +84,8 @@ class PSNode(Node):
             ind.service_time = self.get_service_time(ind)
             ind.time_left = ind.service_time
             ind.with_server = True
-        self.update_all_service_end_dates()
+            self.update_all_service_end_dates()
+            if self.hooks:
+                self.simulation.run_hooks("on_service_start", self, ind)
+        else:
+            self.update_all_service_end_dates()
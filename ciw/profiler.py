@@ -0,0 +1,99 @@
+from time import perf_counter
+
+
+class Profiler:
+    """
+    Profiles a simulation run:
+      - counts the number of events carried out, by node and event type
+      - measures the wall time spent carrying out events, updating next
+        event dates, sampling from distributions, and routing
+
+    Wall times are inclusive, so the time spent carrying out events
+    also contains the time spent sampling and routing during those
+    events. The simulation's node methods are only wrapped when a
+    profiler is given, so there is no cost when profiling is not used.
+    """
+
+    def __init__(self):
+        """
+        Initialises the profiler.
+        """
+        self.event_counts = {}
+        self.wall_times = {
+            "have_event": 0.0,
+            "update_next_event_date": 0.0,
+            "sampling": 0.0,
+            "routing": 0.0,
+        }
+
+    def initialise(self, simulation):
+        """
+        Wraps the relevant methods of the simulation's nodes.
+        """
+        self.simulation = simulation
+        arrival_node = simulation.nodes[0]
+        self.profile_events(arrival_node)
+        self.time_method(arrival_node, "inter_arrival", "sampling")
+        self.time_method(arrival_node, "batch_size", "sampling")
+        for node in simulation.transitive_nodes:
+            self.profile_events(node)
+            self.time_method(node, "update_next_event_date", "update_next_event_date")
+            self.time_method(node, "get_service_time", "sampling")
+            self.time_method(node, "get_reneging_date", "sampling")
+            self.time_method(node, "next_node", "routing")
+            self.time_method(node, "next_node_for_rerouting", "routing")
+            self.time_method(node, "next_node_for_jockeying", "routing")
+
+    def profile_events(self, node):
+        """
+        Wraps the node's have_event method to count and time its events.
+        """
+        have_event = node.have_event
+
+        def profiled_have_event():
+            key = (node.id_number, node.next_event_type)
+            self.event_counts[key] = self.event_counts.get(key, 0) + 1
+            start = perf_counter()
+            have_event()
+            self.wall_times["have_event"] += perf_counter() - start
+
+        node.have_event = profiled_have_event
+
+    def time_method(self, obj, method_name, section):
+        """
+        Wraps a method of obj so that its wall time is added to section.
+        """
+        method = getattr(obj, method_name)
+
+        def timed_method(*args, **kwargs):
+            start = perf_counter()
+            result = method(*args, **kwargs)
+            self.wall_times[section] += perf_counter() - start
+            return result
+
+        setattr(obj, method_name, timed_method)
+
+    @property
+    def number_of_events(self):
+        """
+        The total number of events carried out.
+        """
+        return sum(self.event_counts.values())
+
+    def events_by_type(self):
+        """
+        Returns the number of events of each type, summed over all nodes.
+        """
+        counts = {}
+        for (node_id, event_type), count in self.event_counts.items():
+            counts[event_type] = counts.get(event_type, 0) + count
+        return counts
+
+    def events_by_node(self):
+        """
+        Returns the number of events at each node, summed over all event types.
+        """
+        counts = {}
+        for (node_id, event_type), count in self.event_counts.items():
+            counts[node_id] = counts.get(node_id, 0) + count
+        return counts
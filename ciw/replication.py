@@ -0,0 +1,48 @@
+from collections import namedtuple
+from .auxiliary import derive_seed
+from .simulation import Simulation
+
+PairedEstimate = namedtuple(
+    "PairedEstimate", ["estimate", "antithetic_estimate", "mean"]
+)
+
+
+def replicate(
+    network,
+    statistic,
+    max_simulation_time,
+    replications,
+    seed=0,
+    antithetic=False,
+    **kwargs
+):
+    """
+    Runs a number of replications of a simulation of the network, each
+    until max_simulation_time, returning the statistic of each. The
+    statistic is a function of the finished simulation object, and any
+    other keyword arguments are passed to ciw.Simulation.
+
+    Each replication is given its own seed, derived from seed. If
+    antithetic, each replication is run twice, once with its streams and
+    once with their antithetic streams, and a PairedEstimate of the two
+    statistics and their mean is returned for each.
+    """
+    results = []
+    for replication in range(replications):
+        z = derive_seed(seed, "replication", replication)
+        estimate = run_replication(network, statistic, max_simulation_time, z, False, kwargs)
+        if antithetic:
+            antithetic_estimate = run_replication(network, statistic, max_simulation_time, z, True, kwargs)
+            results.append(PairedEstimate(estimate, antithetic_estimate, (estimate + antithetic_estimate) / 2))
+        else:
+            results.append(estimate)
+    return results
+
+
+def run_replication(network, statistic, max_simulation_time, seed, antithetic, kwargs):
+    """
+    Runs a single replication and returns its statistic.
+    """
+    Q = Simulation(network, seed=seed, antithetic=antithetic, **kwargs)
+    Q.simulate_until_max_time(max_simulation_time)
+    return statistic(Q)
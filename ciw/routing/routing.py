@@ -1,10 +1,17 @@
 import ciw
 import itertools
+import numbers
+import random
+from bisect import bisect_left, insort
+from ciw.auxiliary import derive_seed, random_stream
 
 class NetworkRouting:
     """
     A class to hold a number of routing objects for each node.
     """
+    rng = random
+    initialises_batches = True
+
     def __init__(self, routers):
         """
         Sets up the router objects for each node.
@@ -19,12 +26,28 @@ class NetworkRouting:
         for router, node in zip(self.routers, self.simulation.transitive_nodes):
             router.initialise(self.simulation, node)
 
+    def seed(self, z, antithetic=False):
+        """
+        Gives each node's router its own random number stream, seeded
+        from z. If z is None the routers use the random module.
+        """
+        for i, router in enumerate(self.routers):
+            router.seed(None if z is None else derive_seed(z, i + 1), antithetic)
+
     def initialise_individual(self, ind):
         """
         A method that is called at the arrival node when the individual is spawned.
         """
         pass
 
+    def initialise_individuals(self, individuals):
+        """
+        A method that is called at the arrival node when a batch of
+        individuals is spawned, before any of them are released.
+        """
+        for ind in individuals:
+            self.initialise_individual(ind)
+
     def next_node(self, ind, node_id):
         """
         Chooses the next node.
@@ -47,37 +70,87 @@ class NetworkRouting:
 class TransitionMatrix(NetworkRouting):
     """
     A class to hold a number of probabilistic routing objects.
+
+    The transition matrix can be a list of lists, a dictionary mapping
+    node ids to dictionaries of destination ids and probabilities, or a
+    scipy sparse matrix. Only the non-zero probabilities of each row are
+    kept, so large sparse networks need not store their zeros.
     """
     def __init__(self, transition_matrix):
         """
         Sets up the relevant probabilistic router objects for each node.
         """
-        n_destinations = len(transition_matrix)
+        self.rows_given_by_node_id = isinstance(transition_matrix, dict)
+        if self.rows_given_by_node_id:
+            self.row_lengths = []
+        elif hasattr(transition_matrix, "tocsr"):
+            self.row_lengths = [transition_matrix.shape[1]] * transition_matrix.shape[0]
+        else:
+            self.row_lengths = [len(row) for row in transition_matrix]
         self.routers = [
-            Probabilistic(
-                destinations=[i for i in range(1, n_destinations + 1)],
-                probs=row
-            ) for row in transition_matrix
+            Probabilistic(destinations=list(row), probs=list(row.values()))
+            for row in self.find_sparse_rows(transition_matrix)
+        ]
+
+    def find_sparse_rows(self, transition_matrix):
+        """
+        Returns a list of the rows of the transition matrix, each a
+        dictionary of destination ids and their non-zero probabilities.
+        """
+        if isinstance(transition_matrix, dict):
+            n_rows = max(transition_matrix, default=0)
+            return [
+                {dest: p for dest, p in sorted(transition_matrix.get(node, {}).items()) if p != 0}
+                for node in range(1, n_rows + 1)
+            ]
+        if hasattr(transition_matrix, "tocsr"):
+            matrix = transition_matrix.tocsr(copy=True)
+            matrix.sum_duplicates()
+            return [
+                {int(dest) + 1: float(p) for dest, p in zip(matrix.indices[start:end], matrix.data[start:end]) if p != 0}
+                for start, end in zip(matrix.indptr, matrix.indptr[1:])
+            ]
+        return [
+            {dest: p for dest, p in enumerate(row, start=1) if p != 0}
+            for row in transition_matrix
         ]
 
     def initialise(self, simulation):
+        if self.rows_given_by_node_id:
+            missing_rows = simulation.network.number_of_nodes - len(self.routers)
+            self.routers += [Probabilistic(destinations=[], probs=[]) for _ in range(missing_rows)]
         super().initialise(simulation)
         if len(self.routers) != simulation.network.number_of_nodes:
             raise ValueError("Ensure a transition matrix is given, and that the number of rows is equal to the number of nodes in the network.")
+        if any(length != simulation.network.number_of_nodes for length in self.row_lengths):
+            raise ValueError("Ensure that every row of the transition matrix has an entry for each node in the network.")
 
 
 class ProcessBased(NetworkRouting):
     """
     A class to route an individual based on a pre-defined process.
     """
-    def __init__(self, route_function):
+    def __init__(self, route_function, routes=None, batch_route_function=None):
         """
         Initialises the routing object.
 
         Takes:
-            - route_function: a function that returns a pre-defined route 
+            - route_function: a function that returns a pre-defined route,
+              or the id of a route in routes
+            - routes: an optional route table, a list or dictionary of
+              routes indexed by route id
+            - batch_route_function: an optional function that takes a
+              batch of individuals and returns a route, or route id, for
+              each of them
         """
         self.route_function = route_function
+        self.batch_route_function = batch_route_function
+        if routes is None:
+            self.routes = None
+        elif isinstance(routes, dict):
+            self.routes = {route_id: self.freeze_route(route) for route_id, route in routes.items()}
+        else:
+            self.routes = [self.freeze_route(route) for route in routes]
 
     def initialise(self, simulation):
         """
@@ -85,20 +158,76 @@ class ProcessBased(NetworkRouting):
         """
         self.simulation = simulation
 
+    def seed(self, z, antithetic=False):
+        """
+        Gives the router its own random number stream, seeded with z.
+        If z is None the router uses the random module.
+        """
+        self.rng = random if z is None else random_stream(z, antithetic)
+
+    def freeze_route(self, route):
+        """
+        Returns the route as a tuple, so that it can be shared between
+        individuals. Tuples are returned as they are.
+        """
+        return tuple(route)
+
+    @property
+    def initialises_batches(self):
+        """
+        Batches are routed in one call only if given a batch route
+        function, as the route function may look at the state of the
+        simulation as each individual of the batch is released.
+        """
+        return self.batch_route_function is not None
+
+    def lookup_route(self, route):
+        """
+        Returns the route itself, or the route in the route table with
+        the given route id.
+        """
+        if self.routes is not None:
+            return self.routes[route]
+        return self.freeze_route(route)
+
+    def find_route(self, ind):
+        """
+        Returns the route of the individual, either from the route
+        function, or from the route table using the route id given by
+        the route function.
+        """
+        return self.lookup_route(self.route_function(ind, self.simulation))
+
     def initialise_individual(self, ind):
         """
         A method that is called at the arrival node when the individual is spawned.
         """
-        ind.route = self.route_function(ind, self.simulation)
+        ind.route_nodes = self.find_route(ind)
+        ind.route_cursor = 0
+
+    def initialise_individuals(self, individuals):
+        """
+        A method that is called at the arrival node when a batch of
+        individuals is spawned, giving them all their routes with one
+        call to the batch route function.
+        """
+        if self.batch_route_function is None:
+            return super().initialise_individuals(individuals)
+        routes = self.batch_route_function(individuals, self.simulation)
+        for ind, route in zip(individuals, routes):
+            ind.route_nodes = self.lookup_route(route)
+            ind.route_cursor = 0
 
     def next_node(self, ind, node_id):
         """
-        Chooses the next node from the process-based pre-defined route.
+        Chooses the next node from the process-based pre-defined route,
+        and moves the individual's cursor along it.
         """
-        if len(ind.route) == 0:
+        if ind.route_cursor == len(ind.route_nodes):
             node_index = -1
         else:
-            node_index = ind.route.pop(0)
+            node_index = ind.route_nodes[ind.route_cursor]
+            ind.route_cursor += 1
         return self.simulation.nodes[node_index]
 
     def next_node_for_rerouting(self, ind, node_id):
@@ -117,20 +246,41 @@ class FlexibleProcessBased(ProcessBased):
     """
     A class to route an individual based on a pre-defined process.
     """
-    def __init__(self, route_function, rule, choice):
+    def __init__(self, route_function, rule, choice, routes=None, batch_route_function=None):
         """
         Initialises the routing object.
 
         Takes:
-            - route_function: a function that returns a pre-defined route 
-        """
-        self.route_function = route_function
+            - route_function: a function that returns a pre-defined route,
+              or the id of a route in routes
+            - rule: one of 'any' or 'all'
+            - choice: one of 'random', 'jsq' or 'lb'
+            - routes: an optional route table, a list or dictionary of
+              routes indexed by route id
+            - batch_route_function: an optional function that takes a
+              batch of individuals and returns a route, or route id, for
+              each of them
+        """
+        super().__init__(route_function, routes, batch_route_function)
         if rule not in ['any', 'all']:
             raise ValueError("Flexible routing rules must be one of 'any' or 'all'.")
         if choice not in ['random', 'jsq', 'lb']:
             raise ValueError("Flexible routing choices must be one of 'random', 'jsq', or 'lb'.")
         self.rule = rule
         self.choice = choice
+        self.subset_routers = {}
+
+    def initialise(self, simulation):
+        """
+        Gives the simulation attribute to the routing object, and clears
+        any routers kept from a previous simulation.
+        """
+        super().initialise(simulation)
+        self.subset_routers = {}
+
+    def seed(self, z, antithetic=False):
+        super().seed(z, antithetic)
+        self.subset_routers = {}
 
     def find_next_node_from_subset(self, subset, ind):
         """
@@ -138,38 +288,57 @@ class FlexibleProcessBased(ProcessBased):
         according to the 'choice' parameter
         """
         if self.choice == 'random':
-            return ciw.random_choice(subset)
-        if self.choice == 'jsq':
-            temp_router = JoinShortestQueue(destinations=subset)
-            temp_router.initialise(self.simulation, None)
-            nd = temp_router.next_node(ind)
-            return nd.id_number
-        if self.choice == 'lb':
-            temp_router = LoadBalancing(destinations=subset)
-            temp_router.initialise(self.simulation, None)
-            nd = temp_router.next_node(ind)
-            return nd.id_number
+            return ciw.random_choice(subset, rng=self.rng)
+        return self.get_subset_router(subset).next_node(ind).id_number
+
+    def get_subset_router(self, subset):
+        """
+        Gets the JoinShortestQueue or LoadBalancing router that chooses
+        between the nodes in the subset, creating it the first time that
+        subset is seen and reusing it afterwards.
+        """
+        key = tuple(subset)
+        if key not in self.subset_routers:
+            router_type = JoinShortestQueue if self.choice == 'jsq' else LoadBalancing
+            router = router_type(destinations=list(subset))
+            router.initialise(self.simulation, None)
+            router.rng = self.rng
+            self.subset_routers[key] = router
+        return self.subset_routers[key]
+
+    def freeze_route(self, route):
+        """
+        Returns the route as a tuple of tuples, so that it can be shared
+        between individuals.
+        """
+        return tuple(tuple(subset) for subset in route)
 
     def update_individual_route(self, ind, next_node_id):
         """
-        Updates the individual route by removing chosen nodes
-        along the route, according to the 'rule' parameter
+        Updates the individual route by moving the cursor past chosen
+        nodes along the route, according to the 'rule' parameter. For
+        'all', the nodes of the current set not yet visited are kept on
+        the individual, as the route itself is shared.
         """
         if self.rule == 'any':
-            ind.route = ind.route[1:]
+            ind.route_cursor += 1
         if self.rule == 'all':
-            ind.route[0].remove(next_node_id)
-            if len(ind.route[0]) == 0:
-                ind.route = ind.route[1:]
+            ind.route_unvisited.remove(next_node_id)
+            if len(ind.route_unvisited) == 0:
+                ind.route_cursor += 1
+                ind.route_unvisited = None
 
     def next_node(self, ind, node_id):
         """
         Chooses the next node from the process-based pre-defined route.
         """
-        if len(ind.route) == 0:
+        if ind.route_cursor == len(ind.route_nodes):
             node_index = -1
         else:
-            node_index = self.find_next_node_from_subset(ind.route[0], ind)
+            if self.rule == 'all' and ind.route_unvisited is None:
+                ind.route_unvisited = list(ind.route_nodes[ind.route_cursor])
+            subset = ind.route_unvisited if self.rule == 'all' else ind.route_nodes[ind.route_cursor]
+            node_index = self.find_next_node_from_subset(subset, ind)
             self.update_individual_route(ind, node_index)
         return self.simulation.nodes[node_index]
 
@@ -179,6 +348,8 @@ class NodeRouting:
     """
     A generic routing class to determine next sampled node.
     """
+    rng = random
+
     def initialise(self, simulation, node):
         """
         Gives the simulation and node attributes to the routing object.
@@ -190,6 +361,13 @@ class NodeRouting:
     def error_check_at_initialise(self):
         pass
 
+    def seed(self, z, antithetic=False):
+        """
+        Gives the router its own random number stream, seeded with z.
+        If z is None the router uses the random module.
+        """
+        self.rng = random if z is None else random_stream(z, antithetic)
+
     def next_node_for_rerouting(self, ind):
         """
         By default, the next node for rerouting uses the same method as next_node.
@@ -224,18 +402,27 @@ class Probabilistic(NodeRouting):
             raise ValueError("Routing probabilities must sum to 1 or less.")
         self.destinations = destinations + [-1]
         self.probs = probs + [1 - sum(probs)]
+        self.cumulative_probs = list(itertools.accumulate(self.probs))
+        self.certain_exit = all(p == 0.0 for p in self.probs[:-1]) and self.probs[-1] == 1.0
 
     def error_check_at_initialise(self):
         if len(self.probs) != len(self.destinations):
             raise ValueError("Routing probabilities should correspond to destinations, and so should be lists of the same length.")
-        if not set(self.destinations).issubset(set([nd.id_number for nd in self.simulation.nodes[1:]])):
+        number_of_nodes = self.simulation.network.number_of_nodes
+        if not all(d == -1 or (isinstance(d, numbers.Real) and d % 1 == 0 and 1 <= d <= number_of_nodes) for d in self.destinations):
             raise ValueError("Routing destinations should be a subset of the nodes in the network.")
+        self.destinations = [int(d) for d in self.destinations]
 
     def next_node(self, ind):
         """
-        Probabilistically chooses the next node from the destinations.
+        Probabilistically chooses the next node from the destinations,
+        by a binary search of the cumulative probabilities. This makes
+        the same choice as ciw.random_choice for the same random number.
         """
-        node_index = ciw.random_choice(self.destinations, self.probs)
+        if self.certain_exit:
+            return self.simulation.nodes[-1]
+        index = bisect_left(self.cumulative_probs, self.rng.random())
+        node_index = self.destinations[min(index, len(self.destinations) - 1)]
         return self.simulation.nodes[node_index]
 
 
@@ -275,7 +462,7 @@ class JoinShortestQueue(NodeRouting):
     A router that sends the individual to the node
     with the shortest queue from a list of destinations.
     """
-    def __init__(self, destinations, tie_break='random'):
+    def __init__(self, destinations, tie_break='random', sample_size=None, indexed=False):
         """
         Initialises the routing object.
 
@@ -284,39 +471,117 @@ class JoinShortestQueue(NodeRouting):
             - tie_break: the method to deal with ties.
                 + "random" - randomly choose between ties
                 + "order" - prioritise nodes in the order given by the destinations
-        """
+            - sample_size: if given, the number of destinations sampled at
+              random for each decision, choosing the shortest queue of
+              those sampled (the power of d choices)
+            - indexed: whether to keep an index of the destinations by
+              queue size, updated whenever their queue sizes change, rather
+              than comparing every destination for each decision
+        """
+        if tie_break not in ['random', 'order']:
+            raise ValueError("Tie breaks must be one of 'random' or 'order'.")
+        if sample_size is not None:
+            if not isinstance(sample_size, int) or not 1 <= sample_size <= len(destinations):
+                raise ValueError("The sample size must be an integer between 1 and the number of destinations.")
+            if indexed:
+                raise ValueError("Routers that sample destinations cannot also be indexed.")
         self.destinations = destinations
         self.tie_break = tie_break
+        self.sample_size = sample_size
+        self.indexed = indexed
+
+    def initialise(self, simulation, node):
+        super().initialise(simulation, node)
+        if self.indexed:
+            self.initialise_index()
 
     def error_check_at_initialise(self):
         if not set(self.destinations).issubset(set([nd.id_number for nd in self.simulation.nodes[1:]])):
             raise ValueError("Routing destinations should be a subset of the nodes in the network.")
 
+    def initialise_index(self):
+        """
+        Sets up the index of destinations by queue size, kept as sorted
+        lists of their positions in the destinations, and asks the
+        destination nodes to report changes in their queue sizes.
+        """
+        self.positions = {}
+        for position, node_index in enumerate(self.destinations):
+            self.positions.setdefault(node_index, []).append(position)
+        self.queue_sizes = [self.get_queue_size(node_index) for node_index in self.destinations]
+        self.positions_by_queue_size = {}
+        for position, queue_size in enumerate(self.queue_sizes):
+            self.positions_by_queue_size.setdefault(queue_size, []).append(position)
+        self.shortest_queue_size = min(self.positions_by_queue_size)
+        for node_index in self.positions:
+            self.simulation.nodes[node_index].queue_size_watchers.append(self)
+
+    def update_queue_size(self, node_index):
+        """
+        Moves the destination node_index to its new place in the index.
+        """
+        queue_size = self.get_queue_size(node_index)
+        for position in self.positions[node_index]:
+            old_queue_size = self.queue_sizes[position]
+            if queue_size == old_queue_size:
+                continue
+            self.queue_sizes[position] = queue_size
+            old_positions = self.positions_by_queue_size[old_queue_size]
+            old_positions.pop(bisect_left(old_positions, position))
+            if not old_positions:
+                del self.positions_by_queue_size[old_queue_size]
+            insort(self.positions_by_queue_size.setdefault(queue_size, []), position)
+            if queue_size < self.shortest_queue_size:
+                self.shortest_queue_size = queue_size
+            elif old_queue_size == self.shortest_queue_size and not old_positions:
+                self.shortest_queue_size = min(self.positions_by_queue_size)
+
     def get_queue_size(self, node_index):
         """
         Gets the size of the queue at the node_index.
         """
         return self.simulation.nodes[node_index].number_of_individuals - self.simulation.nodes[node_index].number_in_service
 
-    def next_node(self, ind):
+    def find_shortest_queues(self):
         """
-        Chooses the node from the destinations with the shortest queue.
+        Finds the destinations with the shortest queue, in the order given
+        by the destinations. If sampling, only the sampled destinations
+        are considered.
         """
+        if self.sample_size is None:
+            candidates = self.destinations
+        else:
+            positions = sorted(self.rng.sample(range(len(self.destinations)), self.sample_size))
+            candidates = [self.destinations[position] for position in positions]
         shortest_queues = []
         shortest_queue_size = float('inf')
-        for node_index in self.destinations:
+        for node_index in candidates:
             queue_size = self.get_queue_size(node_index)
             if queue_size == shortest_queue_size:
                 shortest_queues.append(node_index)
             if queue_size < shortest_queue_size:
                 shortest_queues = [node_index]
                 shortest_queue_size = queue_size
+        return shortest_queues
+
+    def break_tie(self, shortest_queues):
+        """
+        Chooses one of the tied shortest queues.
+        """
         if self.tie_break == 'random':
-            next_node_index = ciw.random_choice(shortest_queues)
-            return self.simulation.nodes[next_node_index]
-        if self.tie_break == 'order':
-            next_node_index = shortest_queues[0]
-            return self.simulation.nodes[next_node_index]
+            return ciw.random_choice(shortest_queues, rng=self.rng)
+        return shortest_queues[0]
+
+    def next_node(self, ind):
+        """
+        Chooses the node from the destinations with the shortest queue.
+        """
+        if self.indexed:
+            shortest_positions = self.positions_by_queue_size[self.shortest_queue_size]
+            next_node_index = self.destinations[self.break_tie(shortest_positions)]
+        else:
+            next_node_index = self.break_tie(self.find_shortest_queues())
+        return self.simulation.nodes[next_node_index]
 
 
 class LoadBalancing(JoinShortestQueue):
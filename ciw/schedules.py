@@ -1,4 +1,6 @@
-from typing import List, Tuple, Union, Generator, NoReturn
+from bisect import bisect_right
+from itertools import count
+from typing import List, Tuple, Union, NoReturn
 
 class Schedule:
     """
@@ -29,13 +31,24 @@ class Schedule:
 
     Methods
     -------
+    get_change(index)
+        Returns the date of the index-th shift change and the number of
+        servers from then on.
+    find_next_change_index(date)
+        Finds the index of the first shift change after a date.
+    get_next_change_after(date)
+        Returns the first shift change after a date.
     initialise()
-        Initializes the generator object at the beginning of a simulation.
-    get_schedule_generator(boundaries, values)
-        A generator that yields the next time and number of servers according
-        to a given schedule.
+        Starts stepping through the shift changes one at a time.
     get_next_shift()
-        Updates the next shifts from the generator.
+        Steps on to the next shift change.
+
+    Nodes look up shift changes by index with get_change, so the schedule
+    holds no simulation state. The stepping methods are kept for stepping
+    through a schedule outside of a simulation, and are built on get_change.
+    They keep their place on the schedule itself, so a schedule should only
+    be stepped through from one place at a time, though this does not
+    affect nodes sharing it.
     """
     def __init__(self, numbers_of_servers: List[int], shift_end_dates: List[float], preemption: Union[bool, str] = False, offset: float = 0.0) -> NoReturn:
         """
@@ -65,43 +78,49 @@ class Schedule:
         self.cyclelength = self.shift_end_dates[-1]
         self.offset = offset
 
-    def initialise(self) -> NoReturn:
+    def get_change(self, index: int) -> Tuple[float, int]:
         """
-        Initializes the generator object at the beginning of a simulation.
+        Returns the date of the index-th shift change and the number of
+        servers from then on. The 0th change is at the offset, and the
+        schedule holds no state, so can be shared by many nodes.
         """
-        self.c = 0
-        self.next_shift_change_date = self.offset
-        self.next_c = self.numbers_of_servers[0]
-        self.schedule_generator = self.get_schedule_generator(self.shift_end_dates, self.numbers_of_servers, self.offset)
+        if index == 0:
+            return self.offset, self.numbers_of_servers[0]
+        cycle, position = divmod(index - 1, len(self.shift_end_dates))
+        date = self.offset + self.shift_end_dates[position] + (cycle * self.cyclelength)
+        return date, self.numbers_of_servers[(position + 1) % len(self.numbers_of_servers)]
 
-    def get_schedule_generator(self, boundaries:List[float], values:List[int], offset:float) -> Generator[Tuple[float, int], None, None]:
+    def find_next_change_index(self, date: float) -> int:
         """
-        A generator that yields the next time and number of servers according
-        to a given schedule.
+        Finds the index of the first shift change strictly after date, by
+        bisecting the boundaries within the date's cycle.
+        """
+        if date < self.offset:
+            return 0
+        cycle, remainder = divmod(date - self.offset, self.cyclelength)
+        position = bisect_right(self.shift_end_dates, remainder)
+        return int(cycle) * len(self.shift_end_dates) + position + 1
 
-        Parameters
-        ----------
-        boundaries : List[float]
-            List of shift boundaries.
-        values : List[int]
-            List of corresponding server numbers.
-
-        Yields
-        ------
-        Tuple[float, int]
-            A tuple representing the next shift date and the number of servers.
-        """
-        num_boundaries = len(boundaries)
-        index = 0
-        date = 0
-        while True:
-            date = offset + boundaries[index % num_boundaries] + ((index) // num_boundaries * self.cyclelength)
-            index += 1
-            yield date, values[index % num_boundaries]
+    def get_next_change_after(self, date: float) -> Tuple[float, int]:
+        """
+        Returns the date of the first shift change after date, and the
+        number of servers from then on.
+        """
+        return self.get_change(self.find_next_change_index(date))
+
+    def initialise(self) -> NoReturn:
+        """
+        Starts stepping through the shift changes one at a time, from the
+        first change, using a generator of the changes after it. The place
+        reached is kept on the schedule, and is not used by nodes.
+        """
+        self.c = 0
+        self.next_shift_change_date, self.next_c = self.get_change(0)
+        self.schedule_generator = map(self.get_change, count(1))
 
     def get_next_shift(self) -> NoReturn:
         """
-        Updates the next shifts from the generator.
+        Steps on to the next shift change.
         """
         self.c = self.next_c
         date, c = next(self.schedule_generator)
@@ -127,22 +146,41 @@ class Slotted(Schedule):
         self.offset = offset
         self.slots = slots
         self.slot_sizes = slot_sizes
-        self.next_slot_sizes = [self.slot_sizes[-1]] + self.slot_sizes[:-1]
         self.capacitated = capacitated
         self.preemption = preemption
         self.cyclelength = self.slots[-1]
         self.c = 0
 
+    def get_change(self, index):
+        """
+        Returns the date and size of the index-th slot.
+        """
+        cycle, position = divmod(index, len(self.slots))
+        date = self.offset + self.slots[position] + (cycle * self.cyclelength)
+        return date, self.slot_sizes[position]
+
+    def find_next_change_index(self, date):
+        """
+        Finds the index of the first slot strictly after date, by bisecting
+        the slots within the date's cycle.
+        """
+        if date < self.offset:
+            return 0
+        cycle, remainder = divmod(date - self.offset, self.cyclelength)
+        position = bisect_right(self.slots, remainder)
+        return int(cycle) * len(self.slots) + position
+
     def initialise(self):
         """
-        Initialises the generator object at the beginning of a simulation
+        Starts stepping through the slots one at a time, from the first slot.
+        The place reached is kept on the schedule, and is not used by nodes.
         """
-        self.schedule_generator = self.get_schedule_generator(self.slots, self.next_slot_sizes, self.offset)
+        self.schedule_generator = map(self.get_change, count(0))
         self.get_next_slot()
 
     def get_next_slot(self):
         """
-        Updates the next slot time and size from the generator
+        Steps on to the next slot.
         """
         date, size = next(self.schedule_generator)
         self.next_slot_date = date
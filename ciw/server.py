@@ -19,6 +19,8 @@ class Server(object):
         self.shift_end = False
         self.next_end_service_date = float("Inf")
         self.busy_time = 0.0
+        self.preemption_key = None
+        self.killed = False
 
     @property
     def utilisation(self):
@@ -1,5 +1,5 @@
-import tqdm
 import copy
+import random
 from decimal import getcontext
 from .auxiliary import *
 from .node import Node
@@ -9,9 +9,19 @@ from .exit_node import ExitNode
 from .individual import Individual
 from .server import Server
 from .data_record import DataRecord
+from .vectorised import is_vectorisable, simulate_vectorised
 from ciw import trackers
 from ciw import deadlock
 
+HOOK_EVENTS = [
+    "on_arrival",
+    "on_service_start",
+    "on_service_end",
+    "on_block",
+    "on_renege",
+    "on_shift_change",
+]
+
 
 class Simulation(object):
     """
@@ -30,12 +40,17 @@ class Simulation(object):
         exit_node_class=None,
         individual_class=None,
         server_class=None,
+        profiler=None,
+        fast_path=False,
+        seed=None,
+        antithetic=False,
     ):
         """
         Initialise a simulation instance.
         """
         self.current_time = 0.0
         self.network = network
+        self.hooks = {}
         self.set_classes(node_class, arrival_node_class, exit_node_class, individual_class, server_class)
         if exact:
             self.NodeTypes = [ExactNode for _ in range(network.number_of_nodes)]
@@ -47,18 +62,34 @@ class Simulation(object):
         self.inter_arrival_times = self.find_arrival_dists()
         self.service_times = self.find_service_dists()
         self.batch_sizes = self.find_batching_dists()
+        self.reneging_times = self.find_reneging_dists()
+        self.class_change_times = self.find_class_change_dists()
+        self.class_change_candidates = self.find_class_change_candidates()
         self.show_simulation_to_distributions()
         self.number_of_priority_classes = self.network.number_of_priority_classes
         self.transitive_nodes = [node_type(i + 1, self) for i, node_type in enumerate(self.NodeTypes)]
         self.nodes = [self.ArrivalNodeType(self)] + self.transitive_nodes + [self.ExitNodeType()]
         self.active_nodes = self.nodes[:-1]
         self.routers = self.find_and_initialise_routers()
+        self.random_seed = seed
+        self.antithetic = antithetic
+        self.rng = random
+        if seed is not None:
+            self.allocate_random_streams(seed, antithetic)
+        elif antithetic:
+            raise ValueError("Antithetic simulations must be given a seed.")
         self.nodes[0].initialise()
         if tracker is None:
             self.statetracker = trackers.StateTracker()
         else:
             self.statetracker = tracker
         self.statetracker.initialise(self)
+        self.profiler = profiler
+        if self.profiler is not None:
+            self.profiler.initialise(self)
+        self.fast_path = fast_path and not antithetic and is_vectorisable(self)
+        self.fast_path_records = None
+        self.next_active_node = None
         self.times_dictionary = {self.statetracker.hash_state(): 0.0}
         self.times_to_deadlock = {}
         self.unchecked_blockage = False
@@ -76,6 +107,27 @@ class Simulation(object):
         """
         return (self.nodes[0].number_of_individuals - 1) - self.nodes[-1].number_of_individuals
 
+    def add_hook(self, event, function):
+        """
+        Registers a function to be called whenever the given event
+        happens at any node. The function is called with the node and
+        the individual concerned (None for shift changes). Available
+        events are 'on_arrival', 'on_service_start', 'on_service_end',
+        'on_block', 'on_renege', and 'on_shift_change'. Hooks are only
+        run by the event engine, so adding one turns off the fast path.
+        """
+        if event not in HOOK_EVENTS:
+            raise ValueError(f"Hook events must be one of {', '.join(HOOK_EVENTS)}.")
+        self.hooks.setdefault(event, []).append(function)
+        self.fast_path = False
+
+    def run_hooks(self, event, node, individual):
+        """
+        Calls all functions registered to the given event.
+        """
+        for function in self.hooks.get(event, ()):
+            function(node, individual)
+
     def find_arrival_dists(self):
         """
         Create the dictionary of arrival time distribution
@@ -112,6 +164,72 @@ class Simulation(object):
             } for node in range(self.network.number_of_nodes)
         }
 
+    def find_reneging_dists(self):
+        """
+        Create the dictionary of reneging time distribution
+        objects for each node for each class.
+        """
+        return {
+            node + 1: {
+                clss: copy.deepcopy(self.network.customer_classes[clss].reneging_time_distributions[node])
+                for clss in self.network.customer_class_names
+            } for node in range(self.network.number_of_nodes)
+        }
+
+    def find_class_change_dists(self):
+        """
+        Create the dictionary of class change time distribution
+        objects for each pair of classes.
+        """
+        return {
+            clss: copy.deepcopy(self.network.customer_classes[clss].class_change_time_distributions)
+            for clss in self.network.customer_class_names
+        }
+
+    def find_class_change_candidates(self):
+        """
+        Create the dictionary of the classes each class can change to
+        while waiting, as lists of (class, class change time
+        distribution object), leaving out those with no distribution.
+        """
+        return {
+            clss: [(clss2, dist) for clss2, dist in self.class_change_times[clss].items() if dist is not None]
+            for clss in self.network.customer_class_names
+        }
+
+    def allocate_random_streams(self, seed, antithetic=False):
+        """
+        Gives every source of randomness in the simulation its own random
+        number stream, each derived from the seed and a fixed key. A
+        stream is only ever used for one purpose, so scenarios sharing a
+        seed see the same arrivals and service times even if they differ
+        elsewhere. If antithetic, every stream gives 1 - U in place of the
+        uniform U given by the stream of the non-antithetic simulation.
+        """
+        self.rng = random_stream(derive_seed(seed, "engine"), antithetic)
+        for nd in range(1, self.network.number_of_nodes + 1):
+            for clss in self.network.customer_class_names:
+                for name, dists in [
+                    ("arrival", self.inter_arrival_times),
+                    ("service", self.service_times),
+                    ("batch", self.batch_sizes),
+                    ("reneging", self.reneging_times),
+                ]:
+                    if dists[nd][clss] is not None:
+                        dists[nd][clss].seed(derive_seed(seed, name, nd, clss), antithetic)
+            node = self.transitive_nodes[nd - 1]
+            node.class_change_rng = random_stream(derive_seed(seed, "class change", nd), antithetic)
+            node.baulking_rng = random_stream(derive_seed(seed, "baulking", nd), antithetic)
+            node.discipline_rng = random_stream(derive_seed(seed, "discipline", nd), antithetic)
+        seeded_routers = set()
+        for clss in self.network.customer_class_names:
+            for clss2, dist in self.class_change_times[clss].items():
+                if dist is not None:
+                    dist.seed(derive_seed(seed, "class change time", clss, clss2), antithetic)
+            if id(self.routers[clss]) not in seeded_routers:
+                seeded_routers.add(id(self.routers[clss]))
+                self.routers[clss].seed(derive_seed(seed, "routing", clss), antithetic)
+
     def show_simulation_to_distributions(self):
         """
         Adds the simulation object as an attribute of the distribution objects
@@ -131,6 +249,7 @@ class Simulation(object):
         for clss in self.network.customer_class_names:
             routers_dict[clss] = self.network.customer_classes[clss].routing
             routers_dict[clss].initialise(self)
+            routers_dict[clss].seed(None)
         return routers_dict
 
     def find_next_active_node(self):
@@ -146,7 +265,7 @@ class Simulation(object):
             elif nd.next_event_date == mindate:
                 next_active_nodes.append(nd)
         if len(next_active_nodes) > 1:
-            return random_choice(next_active_nodes)
+            return random_choice(next_active_nodes, rng=self.rng)
         return next_active_nodes[0]
 
     def get_all_individuals(self):
@@ -165,6 +284,12 @@ class Simulation(object):
         """
         Gets all data records from all individuals.
         """
+        if self.fast_path_records is not None:
+            records = [r for r in self.fast_path_records if r.record_type in only]
+            if include_incomplete:
+                records += self.fast_path_incomplete_records
+            self.all_records = records
+            return records
         records = []
         for individual in self.get_all_individuals():
             for record in individual.data_records:
@@ -217,12 +342,14 @@ class Simulation(object):
     def event_and_return_nextnode(self, next_active_node):
         """
         Carries out the event of current next_active_node,
-        and returns the next next_active_node
+        and returns the next next_active_node, which is also kept
+        so that the simulation can be resumed from it.
         """
         next_active_node.have_event()
         for node in self.transitive_nodes:
             node.update_next_event_date()
-        return self.find_next_active_node()
+        self.next_active_node = self.find_next_active_node()
+        return self.next_active_node
 
     def simulate_until_deadlock(self):
         """
@@ -253,10 +380,14 @@ class Simulation(object):
         """
         Runs the simulation until max_simulation_time is reached.
         """
-        next_active_node = self.find_next_active_node()
+        if self.fast_path:
+            self.simulate_fast_path(max_simulation_time)
+            return
+        next_active_node = self.next_active_node or self.find_next_active_node()
         self.current_time = next_active_node.next_event_date
 
         if progress_bar:
+            import tqdm
             self.progress_bar = tqdm.tqdm(total=max_simulation_time)
 
         while self.current_time < max_simulation_time:
@@ -277,6 +408,51 @@ class Simulation(object):
             self.progress_bar.update(remaining_time)
             self.progress_bar.close()
 
+    def simulate_fast_path(self, max_simulation_time):
+        """
+        Runs the simulation until max_simulation_time is reached using
+        vectorised recursions rather than the event engine. Only used
+        for eligible feed-forward first-in-first-out networks. Raises an
+        error if the sampled process-based routes are not feed-forward.
+        """
+        if self.current_time > 0:
+            raise ValueError("Simulations using the fast path cannot be resumed.")
+        results = simulate_vectorised(self, max_simulation_time)
+        self.fast_path_records, self.fast_path_incomplete_records = results
+        self.current_time = max_simulation_time
+
+    def iter_events(self, max_simulation_time=float("Inf")):
+        """
+        Lazily runs the simulation one event at a time, resuming from
+        the current state of the simulation. Yields an
+        (event_date, node_id, event_type) tuple after each event is
+        carried out, where the arrival node has node_id 0. Stops before
+        any event that would occur at or after max_simulation_time.
+        Always uses the event engine, never the fast path. The node with
+        the next event is kept between calls, so that ties between
+        simultaneous events are not broken again when resuming.
+        """
+        if self.next_active_node is None:
+            self.next_active_node = self.find_next_active_node()
+        next_active_node = self.next_active_node
+        while next_active_node.next_event_date < max_simulation_time:
+            self.current_time = next_active_node.next_event_date
+            event = (self.current_time, next_active_node.id_number, next_active_node.next_event_type)
+            next_active_node = self.event_and_return_nextnode(next_active_node)
+            self.statetracker.timestamp()
+            yield event
+
+    def run_until(self, max_simulation_time):
+        """
+        Runs the simulation up to max_simulation_time, resuming from the
+        current state of the simulation. Unlike simulate_until_max_time,
+        servers are not wrapped up, so this can be called repeatedly with
+        increasing times. Always uses the event engine, never the fast path.
+        """
+        for _ in self.iter_events(max_simulation_time):
+            pass
+        self.current_time = max(self.current_time, max_simulation_time)
+
     def simulate_until_max_customers(
         self, max_customers, progress_bar=False, method="Complete"
     ):
@@ -300,6 +476,7 @@ class Simulation(object):
         self.current_time = next_active_node.next_event_date
 
         if progress_bar:
+            import tqdm
             self.progress_bar = tqdm.tqdm(total=max_customers)
 
         if method == "Complete":
@@ -0,0 +1,391 @@
+import heapq
+from itertools import repeat, starmap
+from math import isinf
+import numpy as np
+from .arrival_node import ArrivalNode
+from .data_record import DataRecord
+from .disciplines import FIFO
+from .dists import Deterministic
+from .exit_node import ExitNode
+from .node import Node
+from .routing import Direct, Leave, NetworkRouting, ProcessBased, Probabilistic, TransitionMatrix
+from ciw import deadlock, trackers
+
+
+def fifo_service_start_dates(arrival_dates, service_times, number_of_servers):
+    """
+    Returns the service start dates, and the ids of the servers used, of
+    customers arriving in order at a first-in-first-out queue.
+      - For one server this is the Lindley recursion, vectorised as
+        D_n = sum_{j<=n} S_j + max_{k<=n} (A_k - sum_{j<k} S_j), where
+        D_n is the departure date of the nth customer.
+      - For c servers this is the Kiefer-Wolfowitz recursion, keeping a
+        heap of the dates that busy servers become free. As in the event
+        engine, free servers are chosen in order of their ids.
+      - For infinite servers there is no waiting.
+    """
+    if isinf(number_of_servers):
+        return arrival_dates.copy(), np.zeros(len(arrival_dates), dtype=int)
+    if number_of_servers == 1:
+        cumulative_service = np.cumsum(service_times)
+        departure_dates = cumulative_service + np.maximum.accumulate(
+            arrival_dates - (cumulative_service - service_times)
+        )
+        service_start_dates = np.maximum(departure_dates - service_times, arrival_dates)
+        return service_start_dates, np.ones(len(arrival_dates), dtype=int)
+
+    service_start_dates = np.empty(len(arrival_dates))
+    server_ids = np.empty(len(arrival_dates), dtype=int)
+    free_servers = list(range(1, number_of_servers + 1))
+    busy_servers = []
+    for i, (arrival_date, service_time) in enumerate(zip(arrival_dates.tolist(), service_times.tolist())):
+        while busy_servers and busy_servers[0][0] <= arrival_date:
+            heapq.heappush(free_servers, heapq.heappop(busy_servers)[1])
+        if free_servers:
+            start_date, server_id = arrival_date, heapq.heappop(free_servers)
+        else:
+            start_date, server_id = heapq.heappop(busy_servers)
+        service_start_dates[i] = start_date
+        server_ids[i] = server_id
+        heapq.heappush(busy_servers, (start_date + service_time, server_id))
+    return service_start_dates, server_ids
+
+
+def sample_arrival_dates(dist, first_date, max_simulation_time, chunk_size=1024):
+    """
+    Returns all arrival dates before max_simulation_time, starting with
+    the arrival node's first sampled date, and sampling the remaining
+    inter-arrival times in chunks of increasing size.
+    """
+    chunks = [np.array([first_date])]
+    last_date = first_date
+    while last_date < max_simulation_time:
+        dates = last_date + np.cumsum(dist.sample_many(chunk_size))
+        chunks.append(dates)
+        last_date = dates[-1]
+        chunk_size *= 2
+    dates = np.concatenate(chunks)
+    return dates[dates < max_simulation_time]
+
+
+def deterministic_destination(router):
+    """
+    Returns the id of the node a node router always sends customers to,
+    or None if the destination is not certain.
+    """
+    if isinstance(router, Leave):
+        return -1
+    if isinstance(router, Direct):
+        return router.to
+    if isinstance(router, Probabilistic):
+        certain = [d for d, p in zip(router.destinations, router.probs) if p == 1.0]
+        if len(certain) == 1 and sum(router.probs) == 1.0:
+            return certain[0]
+    return None
+
+
+def deterministic_route(routing, starting_node):
+    """
+    Returns the nodes visited, in order, by customers arriving at the
+    starting node when every node router has a certain destination.
+    Returns None if a destination is not certain, or if the route
+    revisits a node.
+    """
+    route = [starting_node]
+    destination = deterministic_destination(routing.routers[starting_node - 1])
+    while destination != -1:
+        if destination is None or destination in route:
+            return None
+        route.append(destination)
+        destination = deterministic_destination(routing.routers[destination - 1])
+    return tuple(route)
+
+
+def feed_forward_order(routes, number_of_nodes):
+    """
+    Returns an ordering of the nodes such that every route visits nodes
+    in that order, or None if no such ordering exists, that is if the
+    network is not feed-forward.
+    """
+    successors = {node: set() for node in range(1, number_of_nodes + 1)}
+    for route in routes:
+        if len(set(route)) != len(route):
+            return None
+        for node, next_node in zip(route, route[1:]):
+            successors[node].add(next_node)
+    number_of_predecessors = {node: 0 for node in successors}
+    for node in successors:
+        for next_node in successors[node]:
+            number_of_predecessors[next_node] += 1
+    order = []
+    ready = [node for node in successors if number_of_predecessors[node] == 0]
+    while ready:
+        node = ready.pop()
+        order.append(node)
+        for next_node in successors[node]:
+            number_of_predecessors[next_node] -= 1
+            if number_of_predecessors[next_node] == 0:
+                ready.append(next_node)
+    if len(order) < number_of_nodes:
+        return None
+    return order
+
+
+def is_vectorisable(simulation):
+    """
+    Returns whether the simulation's network is a feed-forward network of
+    first-in-first-out nodes with no blocking, reneging, baulking,
+    priorities, class changes, batching, or server schedules, with
+    deterministic routes, and with distributions that can be sampled many
+    values at a time. Process-based routes are checked to be feed-forward
+    when the simulation is run.
+    """
+    network = simulation.network
+    if network.number_of_priority_classes != 1 or network.system_capacity != float("inf"):
+        return False
+    uses_defaults = (
+        all(node_type is Node for node_type in simulation.NodeTypes)
+        and simulation.ArrivalNodeType is ArrivalNode
+        and simulation.ExitNodeType is ExitNode
+        and type(simulation.deadlock_detector) is deadlock.NoDetection
+        and type(simulation.statetracker) is trackers.StateTracker
+        and simulation.profiler is None
+        and not simulation.hooks
+    )
+    if not uses_defaults:
+        return False
+    for node in simulation.transitive_nodes:
+        if (
+            node.schedule is not None
+            or node.node_capacity != float("inf")
+            or node.class_change is not None
+            or node.server_priority_function is not None
+            or node.service_discipline is not FIFO
+            or node.reneging
+            or node.dynamic_classes
+            or any(f is not None for f in node.baulking_functions.values())
+        ):
+            return False
+
+    routes = []
+    for clss in network.customer_class_names:
+        starting_nodes = [
+            node for node in range(1, network.number_of_nodes + 1)
+            if simulation.inter_arrival_times[node][clss] is not None
+        ]
+        if not starting_nodes:
+            continue
+        for node in starting_nodes:
+            batch_dist = simulation.batch_sizes[node][clss]
+            if not (isinstance(batch_dist, Deterministic) and batch_dist.value == 1):
+                return False
+            if not hasattr(simulation.inter_arrival_times[node][clss], "sample_many"):
+                return False
+        for node in range(1, network.number_of_nodes + 1):
+            if not hasattr(simulation.service_times[node][clss], "sample_many"):
+                return False
+        routing = simulation.routers[clss]
+        if type(routing) is ProcessBased:
+            continue
+        if type(routing) not in (NetworkRouting, TransitionMatrix):
+            return False
+        for node in starting_nodes:
+            route = deterministic_route(routing, node)
+            if route is None:
+                return False
+            routes.append(route)
+    if not any(
+        dist is not None for dists in simulation.inter_arrival_times.values() for dist in dists.values()
+    ):
+        return False
+    return feed_forward_order(routes, network.number_of_nodes) is not None
+
+
+def sample_routes(simulation, starting_nodes, class_names):
+    """
+    Returns the route of each customer, given their starting nodes and
+    customer classes, in order of their ids. Process-based route functions
+    are called with a new individual, before any customer is simulated.
+    """
+    routes = {}
+    customer_routes = []
+    for i, (starting_node, clss) in enumerate(zip(starting_nodes, class_names)):
+        routing = simulation.routers[clss]
+        if type(routing) is ProcessBased:
+            ind = simulation.IndividualType(
+                i + 1, clss, simulation.network.priority_class_mapping[clss], simulation=simulation
+            )
+            ind.starting_node = starting_node
+            customer_routes.append((starting_node,) + routing.find_route(ind))
+        else:
+            if (starting_node, clss) not in routes:
+                routes[(starting_node, clss)] = deterministic_route(routing, starting_node)
+            customer_routes.append(routes[(starting_node, clss)])
+    return customer_routes
+
+
+def simulate_vectorised(simulation, max_simulation_time):
+    """
+    Simulates the feed-forward network until max_simulation_time, one node
+    at a time, using vectorised recursions on batches of sampled arrival
+    and service times. The departures from each node are the arrivals to
+    the next node on each customer's route. Returns the list of data
+    records of completed services, in the order they ended, and the list of
+    incomplete records of customers still in the system. Raises an error if
+    the sampled process-based routes are not feed-forward, as by then the
+    arrival distributions and route functions have already been sampled.
+    """
+    network = simulation.network
+    arrival_node = simulation.nodes[0]
+    external_dates, starting_nodes, classes = [], [], []
+    for node in range(1, network.number_of_nodes + 1):
+        for clss_index, clss in enumerate(network.customer_class_names):
+            arrival_dist = simulation.inter_arrival_times[node][clss]
+            if arrival_dist is not None:
+                first_date = arrival_node.event_dates_dict[node][clss]
+                dates = sample_arrival_dates(arrival_dist, first_date, max_simulation_time)
+                external_dates.append(dates)
+                starting_nodes.append(np.full(len(dates), node))
+                classes.append(np.full(len(dates), clss_index))
+    external_dates = np.concatenate(external_dates)
+    order = np.argsort(external_dates, kind="stable")
+    external_dates = external_dates[order]
+    starting_nodes = np.concatenate(starting_nodes)[order]
+    classes = np.concatenate(classes)[order]
+    class_names = np.array(network.customer_class_names, dtype=object)[classes].tolist()
+
+    routes = sample_routes(simulation, starting_nodes.tolist(), class_names)
+    node_order = feed_forward_order(set(routes), network.number_of_nodes)
+    if node_order is None:
+        raise ValueError(
+            "The sampled process-based routes are not feed-forward, so the fast path "
+            "cannot be used. Create the simulation with fast_path=False instead."
+        )
+
+    customers_by_route = {}
+    for customer, route in enumerate(routes):
+        customers_by_route.setdefault(route, []).append(customer)
+    visit_customers, visit_nodes, visit_destinations, visit_previous = [], [], [], []
+    number_of_visits = 0
+    for route, customers in customers_by_route.items():
+        customers = np.array(customers)
+        for stage, node in enumerate(route):
+            visit_customers.append(customers)
+            visit_nodes.append(np.full(len(customers), node))
+            destination = route[stage + 1] if stage + 1 < len(route) else -1
+            visit_destinations.append(np.full(len(customers), destination))
+            if stage == 0:
+                visit_previous.append(np.full(len(customers), -1))
+            else:
+                visit_previous.append(np.arange(number_of_visits - len(customers), number_of_visits))
+            number_of_visits += len(customers)
+    visit_customers = np.concatenate(visit_customers)
+    visit_nodes = np.concatenate(visit_nodes)
+    visit_destinations = np.concatenate(visit_destinations)
+    visit_previous = np.concatenate(visit_previous)
+
+    visit_arrival_dates = np.full(number_of_visits, np.inf)
+    visit_start_dates = np.full(number_of_visits, np.inf)
+    visit_end_dates = np.full(number_of_visits, np.inf)
+    visit_server_ids = np.zeros(number_of_visits, dtype=int)
+    visit_queue_sizes_at_arrival = np.zeros(number_of_visits, dtype=int)
+    visit_queue_sizes_at_departure = np.zeros(number_of_visits, dtype=int)
+    first_visits = visit_previous == -1
+    visit_arrival_dates[first_visits] = external_dates[visit_customers[first_visits]]
+
+    for node_id in node_order:
+        node = simulation.transitive_nodes[node_id - 1]
+        visits = np.flatnonzero(visit_nodes == node_id)
+        later_visits = visits[visit_previous[visits] != -1]
+        visit_arrival_dates[later_visits] = visit_end_dates[visit_previous[later_visits]]
+        visits = visits[visit_arrival_dates[visits] < max_simulation_time]
+        visits = visits[np.lexsort((visit_customers[visits], visit_arrival_dates[visits]))]
+
+        arrival_dates = visit_arrival_dates[visits]
+        service_times = np.empty(len(visits))
+        for clss_index, clss in enumerate(network.customer_class_names):
+            in_class = classes[visit_customers[visits]] == clss_index
+            if in_class.any():
+                service_times[in_class] = simulation.service_times[node_id][clss].sample_many(int(in_class.sum()))
+        start_dates, server_ids = fifo_service_start_dates(arrival_dates, service_times, node.c)
+        end_dates = start_dates + service_times
+        sorted_end_dates = np.sort(end_dates)
+        visit_start_dates[visits] = start_dates
+        visit_end_dates[visits] = end_dates
+        visit_server_ids[visits] = server_ids
+        visit_queue_sizes_at_arrival[visits] = (
+            np.arange(len(visits)) - np.searchsorted(sorted_end_dates, arrival_dates, side="right")
+        )
+        visit_queue_sizes_at_departure[visits] = (
+            np.searchsorted(arrival_dates, end_dates, side="right")
+            - np.searchsorted(sorted_end_dates, end_dates, side="right")
+        )
+        if isinf(node.c):
+            node.server_utilisation = None
+        else:
+            busy_time = np.clip(np.minimum(end_dates, max_simulation_time) - start_dates, 0, None)
+            node.server_utilisation = float(busy_time.sum()) / (node.c * max_simulation_time)
+        node.number_of_individuals = int((end_dates >= max_simulation_time).sum())
+
+    by_end_date = np.argsort(visit_end_dates, kind="stable")
+    complete = by_end_date[visit_end_dates[by_end_date] < max_simulation_time]
+    complete_class_names = [class_names[i] for i in visit_customers[complete].tolist()]
+    complete_end_dates = visit_end_dates[complete].tolist()
+    server_ids = visit_server_ids[complete].tolist()
+    records = list(starmap(DataRecord, zip(
+        (visit_customers[complete] + 1).tolist(),
+        complete_class_names,
+        complete_class_names,
+        visit_nodes[complete].tolist(),
+        visit_arrival_dates[complete].tolist(),
+        (visit_start_dates[complete] - visit_arrival_dates[complete]).tolist(),
+        visit_start_dates[complete].tolist(),
+        (visit_end_dates[complete] - visit_start_dates[complete]).tolist(),
+        complete_end_dates,
+        repeat(0.0),
+        complete_end_dates,
+        visit_destinations[complete].tolist(),
+        visit_queue_sizes_at_arrival[complete].tolist(),
+        visit_queue_sizes_at_departure[complete].tolist(),
+        [server_id if server_id > 0 else False for server_id in server_ids],
+        repeat("service"),
+    )))
+
+    incomplete_records = []
+    in_system = np.flatnonzero(
+        (visit_arrival_dates < max_simulation_time) & (visit_end_dates >= max_simulation_time)
+    )
+    for i in in_system[np.argsort(visit_customers[in_system], kind="stable")].tolist():
+        customer = int(visit_customers[i])
+        arrival_date = float(visit_arrival_dates[i])
+        service_start_date = float(visit_start_dates[i])
+        in_service = service_start_date < max_simulation_time
+        incomplete_records.append(DataRecord(
+            id_number=customer + 1,
+            customer_class=class_names[customer],
+            original_customer_class=class_names[customer],
+            node=int(visit_nodes[i]),
+            arrival_date=arrival_date,
+            waiting_time=service_start_date - arrival_date if in_service else None,
+            service_start_date=service_start_date if in_service else None,
+            service_time=None,
+            service_end_date=None,
+            time_blocked=None,
+            exit_date=None,
+            destination=None,
+            queue_size_at_arrival=int(visit_queue_sizes_at_arrival[i]),
+            queue_size_at_departure=None,
+            server_id=False,
+            record_type="incomplete",
+        ))
+
+    arrival_node.number_of_individuals = len(external_dates)
+    arrival_node.number_accepted_individuals = len(external_dates)
+    for clss_index, clss in enumerate(network.customer_class_names):
+        number_in_class = int((classes == clss_index).sum())
+        arrival_node.number_of_individuals_per_class[clss] = number_in_class
+        arrival_node.number_accepted_individuals_per_class[clss] = number_in_class
+    number_completed = int(((visit_destinations[complete]) == -1).sum())
+    simulation.nodes[-1].number_of_individuals = number_completed
+    simulation.nodes[-1].number_of_completed_individuals = number_completed
+    return records, incomplete_records
@@ -512,3 +512,68 @@ class TestArrivalNode(unittest.TestCase):
             [r.exit_date for r in recs],
             [7.0, 9.0, 11.0, 13.0, 15.0, 17.0, 19.0, 21.0, 23.0, 25.0, 27.0, 29.0],
         )
+
+    def test_batches_released_in_bulk(self):
+        def make_network(baulking_functions, routing=None):
+            return ciw.create_network(
+                arrival_distributions=[ciw.dists.Exponential(1.0), ciw.dists.Exponential(0.5)],
+                service_distributions=[ciw.dists.Exponential(2.0), ciw.dists.Exponential(1.5)],
+                number_of_servers=[2, 1],
+                queue_capacities=[4, float("inf")],
+                batching_distributions=[ciw.dists.Poisson(3.0), ciw.dists.Sequential([1, 5, 0])],
+                baulking_functions=baulking_functions,
+                routing=routing or [[0.0, 0.3], [0.0, 0.0]],
+                system_capacity=12,
+            )
+
+        Q1 = ciw.Simulation(make_network([lambda n, **kwargs: 0.0, lambda n, **kwargs: 0.0]), seed=4)
+        Q2 = ciw.Simulation(make_network([None, None]), seed=4)
+        Q1.simulate_until_max_time(200)
+        Q2.simulate_until_max_time(200)
+        recs1, recs2 = Q1.get_all_records(), Q2.get_all_records()
+        self.assertEqual(recs1, recs2)
+        rejections = [r for r in recs2 if r.record_type == "rejection"]
+        self.assertGreater(len(rejections), 50)
+        self.assertEqual(len({r.id_number for r in rejections}), len(rejections))
+        self.assertEqual(Q1.nodes[0].number_of_individuals, Q2.nodes[0].number_of_individuals)
+        self.assertEqual(Q1.nodes[0].number_accepted_individuals, Q2.nodes[0].number_accepted_individuals)
+        self.assertEqual(Q1.nodes[-1].number_of_individuals, Q2.nodes[-1].number_of_individuals)
+        self.assertEqual(
+            sorted(ind.id_number for ind in Q2.nodes[-1].all_individuals),
+            sorted(ind.id_number for ind in Q1.nodes[-1].all_individuals),
+        )
+
+    def test_batches_routed_in_one_call(self):
+        calls = []
+
+        def route(ind, simulation):
+            return [1, 2] if ind.id_number % 2 else [1]
+
+        def batch_route(individuals, simulation):
+            calls.append(len(individuals))
+            return [route(ind, simulation) for ind in individuals]
+
+        def make_network(routing):
+            return ciw.create_network(
+                arrival_distributions=[ciw.dists.Deterministic(1.0), None],
+                service_distributions=[ciw.dists.Deterministic(0.5), ciw.dists.Deterministic(0.2)],
+                number_of_servers=[1, 1],
+                queue_capacities=[3, float("inf")],
+                batching_distributions=[ciw.dists.Sequential([4, 1, 2]), ciw.dists.Deterministic(1)],
+                routing=routing,
+            )
+
+        Q1 = ciw.Simulation(make_network(ciw.routing.ProcessBased(route)))
+        Q2 = ciw.Simulation(make_network(ciw.routing.ProcessBased(route, batch_route_function=batch_route)))
+        self.assertFalse(Q1.routers["Customer"].initialises_batches)
+        self.assertTrue(Q2.routers["Customer"].initialises_batches)
+        Q1.simulate_until_max_time(9.5)
+        Q2.simulate_until_max_time(9.5)
+        self.assertEqual(Q1.get_all_records(), Q2.get_all_records())
+        self.assertEqual(calls, [4, 2, 4, 2, 4, 2])
+        inds = [ciw.Individual(5), ciw.Individual(6)]
+        Q1.routers["Customer"].initialise_individuals(inds)
+        self.assertEqual([ind.route for ind in inds], [[1, 2], [1]])
+        self.assertEqual(
+            [r.record_type for r in Q2.get_all_records() if r.node == 1].count("rejection"), 17
+        )
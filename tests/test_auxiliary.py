@@ -83,6 +83,23 @@ class TestAuxiliary(unittest.TestCase):
         self.assertEqual(choice_counts, {"Exit Node": 100})
         self.assertEqual(r1, r2)
 
+    def test_randomchoice_with_own_stream(self):
+        ciw.seed(5)
+        r1 = random.random()
+        ciw.seed(5)
+        rng = random.Random(1)
+        choices = [ciw.random_choice([1, 2, 3], [0.2, 0.3, 0.5], rng=rng) for _ in range(100)]
+        rng = random.Random(1)
+        self.assertEqual(choices, [ciw.random_choice([1, 2, 3], [0.2, 0.3, 0.5], rng=rng) for _ in range(100)])
+        self.assertEqual(r1, random.random())
+
+    def test_derive_seed(self):
+        self.assertEqual(ciw.derive_seed(1, "arrival", 1, "Customer"), ciw.derive_seed(1, "arrival", 1, "Customer"))
+        self.assertNotEqual(ciw.derive_seed(1, "arrival", 1, "Customer"), ciw.derive_seed(2, "arrival", 1, "Customer"))
+        self.assertNotEqual(ciw.derive_seed(1, "arrival", 1, "Customer"), ciw.derive_seed(1, "service", 1, "Customer"))
+        self.assertNotEqual(ciw.derive_seed(1, "arrival", 1, "Customer"), ciw.derive_seed(1, "arrival", 2, "Customer"))
+        self.assertIsInstance(ciw.derive_seed(1, "engine"), int)
+
     def test_flatten_list(self):
         for seed in range(20):
             random.seed(seed)
@@ -33,6 +33,19 @@ class TestExitNode(unittest.TestCase):
         n.accept(i2)
         self.assertEqual(n.all_individuals, [i1, i2])
 
+    def test_accept_all_method(self):
+        n = ciw.ExitNode()
+        i1, i2, i3 = ciw.Individual(3), ciw.Individual(8), ciw.Individual(9)
+        n.accept_all([i1, i2])
+        self.assertEqual(n.all_individuals, [i1, i2])
+        self.assertEqual((i1.node, i2.node), (-1, -1))
+        self.assertEqual(n.number_of_individuals, 2)
+        self.assertEqual(n.number_of_completed_individuals, 2)
+        n.accept_all([i3], completed=False)
+        self.assertEqual(n.all_individuals, [i1, i2, i3])
+        self.assertEqual(n.number_of_individuals, 3)
+        self.assertEqual(n.number_of_completed_individuals, 2)
+
     def test_update_next_event_date_method(self):
         n = ciw.ExitNode()
         self.assertEqual(n.id_number, -1)
@@ -0,0 +1,26 @@
+import unittest
+import subprocess
+import sys
+
+
+class TestImport(unittest.TestCase):
+    def test_optional_libraries_not_imported_eagerly(self):
+        code = "import sys, ciw; print('networkx' in sys.modules, 'tqdm' in sys.modules)"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.split(), ["False", "False"])
+
+    def test_optional_libraries_imported_when_used(self):
+        code = "\n".join([
+            "import sys, ciw",
+            "N = ciw.create_network(",
+            "    arrival_distributions=[ciw.dists.Exponential(1.0)],",
+            "    service_distributions=[ciw.dists.Exponential(2.0)],",
+            "    number_of_servers=[1],",
+            ")",
+            "Q = ciw.Simulation(N, deadlock_detector=ciw.deadlock.StateDigraph())",
+            "print('networkx' in sys.modules, 'tqdm' in sys.modules)",
+            "Q.simulate_until_max_time(1, progress_bar=True)",
+            "print('networkx' in sys.modules, 'tqdm' in sys.modules)",
+        ])
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.split(), ["True", "False", "True", "True"])
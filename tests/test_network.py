@@ -228,8 +228,8 @@ class TestNetwork(unittest.TestCase):
         router = N.customer_classes['Customer'].routing
         self.assertEqual(router.routers[0].destinations, [1, 2, -1])
         self.assertEqual([round(p, 2) for p in router.routers[0].probs], [0.5, 0.2, 0.3])
-        self.assertEqual(router.routers[1].destinations, [1, 2, -1])
-        self.assertEqual([round(p, 2) for p in router.routers[1].probs], [0.0, 0.0, 1.0])
+        self.assertEqual(router.routers[1].destinations, [-1])
+        self.assertEqual([round(p, 2) for p in router.routers[1].probs], [1.0])
 
         self.assertEqual(N.number_of_priority_classes, 1)
         self.assertEqual(N.priority_class_mapping, {'Customer': 0})
@@ -269,8 +269,8 @@ class TestNetwork(unittest.TestCase):
         router1 = N.customer_classes['Class 1'].routing
         self.assertEqual(router0.routers[0].destinations, [1, -1])
         self.assertEqual([round(p, 2) for p in router0.routers[0].probs], [0.5, 0.5])
-        self.assertEqual(router1.routers[0].destinations, [1, -1])
-        self.assertEqual([round(p, 2) for p in router1.routers[0].probs], [0.0, 1.0])
+        self.assertEqual(router1.routers[0].destinations, [-1])
+        self.assertEqual([round(p, 2) for p in router1.routers[0].probs], [1.0])
         self.assertEqual(
             [str(d) for d in N.customer_classes['Class 1'].arrival_distributions],
             ["Exponential(rate=4.0)"],
@@ -324,8 +324,8 @@ class TestNetwork(unittest.TestCase):
         router1 = N.customer_classes['Class 1'].routing
         self.assertEqual(router0.routers[0].destinations, [1, -1])
         self.assertEqual([round(p, 2) for p in router0.routers[0].probs], [0.5, 0.5])
-        self.assertEqual(router1.routers[0].destinations, [1, -1])
-        self.assertEqual([round(p, 2) for p in router1.routers[0].probs], [0.0, 1.0])
+        self.assertEqual(router1.routers[0].destinations, [-1])
+        self.assertEqual([round(p, 2) for p in router1.routers[0].probs], [1.0])
         self.assertEqual(
             [str(d) for d in N.customer_classes['Class 1'].arrival_distributions],
             ["Exponential(rate=4.0)"],
@@ -369,8 +369,8 @@ class TestNetwork(unittest.TestCase):
         router1 = N.customer_classes['Class 1'].routing
         self.assertEqual(router0.routers[0].destinations, [1, -1])
         self.assertEqual([round(p, 2) for p in router0.routers[0].probs], [0.5, 0.5])
-        self.assertEqual(router1.routers[0].destinations, [1, -1])
-        self.assertEqual([round(p, 2) for p in router1.routers[0].probs], [0.0, 1.0])
+        self.assertEqual(router1.routers[0].destinations, [-1])
+        self.assertEqual([round(p, 2) for p in router1.routers[0].probs], [1.0])
         self.assertEqual(
             [str(d) for d in N.customer_classes['Class 1'].arrival_distributions],
             ["Exponential(rate=4.0)"],
@@ -419,12 +419,12 @@ class TestNetwork(unittest.TestCase):
             ["Exponential(rate=7.0)", "Uniform(lower=0.4, upper=1.2)", "Deterministic(value=5.33)"],
         )
         router = N.customer_classes['Customer'].routing
-        self.assertEqual(router.routers[0].destinations, [1, 2, 3, -1])
-        self.assertEqual([round(p, 2) for p in router.routers[0].probs], [0.5, 0.0, 0.1, 0.4])
-        self.assertEqual(router.routers[1].destinations, [1, 2, 3, -1])
-        self.assertEqual([round(p, 2) for p in router.routers[1].probs], [0.2, 0.1, 0.0, 0.7])
-        self.assertEqual(router.routers[2].destinations, [1, 2, 3, -1])
-        self.assertEqual([round(p, 2) for p in router.routers[2].probs], [0.0, 0.0, 0.0, 1.0])
+        self.assertEqual(router.routers[0].destinations, [1, 3, -1])
+        self.assertEqual([round(p, 2) for p in router.routers[0].probs], [0.5, 0.1, 0.4])
+        self.assertEqual(router.routers[1].destinations, [1, 2, -1])
+        self.assertEqual([round(p, 2) for p in router.routers[1].probs], [0.2, 0.1, 0.7])
+        self.assertEqual(router.routers[2].destinations, [-1])
+        self.assertEqual([round(p, 2) for p in router.routers[2].probs], [1.0])
         self.assertEqual(
             N.customer_classes['Customer'].baulking_functions,
             [None, None, example_baulking_function],
@@ -666,8 +666,8 @@ class TestImportNoMatrix(unittest.TestCase):
             number_of_servers=[1],
         )
         router = N.customer_classes['Customer'].routing
-        self.assertEqual(router.routers[0].destinations, [1, -1])
-        self.assertEqual([round(p, 2) for p in router.routers[0].probs], [0.0, 1.0])
+        self.assertEqual(router.routers[0].destinations, [-1])
+        self.assertEqual([round(p, 2) for p in router.routers[0].probs], [1.0])
 
         N = ciw.create_network(
             arrival_distributions={
@@ -683,10 +683,10 @@ class TestImportNoMatrix(unittest.TestCase):
 
         router0 = N.customer_classes['Class 0'].routing
         router1 = N.customer_classes['Class 1'].routing
-        self.assertEqual(router0.routers[0].destinations, [1, -1])
-        self.assertEqual([round(p, 2) for p in router0.routers[0].probs], [0.0, 1.0])
-        self.assertEqual(router1.routers[0].destinations, [1, -1])
-        self.assertEqual([round(p, 2) for p in router1.routers[0].probs], [0.0, 1.0])
+        self.assertEqual(router0.routers[0].destinations, [-1])
+        self.assertEqual([round(p, 2) for p in router0.routers[0].probs], [1.0])
+        self.assertEqual(router1.routers[0].destinations, [-1])
+        self.assertEqual([round(p, 2) for p in router1.routers[0].probs], [1.0])
 
         params = {
             "arrival_distributions": [
@@ -772,8 +772,8 @@ class TestCreateNetworkKwargs(unittest.TestCase):
         router = N.customer_classes['Customer'].routing
         self.assertEqual(router.routers[0].destinations, [1, 2, -1])
         self.assertEqual([round(p, 2) for p in router.routers[0].probs], [0.5, 0.2, 0.3])
-        self.assertEqual(router.routers[1].destinations, [1, 2, -1])
-        self.assertEqual([round(p, 2) for p in router.routers[1].probs], [0.0, 0.0, 1.0])
+        self.assertEqual(router.routers[1].destinations, [-1])
+        self.assertEqual([round(p, 2) for p in router.routers[1].probs], [1.0])
 
         self.assertEqual(N.number_of_priority_classes, 1)
         self.assertEqual(N.priority_class_mapping, {'Customer': 0})
@@ -812,8 +812,8 @@ class TestCreateNetworkKwargs(unittest.TestCase):
         router1 = N.customer_classes['Class 1'].routing
         self.assertEqual(router0.routers[0].destinations, [1, -1])
         self.assertEqual([round(p, 2) for p in router0.routers[0].probs], [0.5, 0.5])
-        self.assertEqual(router1.routers[0].destinations, [1, -1])
-        self.assertEqual([round(p, 2) for p in router1.routers[0].probs], [0.0, 1.0])
+        self.assertEqual(router1.routers[0].destinations, [-1])
+        self.assertEqual([round(p, 2) for p in router1.routers[0].probs], [1.0])
         self.assertEqual(
             [str(d) for d in N.customer_classes['Class 1'].arrival_distributions],
             ["Exponential(rate=4.0)"],
@@ -856,8 +856,8 @@ class TestCreateNetworkKwargs(unittest.TestCase):
         router1 = N.customer_classes['Class 1'].routing
         self.assertEqual(router0.routers[0].destinations, [1, -1])
         self.assertEqual([round(p, 2) for p in router0.routers[0].probs], [0.5, 0.5])
-        self.assertEqual(router1.routers[0].destinations, [1, -1])
-        self.assertEqual([round(p, 2) for p in router1.routers[0].probs], [0.0, 1.0])
+        self.assertEqual(router1.routers[0].destinations, [-1])
+        self.assertEqual([round(p, 2) for p in router1.routers[0].probs], [1.0])
         self.assertEqual(
             [str(d) for d in N.customer_classes['Class 1'].arrival_distributions],
             ["Exponential(rate=4.0)"],
@@ -906,12 +906,12 @@ class TestCreateNetworkKwargs(unittest.TestCase):
             ["Exponential(rate=7.0)", "Uniform(lower=0.4, upper=1.2)", "Deterministic(value=5.33)"],
         )
         router = N.customer_classes['Customer'].routing
-        self.assertEqual(router.routers[0].destinations, [1, 2, 3, -1])
-        self.assertEqual([round(p, 2) for p in router.routers[0].probs], [0.5, 0.0, 0.1, 0.4])
-        self.assertEqual(router.routers[1].destinations, [1, 2, 3, -1])
-        self.assertEqual([round(p, 2) for p in router.routers[1].probs], [0.2, 0.1, 0.0, 0.7])
-        self.assertEqual(router.routers[2].destinations, [1, 2, 3, -1])
-        self.assertEqual([round(p, 2) for p in router.routers[2].probs], [0.0, 0.0, 0.0, 1.0])
+        self.assertEqual(router.routers[0].destinations, [1, 3, -1])
+        self.assertEqual([round(p, 2) for p in router.routers[0].probs], [0.5, 0.1, 0.4])
+        self.assertEqual(router.routers[1].destinations, [1, 2, -1])
+        self.assertEqual([round(p, 2) for p in router.routers[1].probs], [0.2, 0.1, 0.7])
+        self.assertEqual(router.routers[2].destinations, [-1])
+        self.assertEqual([round(p, 2) for p in router.routers[2].probs], [1.0])
 
         self.assertEqual(
             N.customer_classes['Customer'].baulking_functions,
@@ -980,8 +980,8 @@ class TestCreateNetworkKwargs(unittest.TestCase):
         router1 = N.customer_classes['Class 1'].routing
         self.assertEqual(router0.routers[0].destinations, [1, -1])
         self.assertEqual([round(p, 2) for p in router0.routers[0].probs], [0.5, 0.5])
-        self.assertEqual(router1.routers[0].destinations, [1, -1])
-        self.assertEqual([round(p, 2) for p in router1.routers[0].probs], [0.0, 1.0])
+        self.assertEqual(router1.routers[0].destinations, [-1])
+        self.assertEqual([round(p, 2) for p in router1.routers[0].probs], [1.0])
 
         self.assertEqual(
             [str(d) for d in N.customer_classes['Class 1'].arrival_distributions],
@@ -1127,3 +1127,13 @@ class TestCreateNetworkKwargs(unittest.TestCase):
             ciw.create_network(**params_neg)
         with self.assertRaises(ValueError):
             ciw.create_network(**params_str)
+
+    def test_raising_errors_baulking_tables(self):
+        for table in [[], [0.0, 0.5, 1.2], (-0.1, 1.0)]:
+            with self.assertRaises(ValueError):
+                ciw.create_network(
+                    arrival_distributions=[ciw.dists.Exponential(10)],
+                    service_distributions=[ciw.dists.Exponential(30)],
+                    number_of_servers=[2],
+                    baulking_functions=[table],
+                )
@@ -498,6 +498,7 @@ class TestNode(unittest.TestCase):
         )
 
         N1.blocked_queue = [(1, 1), (2, 100)]
+        N1.blocked_individuals = {(1, 1): N1.all_individuals[1], (2, 100): N2.all_individuals[0]}
         N1.len_blocked_queue = 2
         rel_ind = N1.individuals[0].pop(0)
         N1.detatch_server(rel_ind.server, rel_ind)
@@ -1345,6 +1346,125 @@ class TestNode(unittest.TestCase):
         self.assertEqual([r.arrival_date for r in recs_reneges], [4, 5])
         self.assertEqual([r.exit_date for r in recs_reneges], [11, 11])
 
+    def test_reneging_calendar(self):
+        """
+        Tests that the next renege found from the reneging calendar is
+        always the earliest reneging date of those waiting, including
+        simultaneous reneges, and that stale entries are removed from
+        the top of the calendar.
+        """
+        N = ciw.create_network(
+            arrival_distributions=[ciw.dists.Exponential(3.0), ciw.dists.Deterministic(2.0)],
+            service_distributions=[ciw.dists.Exponential(1.0), ciw.dists.Exponential(1.0)],
+            number_of_servers=[2, 1],
+            routing=[[0.0, 0.3], [0.3, 0.0]],
+            reneging_time_distributions=[ciw.dists.Exponential(0.5), ciw.dists.Deterministic(3.0)],
+            batching_distributions=[ciw.dists.Deterministic(1), ciw.dists.Deterministic(3)],
+        )
+        ciw.seed(0)
+        Q = ciw.Simulation(N)
+        number_of_simultaneous_reneges = 0
+        for event_date, node_id, event_type in Q.iter_events(200):
+            for node in Q.transitive_nodes:
+                waiting = [ind for ind in node.all_individuals if not ind.server]
+                dates = [ind.reneging_date for ind in waiting]
+                if dates:
+                    expected = [ind for ind in waiting if ind.reneging_date == min(dates)]
+                    self.assertEqual(node.possible_next_events['renege'], (expected, min(dates)))
+                    number_of_simultaneous_reneges += len(expected) > 1
+                else:
+                    self.assertNotIn('renege', node.possible_next_events)
+                if node.reneging_calendar:
+                    self.assertTrue(node.is_current_reneging_entry(node.reneging_calendar[0]))
+        self.assertGreater(number_of_simultaneous_reneges, 0)
+        self.assertGreater(len(Q.get_all_records(only=['renege'])), 0)
+
+    def test_reneging_after_preemption(self):
+        """
+        Tests that a customer whose service is preempted can renege
+        while waiting to resume service.
+          t=1 Cust 1 (Class 1) arrives, enters service, would renege at 6
+          t=2 Cust 2 (Class 0) arrives, preempts Cust 1
+          t=6 Cust 1 reneges
+        """
+        N = ciw.create_network(
+            arrival_distributions={
+                "Class 0": [ciw.dists.Sequential([2, float("inf")])],
+                "Class 1": [ciw.dists.Sequential([1, float("inf")])],
+            },
+            service_distributions={
+                "Class 0": [ciw.dists.Deterministic(10)],
+                "Class 1": [ciw.dists.Deterministic(10)],
+            },
+            number_of_servers=[1],
+            priority_classes=({"Class 0": 0, "Class 1": 1}, ["resume"]),
+            reneging_time_distributions={
+                "Class 0": [ciw.dists.Deterministic(5)],
+                "Class 1": [ciw.dists.Deterministic(5)],
+            },
+        )
+        Q = ciw.Simulation(N)
+        Q.simulate_until_max_time(20)
+        recs = Q.get_all_records(only=['renege'])
+        self.assertEqual([(r.customer_class, r.arrival_date, r.exit_date) for r in recs], [("Class 1", 1, 6)])
+
+    def test_class_change_calendar(self):
+        """
+        Tests that the next class change found from the class change
+        calendar is always the earliest class change date of those
+        waiting, taking the first in the queue in the case of ties,
+        and that only classes with distributions are sampled.
+        """
+        N = ciw.create_network(
+            arrival_distributions={
+                "Class 0": [ciw.dists.Exponential(1.0)],
+                "Class 1": [ciw.dists.Exponential(1.0)],
+                "Class 2": [ciw.dists.Deterministic(2.0)],
+            },
+            service_distributions={
+                "Class 0": [ciw.dists.Exponential(0.8)],
+                "Class 1": [ciw.dists.Exponential(0.8)],
+                "Class 2": [ciw.dists.Exponential(0.8)],
+            },
+            number_of_servers=[2],
+            priority_classes={"Class 0": 0, "Class 1": 1, "Class 2": 1},
+            class_change_time_distributions={
+                "Class 0": {"Class 1": ciw.dists.Exponential(0.5)},
+                "Class 1": {"Class 0": ciw.dists.Exponential(0.2), "Class 2": ciw.dists.Exponential(0.2)},
+                "Class 2": {"Class 1": ciw.dists.Deterministic(3.0)},
+            },
+            reneging_time_distributions={
+                "Class 0": [ciw.dists.Exponential(0.1)],
+                "Class 1": [ciw.dists.Exponential(0.1)],
+                "Class 2": [None],
+            },
+            batching_distributions={
+                "Class 0": [ciw.dists.Deterministic(1)],
+                "Class 1": [ciw.dists.Deterministic(1)],
+                "Class 2": [ciw.dists.Deterministic(2)],
+            },
+        )
+        ciw.seed(0)
+        Q = ciw.Simulation(N)
+        self.assertEqual(
+            [(clss, [c for c, dist in candidates]) for clss, candidates in Q.class_change_candidates.items()],
+            [("Class 0", ["Class 1"]), ("Class 1", ["Class 0", "Class 2"]), ("Class 2", ["Class 1"])],
+        )
+        node = Q.transitive_nodes[0]
+        number_of_simultaneous_class_changes = 0
+        for event_date, node_id, event_type in Q.iter_events(200):
+            waiting = [ind for ind in node.all_individuals if not ind.server]
+            dates = [ind.class_change_date for ind in waiting]
+            if dates:
+                expected = [ind for ind in waiting if ind.class_change_date == min(dates)]
+                self.assertEqual((node.next_class_change_ind, node.next_class_change_date), (expected[0], min(dates)))
+                number_of_simultaneous_class_changes += len(expected) > 1
+            else:
+                self.assertEqual((node.next_class_change_ind, node.next_class_change_date), (None, float("inf")))
+        self.assertGreater(number_of_simultaneous_class_changes, 0)
+        self.assertGreater(len(Q.get_all_records(only=['renege'])), 0)
+        self.assertGreater(len(node.class_change_calendar), 0)
+
     def test_class_change_while_waiting(self):
         """
         Only one type of customer arrive (Class 0),
@@ -1641,6 +1761,63 @@ class TestNode(unittest.TestCase):
         self.assertEqual(interrupted_recs[0].service_time, 5)
         self.assertTrue(isnan(interrupted_recs[0].service_end_date))
 
+    def test_preemption_index(self):
+        """
+        Tests that the preemption index always holds the servers'
+        customers in order of priority class and service start date,
+        through shift changes and class changes at the end of service.
+        """
+        N = ciw.create_network(
+            arrival_distributions={
+                "Class 0": [ciw.dists.Exponential(1.0), None],
+                "Class 1": [ciw.dists.Exponential(2.0), None],
+                "Class 2": [ciw.dists.Deterministic(1.0), None],
+            },
+            service_distributions={
+                "Class 0": [ciw.dists.Exponential(1.0), ciw.dists.Exponential(2.0)],
+                "Class 1": [ciw.dists.Exponential(1.0), ciw.dists.Exponential(2.0)],
+                "Class 2": [ciw.dists.Deterministic(1.0), ciw.dists.Exponential(2.0)],
+            },
+            number_of_servers=[ciw.Schedule(numbers_of_servers=[3, 5, 1], shift_end_dates=[5, 12, 20]), 1],
+            routing={
+                "Class 0": [[0.0, 0.5], [0.0, 0.0]],
+                "Class 1": [[0.0, 0.5], [0.0, 0.0]],
+                "Class 2": [[0.0, 0.5], [0.0, 0.0]],
+            },
+            priority_classes=({"Class 0": 0, "Class 1": 1, "Class 2": 2}, ["resume", False]),
+            class_change_matrices=[
+                {
+                    "Class 0": {"Class 0": 0.5, "Class 1": 0.5, "Class 2": 0.0},
+                    "Class 1": {"Class 0": 0.5, "Class 1": 0.5, "Class 2": 0.0},
+                    "Class 2": {"Class 0": 0.0, "Class 1": 0.0, "Class 2": 1.0},
+                },
+                {
+                    "Class 0": {"Class 0": 1.0, "Class 1": 0.0, "Class 2": 0.0},
+                    "Class 1": {"Class 0": 0.0, "Class 1": 1.0, "Class 2": 0.0},
+                    "Class 2": {"Class 0": 0.0, "Class 1": 0.0, "Class 2": 1.0},
+                },
+            ],
+        )
+        ciw.seed(2)
+        Q = ciw.Simulation(N)
+        node = Q.transitive_nodes[0]
+        for event in Q.iter_events(100):
+            expected = sorted(
+                (s.cust.priority_class, s.cust.service_start_date, -s.id_number, s)
+                for s in node.servers if s.busy
+            )
+            current = sorted(
+                (-entry[0], -entry[1], -entry[2], entry[-1])
+                for entry in node.preemption_index if entry[-1].preemption_key is entry
+            )
+            self.assertEqual(current, expected)
+            self.assertEqual(node.preemption_index_size, len(expected))
+            self.assertLessEqual(len(node.preemption_index), 2 * len(expected) + 32)
+            if expected:
+                self.assertIs(node.find_customer_to_preempt()[-1], expected[-1][-1])
+        self.assertGreater(len(Q.get_all_records(only=['interrupted service'])), 0)
+        self.assertEqual(Q.transitive_nodes[1].preemption_index, [])
+
     def test_preemptive_priorities_at_class_change(self):
         """
         One server.
@@ -0,0 +1,184 @@
+import random
+import unittest
+import ciw
+
+
+class Customer:
+    def __init__(self, name, priority_class):
+        self.name = name
+        self.priority_class = priority_class
+
+    def __repr__(self):
+        return self.name
+
+
+class TestPriorityQueues(unittest.TestCase):
+    def test_append_and_remove(self):
+        queues = ciw.PriorityQueues()
+        self.assertEqual(len(queues), 0)
+        self.assertEqual(queues, [])
+        self.assertEqual(queues.as_lists(3), [[], [], []])
+
+        a, b, c, d = Customer("a", 2), Customer("b", 0), Customer("c", 2), Customer("d", 1)
+        for ind in [a, b, c, d]:
+            queues.append(ind)
+        self.assertEqual(len(queues), 4)
+        self.assertEqual(queues, [b, d, a, c])
+        self.assertEqual(queues.levels, {0: [b], 1: [d], 2: [a, c]})
+        self.assertEqual(queues.priority_classes, [0, 1, 2])
+        self.assertEqual([queues[i] for i in range(4)], [b, d, a, c])
+        self.assertEqual(queues[1:3], [d, a])
+        self.assertEqual(queues[-1], c)
+        self.assertRaises(IndexError, lambda: queues[4])
+        self.assertTrue(a in queues)
+        self.assertEqual(str(queues), "[b, d, a, c]")
+
+        queues.remove(a, 2)
+        self.assertEqual(len(queues), 3)
+        self.assertEqual(queues, [b, d, c])
+        self.assertEqual(queues, ciw.PriorityQueues([[b], [d], [c]]))
+        self.assertNotEqual(queues, "b, d, c")
+
+        queues.remove(d, 1)
+        self.assertEqual(queues.levels, {0: [b], 2: [c]})
+        self.assertEqual(queues.priority_classes, [0, 2])
+        self.assertEqual(queues.as_lists(2), [[b], [], [c]])
+        self.assertEqual(queues.as_lists(4), [[b], [], [c], []])
+
+    def test_only_nonempty_priority_classes_are_kept(self):
+        queues = ciw.PriorityQueues([[], [], [Customer("a", 2)], []])
+        self.assertEqual(queues.priority_classes, [2])
+        customers = [Customer(str(p), p) for p in [40, 7, 93, 7, 0, 40]]
+        for ind in customers:
+            queues.append(ind)
+        self.assertEqual(queues.priority_classes, [0, 2, 7, 40, 93])
+        self.assertEqual([ind.priority_class for ind in queues], [0, 2, 7, 7, 40, 40, 93])
+        for ind in customers:
+            queues.remove(ind, ind.priority_class)
+        self.assertEqual(queues.priority_classes, [2])
+        self.assertEqual(len(queues), 1)
+
+    def test_single_priority_class(self):
+        a, b = Customer("a", 0), Customer("b", 0)
+        queues = ciw.PriorityQueues([[a, b]])
+        self.assertEqual(len(queues), 2)
+        self.assertEqual(list(queues), [a, b])
+
+    def test_node_individuals_are_not_copied(self):
+        N = ciw.create_network(
+            arrival_distributions={
+                "Class 0": [ciw.dists.Exponential(1.0)],
+                "Class 1": [ciw.dists.Exponential(1.0)],
+                "Class 2": [ciw.dists.Exponential(1.0)],
+            },
+            service_distributions={
+                "Class 0": [ciw.dists.Exponential(1.2)],
+                "Class 1": [ciw.dists.Exponential(1.2)],
+                "Class 2": [ciw.dists.Exponential(1.2)],
+            },
+            number_of_servers=[2],
+            priority_classes={"Class 0": 0, "Class 1": 1, "Class 2": 2},
+            class_change_time_distributions={
+                "Class 2": {"Class 0": ciw.dists.Exponential(0.5)},
+                "Class 0": {"Class 1": ciw.dists.Exponential(0.5)},
+            },
+            reneging_time_distributions={
+                "Class 0": [None],
+                "Class 1": [ciw.dists.Exponential(0.2)],
+                "Class 2": [None],
+            },
+        )
+        Q = ciw.Simulation(N, seed=2)
+        node = Q.transitive_nodes[0]
+        queues = node.all_individuals
+        self.assertEqual(node.individuals, [[], [], []])
+        for _ in range(2000):
+            Q.simulate_until_max_time(Q.current_time + 0.5)
+            self.assertIs(node.all_individuals, queues)
+            self.assertEqual(len(queues), node.number_of_individuals)
+            self.assertEqual(len(queues), sum(len(level) for level in node.individuals))
+            self.assertEqual(queues.priority_classes, sorted(queues.levels))
+            self.assertTrue(all(queues.levels.values()))
+            self.assertEqual(
+                list(queues), [ind for level in node.individuals for ind in level]
+            )
+
+    def test_many_priority_classes(self):
+        number_of_classes = 60
+        N = ciw.create_network(
+            arrival_distributions={
+                f"Class {i}": [ciw.dists.Exponential(0.015)] for i in range(number_of_classes)
+            },
+            service_distributions={
+                f"Class {i}": [ciw.dists.Exponential(1.0)] for i in range(number_of_classes)
+            },
+            number_of_servers=[1],
+            priority_classes={f"Class {i}": i for i in range(number_of_classes)},
+        )
+        Q = ciw.Simulation(N, seed=5)
+        node = Q.transitive_nodes[0]
+        for _ in range(1000):
+            Q.simulate_until_max_time(Q.current_time + 0.5)
+            self.assertLessEqual(len(node.all_individuals.levels), len(node.all_individuals))
+            waiting = [ind for ind in node.all_individuals if not ind.server]
+            expected = min(waiting, key=lambda ind: ind.priority_class) if waiting else None
+            self.assertIs(node.choose_next_customer(), expected)
+        recs = Q.get_all_records()
+        self.assertEqual(len({r.customer_class for r in recs}), number_of_classes)
+
+    def test_levels_index_and_close_gaps(self):
+        rng = random.Random(4)
+        individuals = [Customer(str(i), 0) for i in range(400)]
+        level = ciw.priority_queues.PriorityLevel(individuals[:100])
+        expected = individuals[:100]
+        self.assertEqual(level[5], expected[5])
+        for ind in individuals[100:]:
+            level.append(ind)
+            expected.append(ind)
+            if rng.random() < 0.6:
+                removed = expected.pop(rng.randrange(len(expected)))
+                level.remove(removed)
+                self.assertNotIn(removed, level)
+            self.assertEqual(len(level), len(expected))
+            self.assertEqual([level[i] for i in range(len(expected))], expected)
+        self.assertEqual(list(level), expected)
+        self.assertLessEqual(len(level.slots), 2 * len(level) + 32)
+        self.assertEqual(level[-1], expected[-1])
+        self.assertEqual(level[2:5], expected[2:5])
+        self.assertRaises(IndexError, lambda: level[len(expected)])
+        self.assertEqual(level, ciw.priority_queues.PriorityLevel(expected))
+        self.assertNotEqual(level, "level")
+        self.assertEqual(repr(level), repr(expected))
+
+        while len(expected) > 10:
+            level.remove(expected.pop(0))
+            self.assertEqual(level[0], expected[0])
+        self.assertLessEqual(len(level.slots), 2 * 10 + 32)
+        self.assertEqual([level[i] for i in range(10)], expected)
+
+    def test_views_of_priority_classes(self):
+        a, b, c, d = Customer("a", 0), Customer("b", 0), Customer("c", 2), Customer("d", 0)
+        queues = ciw.PriorityQueues([[a]])
+        views = queues.as_lists(3)
+        self.assertEqual(views, [[a], [], []])
+        self.assertRaises(IndexError, lambda: views[1][0])
+        views[2].append(c)
+        views[0].append(b)
+        self.assertEqual(queues, [a, b, c])
+        self.assertEqual(len(queues), 3)
+        self.assertTrue(c in views[2])
+        views[0].insert(1, d)
+        self.assertEqual(views[0], [a, d, b])
+        e = Customer("e", 0)
+        views[0][0] = e
+        self.assertEqual(queues, [e, d, b, c])
+        self.assertNotIn(a, queues)
+        self.assertEqual(views[0].pop(1), d)
+        del views[0][:]
+        self.assertEqual(views, [[], [], [c]])
+        self.assertEqual(queues.priority_classes, [2])
+        self.assertRaises(ValueError, views[0].remove, c)
+        views[2].remove(c)
+        self.assertEqual(len(queues), 0)
+        self.assertNotEqual(views[2], "c")
+        self.assertEqual(repr(views[2]), "[]")
@@ -223,6 +223,12 @@ class TestProcessBased(unittest.TestCase):
             routes_counter,
             Counter({(1, 2, 5, 6): 508, (1, 2, 3, 6): 492}),  # evenly spread between the two unflooded nodes
         )
+        routers = N.customer_classes["Customer"].routing.subset_routers
+        self.assertEqual(set(routers), {(2,), (3, 4, 5), (6,)})
+        self.assertIsInstance(routers[(3, 4, 5)], ciw.routing.LoadBalancing)
+        self.assertEqual(routers[(3, 4, 5)].destinations, [3, 4, 5])
+        Q = ciw.Simulation(N)
+        self.assertEqual(N.customer_classes["Customer"].routing.subset_routers, {})
 
 
         ## Now test 'all-random':
@@ -250,6 +256,83 @@ class TestProcessBased(unittest.TestCase):
         self.assertEqual(routes_counter[(1, 2, 5, 3, 4, 6)], 186)
         self.assertEqual(routes_counter[(1, 2, 5, 4, 3, 6)], 155)
 
+    def test_routes_are_shared_tuples_with_a_cursor(self):
+        route = (1, 2, 1, 3)
+        N = ciw.create_network(
+            arrival_distributions=[ciw.dists.Deterministic(1), None, None],
+            service_distributions=[ciw.dists.Deterministic(2)] * 3,
+            number_of_servers=[float("inf")] * 3,
+            routing=ciw.routing.ProcessBased(lambda ind, simulation: route),
+        )
+        Q = ciw.Simulation(N)
+        Q.simulate_until_max_time(5.5)
+        inds = Q.get_all_individuals()
+        self.assertEqual(len(inds), 5)
+        for ind in inds:
+            self.assertIs(ind.route_nodes, route)
+        self.assertEqual(sorted(ind.route_cursor for ind in inds), [0, 0, 1, 1, 2])
+        self.assertEqual([ind.route for ind in inds if ind.id_number == 1], [[1, 3]])
+
+        ind = ciw.Individual(1)
+        self.assertEqual(ind.route, [])
+        ind.route = [2, 3]
+        self.assertEqual((ind.route_nodes, ind.route_cursor), ((2, 3), 0))
+
+    def test_route_table(self):
+        for routes, route_ids in [
+            ([[2, 1, 3], [3]], [0, 1]),
+            ({"long": [2, 1, 3], "short": (3,)}, ["long", "short"]),
+        ]:
+            routing = ciw.routing.ProcessBased(
+                lambda ind, simulation: route_ids[ind.id_number % 2], routes=routes
+            )
+            N = ciw.create_network(
+                arrival_distributions=[ciw.dists.Deterministic(1), None, None],
+                service_distributions=[ciw.dists.Deterministic(0.5)] * 3,
+                number_of_servers=[float("inf")] * 3,
+                routing=routing,
+            )
+            Q = ciw.Simulation(N)
+            Q.simulate_until_max_time(10.1)
+            recs = Q.get_all_records()
+            routes_counter = Counter(
+                tuple(r.node for r in sorted(recs, key=lambda r: r.arrival_date) if r.id_number == i)
+                for i in range(1, 9)
+            )
+            self.assertEqual(routes_counter, Counter({(1, 2, 1, 3): 4, (1, 3): 4}))
+            self.assertEqual(
+                set(id(ind.route_nodes) for ind in Q.get_all_individuals()),
+                set(id(routing.routes[route_id]) for route_id in route_ids),
+            )
+            self.assertIsInstance(routing.routes[route_ids[0]], tuple)
+
+    def test_flexible_route_table_is_not_changed(self):
+        routing = ciw.routing.FlexibleProcessBased(
+            lambda ind, simulation: 0, 'all', 'random', routes=[[[2], [3, 4, 5], [6]]]
+        )
+        self.assertEqual(routing.routes, [((2,), (3, 4, 5), (6,))])
+        N = ciw.create_network(
+            arrival_distributions=[ciw.dists.Exponential(rate=1), None, None, None, None, None],
+            service_distributions=[ciw.dists.Exponential(rate=2)] * 6,
+            number_of_servers=[3] * 6,
+            routing=routing,
+        )
+        ciw.seed(0)
+        Q = ciw.Simulation(N)
+        Q.simulate_until_max_customers(100)
+        inds = Q.nodes[-1].all_individuals
+        for ind in inds:
+            nodes = [dr.node for dr in ind.data_records]
+            self.assertEqual((nodes[:2], sorted(nodes[2:5]), nodes[5:]), ([1, 2], [3, 4, 5], [6]))
+        self.assertEqual(routing.routes, [((2,), (3, 4, 5), (6,))])
+
+        ind = ciw.Individual(1)
+        routing.initialise_individual(ind)
+        routing.next_node(ind, 1)
+        routing.next_node(ind, 2)
+        self.assertEqual(len(ind.route[0]), 2)
+        self.assertEqual(ind.route[1], (6,))
+
     def test_flexible_process_based_error_raising(self):
         self.assertRaises(ValueError, ciw.routing.FlexibleProcessBased, flexible_generator_1, 'something', 'random')
         self.assertRaises(ValueError, ciw.routing.FlexibleProcessBased, flexible_generator_1, 'all', 'something')
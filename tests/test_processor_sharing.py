@@ -124,29 +124,29 @@ class TestProcessorSharing(unittest.TestCase):
         router1 = Q.network.customer_classes["Class 1"].routing
         router2 = Q.network.customer_classes["Class 2"].routing
         self.assertEqual(router0.routers[0].destinations, [1, 2, 3, 4, -1])
-        self.assertEqual(router0.routers[1].destinations, [1, 2, 3, 4, -1])
-        self.assertEqual(router0.routers[2].destinations, [1, 2, 3, 4, -1])
-        self.assertEqual(router0.routers[3].destinations, [1, 2, 3, 4, -1])
-        self.assertEqual(router1.routers[0].destinations, [1, 2, 3, 4, -1])
+        self.assertEqual(router0.routers[1].destinations, [1, 2, 4, -1])
+        self.assertEqual(router0.routers[2].destinations, [2, 3, 4, -1])
+        self.assertEqual(router0.routers[3].destinations, [1, 2, 3, -1])
+        self.assertEqual(router1.routers[0].destinations, [1, 4, -1])
         self.assertEqual(router1.routers[1].destinations, [1, 2, 3, 4, -1])
-        self.assertEqual(router1.routers[2].destinations, [1, 2, 3, 4, -1])
+        self.assertEqual(router1.routers[2].destinations, [1, -1])
         self.assertEqual(router1.routers[3].destinations, [1, 2, 3, 4, -1])
-        self.assertEqual(router2.routers[0].destinations, [1, 2, 3, 4, -1])
+        self.assertEqual(router2.routers[0].destinations, [3, 4, -1])
         self.assertEqual(router2.routers[1].destinations, [1, 2, 3, 4, -1])
         self.assertEqual(router2.routers[2].destinations, [1, 2, 3, 4, -1])
-        self.assertEqual(router2.routers[3].destinations, [1, 2, 3, 4, -1])
+        self.assertEqual(router2.routers[3].destinations, [4, -1])
         self.assertEqual([round(p, 2) for p in router0.routers[0].probs], [0.1, 0.2, 0.1, 0.4, 0.2])
-        self.assertEqual([round(p, 2) for p in router0.routers[1].probs], [0.2, 0.2, 0.0, 0.1, 0.5])
-        self.assertEqual([round(p, 2) for p in router0.routers[2].probs], [0.0, 0.8, 0.1, 0.1, 0.0])
-        self.assertEqual([round(p, 2) for p in router0.routers[3].probs], [0.4, 0.1, 0.1, 0.0, 0.4])
-        self.assertEqual([round(p, 2) for p in router1.routers[0].probs], [0.6, 0.0, 0.0, 0.2, 0.2])
+        self.assertEqual([round(p, 2) for p in router0.routers[1].probs], [0.2, 0.2, 0.1, 0.5])
+        self.assertEqual([round(p, 2) for p in router0.routers[2].probs], [0.8, 0.1, 0.1, 0.0])
+        self.assertEqual([round(p, 2) for p in router0.routers[3].probs], [0.4, 0.1, 0.1, 0.4])
+        self.assertEqual([round(p, 2) for p in router1.routers[0].probs], [0.6, 0.2, 0.2])
         self.assertEqual([round(p, 2) for p in router1.routers[1].probs], [0.1, 0.1, 0.2, 0.2, 0.4])
-        self.assertEqual([round(p, 2) for p in router1.routers[2].probs], [0.9, 0.0, 0.0, 0.0, 0.1])
+        self.assertEqual([round(p, 2) for p in router1.routers[2].probs], [0.9, 0.1])
         self.assertEqual([round(p, 2) for p in router1.routers[3].probs], [0.2, 0.1, 0.1, 0.1, 0.5])
-        self.assertEqual([round(p, 2) for p in router2.routers[0].probs], [0.0, 0.0, 0.4, 0.3, 0.3])
+        self.assertEqual([round(p, 2) for p in router2.routers[0].probs], [0.4, 0.3, 0.3])
         self.assertEqual([round(p, 2) for p in router2.routers[1].probs], [0.1, 0.1, 0.1, 0.1, 0.6])
         self.assertEqual([round(p, 2) for p in router2.routers[2].probs], [0.1, 0.3, 0.2, 0.2, 0.2])
-        self.assertEqual([round(p, 2) for p in router2.routers[3].probs], [0.0, 0.0, 0.0, 0.3, 0.7])
+        self.assertEqual([round(p, 2) for p in router2.routers[3].probs], [0.3, 0.7])
 
         self.assertEqual(N.next_event_date, float("inf"))
         self.assertEqual(N.all_individuals, [])
@@ -0,0 +1,51 @@
+import unittest
+import ciw
+
+
+class TestProfiler(unittest.TestCase):
+    def test_profiler_init_method(self):
+        P = ciw.Profiler()
+        self.assertEqual(P.event_counts, {})
+        self.assertEqual(
+            P.wall_times,
+            {"have_event": 0.0, "update_next_event_date": 0.0, "sampling": 0.0, "routing": 0.0},
+        )
+        self.assertEqual(P.number_of_events, 0)
+
+    def test_profiler_counts_events(self):
+        N = ciw.create_network(
+            arrival_distributions=[ciw.dists.Deterministic(1.0), None],
+            service_distributions=[ciw.dists.Deterministic(0.5), ciw.dists.Deterministic(0.25)],
+            routing=[[0.0, 1.0], [0.0, 0.0]],
+            number_of_servers=[1, 1],
+        )
+        Q = ciw.Simulation(N, profiler=ciw.Profiler())
+        Q.simulate_until_max_time(10.8)
+        self.assertEqual(
+            Q.profiler.event_counts,
+            {(0, "arrival"): 10, (1, "end_service"): 10, (2, "end_service"): 10},
+        )
+        self.assertEqual(Q.profiler.number_of_events, 30)
+        self.assertEqual(Q.profiler.events_by_type(), {"arrival": 10, "end_service": 20})
+        self.assertEqual(Q.profiler.events_by_node(), {0: 10, 1: 10, 2: 10})
+        self.assertTrue(all(t > 0 for t in Q.profiler.wall_times.values()))
+        self.assertGreater(Q.profiler.wall_times["have_event"], Q.profiler.wall_times["routing"])
+
+    def test_profiler_does_not_change_results(self):
+        N = ciw.create_network(
+            arrival_distributions=[ciw.dists.Exponential(1.0), ciw.dists.Exponential(1.0)],
+            service_distributions=[ciw.dists.Exponential(2.0), ciw.dists.Exponential(1.5)],
+            routing=[[0.1, 0.3], [0.2, 0.2]],
+            number_of_servers=[1, 2],
+            reneging_time_distributions=[ciw.dists.Exponential(1.0), None],
+        )
+        ciw.seed(0)
+        Q = ciw.Simulation(N)
+        Q.simulate_until_max_time(50)
+        expected_recs = Q.get_all_records()
+
+        ciw.seed(0)
+        Q = ciw.Simulation(N, profiler=ciw.Profiler())
+        Q.simulate_until_max_time(50)
+        self.assertEqual(Q.get_all_records(), expected_recs)
+        self.assertEqual(Q.profiler.events_by_type()["renege"], len([r for r in expected_recs if r.record_type == "renege"]))
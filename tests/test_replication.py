@@ -0,0 +1,112 @@
+import unittest
+import ciw
+import random
+import statistics as st
+
+
+def mean_wait(Q):
+    waits = [r.waiting_time for r in Q.get_all_records()]
+    return sum(waits) / len(waits)
+
+
+N = ciw.create_network(
+    arrival_distributions=[ciw.dists.Exponential(rate=0.9)],
+    service_distributions=[ciw.dists.Exponential(rate=1.0)],
+    number_of_servers=[1],
+)
+
+
+class TestReplication(unittest.TestCase):
+    def test_antithetic_random(self):
+        r1 = random.Random(3)
+        r2 = ciw.AntitheticRandom(3)
+        for _ in range(10):
+            self.assertEqual(r2.random(), 1.0 - r1.random())
+
+        class Zero(random.Random):
+            def random(self):
+                return 0.0
+
+        class AntitheticZero(ciw.AntitheticRandom, Zero):
+            pass
+
+        self.assertEqual(AntitheticZero(3).random(), 0.0)
+
+        self.assertIsInstance(ciw.random_stream(3), random.Random)
+        self.assertNotIsInstance(ciw.random_stream(3), ciw.AntitheticRandom)
+        self.assertIsInstance(ciw.random_stream(3, antithetic=True), ciw.AntitheticRandom)
+
+    def test_antithetic_distributions(self):
+        dists = [
+            lambda: ciw.dists.Uniform(2.2, 3.3),
+            lambda: ciw.dists.Exponential(4.4),
+            lambda: ciw.dists.Weibull(0.9, 0.8),
+            lambda: ciw.dists.Empirical([1.0, 2.0, 3.0]),
+            lambda: ciw.dists.Pmf([3.7, 3.8], [0.5, 0.5]),
+        ]
+        for make in dists:
+            D1, D2 = make(), make()
+            D1.seed(5)
+            D2.seed(5, antithetic=True)
+            samples1 = [D1.sample() for _ in range(500)]
+            samples2 = [D2.sample() for _ in range(500)]
+            self.assertLess(st.correlation(samples1, samples2), -0.3)
+
+        D1, D2 = ciw.dists.Uniform(2.2, 3.3), ciw.dists.Uniform(2.2, 3.3)
+        D1.seed(5)
+        D2.seed(5, antithetic=True)
+        for _ in range(10):
+            self.assertAlmostEqual(D1.sample() + D2.sample(), 5.5)
+
+    def test_antithetic_simulation(self):
+        self.assertRaises(ValueError, ciw.Simulation, N, antithetic=True)
+        Q1 = ciw.Simulation(N, seed=2)
+        Q2 = ciw.Simulation(N, seed=2, antithetic=True)
+        self.assertTrue(Q2.antithetic)
+        self.assertIsInstance(Q2.rng, ciw.AntitheticRandom)
+        self.assertIsInstance(Q2.transitive_nodes[0].baulking_rng, ciw.AntitheticRandom)
+        Q1.simulate_until_max_time(100)
+        Q2.simulate_until_max_time(100)
+        self.assertNotEqual(Q1.get_all_records(), Q2.get_all_records())
+
+        Q = ciw.Simulation(N, seed=2, antithetic=True, fast_path=True)
+        self.assertFalse(Q.fast_path)
+
+    def test_antithetic_routing(self):
+        R1 = ciw.routing.Probabilistic(destinations=[1, 2], probs=[0.5, 0.5])
+        R2 = ciw.routing.Probabilistic(destinations=[1, 2], probs=[0.5, 0.5])
+        R1.seed(4)
+        R2.seed(4, antithetic=True)
+        choices1 = [ciw.random_choice(R1.destinations, R1.probs, rng=R1.rng) for _ in range(100)]
+        choices2 = [ciw.random_choice(R2.destinations, R2.probs, rng=R2.rng) for _ in range(100)]
+        self.assertTrue(all(c1 != c2 for c1, c2 in zip(choices1, choices2)))
+
+    def test_replicate(self):
+        estimates = ciw.replicate(N, mean_wait, 100, 4, seed=1)
+        self.assertEqual(len(estimates), 4)
+        self.assertEqual(len(set(estimates)), 4)
+        self.assertEqual(estimates, ciw.replicate(N, mean_wait, 100, 4, seed=1))
+        self.assertNotEqual(estimates, ciw.replicate(N, mean_wait, 100, 4, seed=2))
+
+        Q = ciw.Simulation(N, seed=ciw.derive_seed(1, "replication", 2))
+        Q.simulate_until_max_time(100)
+        self.assertEqual(estimates[2], mean_wait(Q))
+
+    def test_replicate_antithetic(self):
+        estimates = ciw.replicate(N, mean_wait, 100, 4, seed=1)
+        pairs = ciw.replicate(N, mean_wait, 100, 4, seed=1, antithetic=True)
+        self.assertEqual(len(pairs), 4)
+        for estimate, pair in zip(estimates, pairs):
+            self.assertIsInstance(pair, ciw.PairedEstimate)
+            self.assertEqual(pair.estimate, estimate)
+            self.assertNotEqual(pair.antithetic_estimate, estimate)
+            self.assertEqual(pair.mean, (pair.estimate + pair.antithetic_estimate) / 2)
+
+        pairs = ciw.replicate(N, mean_wait, 500, 20, seed=1, antithetic=True)
+        self.assertLess(
+            st.correlation([p.estimate for p in pairs], [p.antithetic_estimate for p in pairs]), 0
+        )
+
+    def test_replicate_passes_keyword_arguments(self):
+        estimates = ciw.replicate(N, lambda Q: Q.name, 10, 2, name="Replication")
+        self.assertEqual(estimates, ["Replication", "Replication"])
@@ -1,5 +1,7 @@
 import unittest
 import ciw
+import numpy as np
+import scipy.sparse
 from collections import Counter
 
 N = ciw.create_network(
@@ -85,6 +87,84 @@ class TestRouting(unittest.TestCase):
         self.assertEqual([samples_3[i] for i in [1, 2, 3, -1]], [3278, 3444, 3278, 0])
 
 
+    def test_sparse_transition_matrix_router(self):
+        dense = ciw.routing.TransitionMatrix(transition_matrix=[
+            [0.6, 0.3, 0.1],
+            [0.0, 0.0, 0.3],
+            [0.0, 0.0, 0.0]
+        ])
+        sparse = ciw.routing.TransitionMatrix(transition_matrix={
+            1: {2: 0.3, 1: 0.6, 3: 0.1},
+            2: {3: 0.3, 1: 0.0},
+        })
+        self.assertEqual([r.destinations for r in dense.routers], [[1, 2, 3, -1], [3, -1], [-1]])
+        self.assertEqual([r.destinations for r in sparse.routers], [[1, 2, 3, -1], [3, -1]])
+        self.assertEqual([r.cumulative_probs for r in dense.routers[:2]], [r.cumulative_probs for r in sparse.routers])
+        self.assertTrue(dense.routers[2].certain_exit)
+
+        ciw.seed(0)
+        Q = ciw.Simulation(N)
+        sparse.initialise(Q)
+        self.assertEqual([r.destinations for r in sparse.routers], [[1, 2, 3, -1], [3, -1], [-1]])
+        ind = ciw.Individual(1)
+        samples_1 = Counter([r.id_number for r in [sparse.next_node(ind, 1) for _ in range(10000)]])
+        samples_2 = Counter([r.id_number for r in [sparse.next_node(ind, 2) for _ in range(10000)]])
+        samples_3 = Counter([r.id_number for r in [sparse.next_node(ind, 3) for _ in range(10000)]])
+        self.assertEqual([samples_1[i] for i in [1, 2, 3, -1]], [5976, 3067, 957, 0])
+        self.assertEqual([samples_2[i] for i in [1, 2, 3, -1]], [0, 0, 3019, 6981])
+        self.assertEqual([samples_3[i] for i in [1, 2, 3, -1]], [0, 0, 0, 10000])
+
+        too_many_rows = ciw.routing.TransitionMatrix(transition_matrix={4: {1: 1.0}})
+        self.assertRaises(ValueError, too_many_rows.initialise, Q)
+        bad_destination = ciw.routing.TransitionMatrix(transition_matrix={1: {4: 1.0}})
+        self.assertRaises(ValueError, bad_destination.initialise, Q)
+        self.assertRaises(ValueError, ciw.routing.TransitionMatrix, {1: {2: 1}})
+        ragged = ciw.routing.TransitionMatrix(transition_matrix=[[0.5, 0.2, 0.0], [0.1], [0.0, 0.0, 0.0]])
+        self.assertRaises(ValueError, ragged.initialise, Q)
+        mismatched = ciw.routing.Probabilistic(destinations=[1, 2], probs=[0.5])
+        self.assertRaises(ValueError, mismatched.initialise, Q, 1)
+        numpy_destinations = ciw.routing.Probabilistic(destinations=list(np.array([1, 3])), probs=[0.5, 0.5])
+        numpy_destinations.initialise(Q, 1)
+        self.assertIn(numpy_destinations.next_node(ciw.Individual(1)).id_number, [1, 3])
+        integral_float = ciw.routing.Probabilistic(destinations=[1.0, 3], probs=[0.5, 0.5])
+        integral_float.initialise(Q, 1)
+        self.assertEqual(integral_float.destinations, [1, 3, -1])
+        self.assertIn(integral_float.next_node(ciw.Individual(1)).id_number, [1, 3])
+        non_integer = ciw.routing.Probabilistic(destinations=[1.5, 3], probs=[0.5, 0.5])
+        self.assertRaises(ValueError, non_integer.initialise, Q, 1)
+
+    def test_scipy_sparse_transition_matrix_router(self):
+        matrix = scipy.sparse.coo_matrix(([0.3, 0.6, 0.1, 0.3, 0.0], ([0, 0, 0, 1, 2], [1, 0, 2, 2, 0])), shape=(3, 3))
+        R = ciw.routing.TransitionMatrix(transition_matrix=matrix)
+        self.assertEqual([r.destinations for r in R.routers], [[1, 2, 3, -1], [3, -1], [-1]])
+        self.assertEqual([round(p, 2) for p in R.routers[0].probs], [0.6, 0.3, 0.1, 0.0])
+        self.assertTrue(all(type(d) is int for r in R.routers for d in r.destinations))
+        self.assertEqual(matrix.col.tolist(), [1, 0, 2, 2, 0])
+        R_wide = ciw.routing.TransitionMatrix(transition_matrix=scipy.sparse.csr_matrix((3, 4)))
+
+        ciw.seed(0)
+        Q = ciw.Simulation(N)
+        R.initialise(Q)
+        ind = ciw.Individual(1)
+        samples_1 = Counter([r.id_number for r in [R.next_node(ind, 1) for _ in range(10000)]])
+        self.assertEqual([samples_1[i] for i in [1, 2, 3, -1]], [5976, 3067, 957, 0])
+        self.assertRaises(ValueError, R_wide.initialise, Q)
+
+        N_sparse = ciw.create_network(
+            arrival_distributions=[ciw.dists.Exponential(rate=1.0), None, None],
+            service_distributions=[ciw.dists.Exponential(rate=2.0)] * 3,
+            number_of_servers=[1, 2, 2],
+            routing=matrix,
+        )
+        self.assertIsInstance(N_sparse.customer_classes["Customer"].routing, ciw.routing.TransitionMatrix)
+        N_sparse = ciw.create_network(
+            arrival_distributions={"A": [ciw.dists.Exponential(rate=1.0), None, None]},
+            service_distributions={"A": [ciw.dists.Exponential(rate=2.0)] * 3},
+            number_of_servers=[1, 2, 2],
+            routing={"A": matrix},
+        )
+        self.assertIsInstance(N_sparse.customer_classes["A"].routing, ciw.routing.TransitionMatrix)
+
     def test_direct_routing(self):
         ciw.seed(0)
         Q = ciw.Simulation(N)
@@ -287,6 +367,84 @@ class TestRouting(unittest.TestCase):
         self.assertEqual(round(max(waits_3), 6), 2.507875)
 
 
+    def test_indexed_jsq_matches_comparing_every_destination(self):
+        def run(router, number_of_servers, **kwargs):
+            N = ciw.create_network(
+                arrival_distributions=[ciw.dists.Exponential(rate=3.0), None, None, None],
+                service_distributions=[ciw.dists.Deterministic(value=0.0)] + [ciw.dists.Exponential(rate=1.0)] * 3,
+                number_of_servers=[float("inf")] + number_of_servers,
+                routing=ciw.routing.NetworkRouting(routers=[router] + [ciw.routing.Leave()] * 3),
+                **kwargs
+            )
+            ciw.seed(1)
+            Q = ciw.Simulation(N)
+            Q.simulate_until_max_time(50)
+            return Q.get_all_records()
+
+        scenarios = [
+            ([1, 1, 2], {"reneging_time_distributions": [None] + [ciw.dists.Exponential(rate=1.0)] * 3}),
+            (
+                [ciw.Schedule(numbers_of_servers=[1, 3], shift_end_dates=[4, 9], preemption="resume"), 1, 1],
+                {},
+            ),
+            ([ciw.Slotted(slots=[1.5, 3.5, 6.0], slot_sizes=[2, 3, 1], capacitated=True, preemption="resume"), 1, 1], {}),
+        ]
+        for router_type in [ciw.routing.JoinShortestQueue, ciw.routing.LoadBalancing]:
+            for tie_break in ["random", "order"]:
+                for number_of_servers, kwargs in scenarios:
+                    records = run(router_type(destinations=[2, 3, 4], tie_break=tie_break), number_of_servers, **kwargs)
+                    indexed = run(router_type(destinations=[2, 3, 4], tie_break=tie_break, indexed=True), number_of_servers, **kwargs)
+                    self.assertEqual(records, indexed)
+
+        ciw.seed(0)
+        Q = ciw.Simulation(N)
+        R = ciw.routing.JoinShortestQueue(destinations=[1, 2, 3, 2], indexed=True)
+        R.initialise(Q, 1)
+        self.assertEqual(R.positions, {1: [0], 2: [1, 3], 3: [2]})
+        self.assertEqual(R.positions_by_queue_size, {0: [0, 1, 2, 3]})
+        self.assertEqual(Q.nodes[2].queue_size_watchers, [R])
+        Q.nodes[2].number_of_individuals = 2
+        Q.nodes[2].update_queue_size_watchers()
+        Q.nodes[1].number_of_individuals = 1
+        Q.nodes[1].update_queue_size_watchers()
+        self.assertEqual(R.positions_by_queue_size, {0: [2], 1: [0], 2: [1, 3]})
+        Q.nodes[3].number_of_individuals = 3
+        Q.nodes[3].update_queue_size_watchers()
+        self.assertEqual(R.shortest_queue_size, 1)
+        self.assertEqual(R.next_node(ciw.Individual(1)), Q.nodes[1])
+        Q.nodes[2].number_of_individuals = 0
+        Q.nodes[2].update_queue_size_watchers()
+        self.assertEqual(R.shortest_queue_size, 0)
+        self.assertEqual([R.next_node(ciw.Individual(1)).id_number for _ in range(4)], [2, 2, 2, 2])
+
+    def test_jsq_power_of_d(self):
+        ciw.seed(0)
+        Q = ciw.Simulation(N)
+        R = ciw.routing.JoinShortestQueue(destinations=[1, 2, 3], sample_size=2, tie_break="order")
+        R.initialise(Q, 1)
+        Q.nodes[1].number_of_individuals = 5
+        Q.nodes[2].number_of_individuals = 3
+        Q.nodes[3].number_of_individuals = 4
+        samples = Counter([R.next_node(ciw.Individual(1)).id_number for _ in range(3000)])
+        self.assertEqual(set(samples), {2, 3})
+        self.assertAlmostEqual(samples[2] / 3000, 2 / 3, places=1)
+        self.assertAlmostEqual(samples[3] / 3000, 1 / 3, places=1)
+
+        R = ciw.routing.JoinShortestQueue(destinations=[1, 2, 3], sample_size=3)
+        R.initialise(Q, 1)
+        self.assertTrue(all(R.next_node(ciw.Individual(1)).id_number == 2 for _ in range(100)))
+
+        R = ciw.routing.LoadBalancing(destinations=[1, 2, 3], sample_size=1)
+        R.initialise(Q, 1)
+        samples = Counter([R.next_node(ciw.Individual(1)).id_number for _ in range(3000)])
+        self.assertEqual(set(samples), {1, 2, 3})
+
+        self.assertRaises(ValueError, ciw.routing.JoinShortestQueue, [1, 2, 3], sample_size=4)
+        self.assertRaises(ValueError, ciw.routing.JoinShortestQueue, [1, 2, 3], sample_size=0)
+        self.assertRaises(ValueError, ciw.routing.JoinShortestQueue, [1, 2, 3], sample_size=1.5)
+        self.assertRaises(ValueError, ciw.routing.JoinShortestQueue, [1, 2, 3], sample_size=2, indexed=True)
+        self.assertRaises(ValueError, ciw.routing.JoinShortestQueue, [1, 2, 3], tie_break="first")
+
     def test_load_balancing(self):
         ciw.seed(0)
         Q = ciw.Simulation(N)
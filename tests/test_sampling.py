@@ -1,6 +1,7 @@
 import unittest
 import ciw
 import math
+import copy
 from math import sqrt, exp, pi, erf
 import numpy as np
 import statistics as st
@@ -9,6 +10,7 @@ from random import random, choice
 from hypothesis import given
 from hypothesis.strategies import floats, integers, lists, random_module, text
 import os
+import tempfile
 import tqdm
 
 
@@ -753,6 +755,91 @@ class TestSampling(unittest.TestCase):
         self.assertEqual(E.median, 7.0) 
         self.assertEqual(E.mean, 7.0) 
 
+    def test_trace_dist_object(self):
+        T = ciw.dists.Trace(np.array([0.2, 0.4, 0.6]))
+        self.assertEqual(str(T), "Trace")
+        self.assertEqual([T.sample() for _ in range(5)], [0.2, 0.4, 0.6, 0.2, 0.4])
+        T = ciw.dists.Trace(np.array([0.2, 0.4, 0.6]), cycle=False, chunk_size=2)
+        self.assertEqual([T._sample() for _ in range(5)], [0.2, 0.4, 0.6, float("inf"), float("inf")])
+        self.assertRaises(ValueError, ciw.dists.Trace, np.array([]))
+        self.assertRaises(ValueError, ciw.dists.Trace, np.zeros(3, dtype=[("a", float), ("b", float)]))
+        T = ciw.dists.Trace(np.array([0.2, -0.4]))
+        self.assertRaises(ValueError, T.sample)
+        T = ciw.dists.Trace(np.array([0.2, 0.1]), timestamps=True)
+        self.assertRaises(ValueError, T.sample)
+
+    def test_sampling_trace_dist(self):
+        values = np.array([0.5, 1.0, 1.2, 3.0, 3.1, 6.0])
+        for chunk_size in [1, 4, 6, 100]:
+            T = ciw.dists.Trace(values, chunk_size=chunk_size)
+            self.assertEqual([T.sample() for _ in range(8)], [0.5, 1.0, 1.2, 3.0, 3.1, 6.0, 0.5, 1.0])
+            T = ciw.dists.Trace(values, timestamps=True, chunk_size=chunk_size)
+            samples = [T.sample() for _ in range(8)]
+            self.assertEqual([round(s, 8) for s in samples], [0.5, 0.5, 0.2, 1.8, 0.1, 2.9, 0.5, 0.5])
+            T = ciw.dists.Trace(values, chunk_size=chunk_size)
+            T.sample()
+            self.assertEqual(list(T.sample_many(3)), [1.0, 1.2, 3.0])
+            self.assertEqual(T.sample(), 3.1)
+            self.assertEqual(list(T.sample_many(4)), [6.0, 0.5, 1.0, 1.2])
+            T = ciw.dists.Trace(values, cycle=False, chunk_size=chunk_size)
+            self.assertEqual(list(T.sample_many(8)), [0.5, 1.0, 1.2, 3.0, 3.1, 6.0, float("inf"), float("inf")])
+        self.assertEqual(list(values), [0.5, 1.0, 1.2, 3.0, 3.1, 6.0])
+
+    def test_sampling_trace_dist_from_file(self):
+        trace = np.zeros(4, dtype=[("arrival", float), ("handle_time", float), ("agent", int)])
+        trace["arrival"] = [0.5, 1.0, 1.2, 3.0]
+        trace["handle_time"] = [0.4, 0.3, 1.0, 0.2]
+        trace["agent"] = [7, 3, 5, 1]
+
+        class HandleTime(ciw.dists.Distribution):
+            def sample(self, t=None, ind=None):
+                return ind.handle_time
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "calls.npy")
+            np.save(filename, trace)
+            T = ciw.dists.Trace(filename, column="arrival", attributes=["handle_time", "agent"], timestamps=True, cycle=False, chunk_size=3)
+            self.assertEqual(str(T), f"Trace({filename})")
+            N = ciw.create_network(
+                arrival_distributions=[T],
+                service_distributions=[HandleTime()],
+                number_of_servers=[1],
+            )
+            Q = ciw.Simulation(N)
+            self.assertIsInstance(Q.inter_arrival_times[1]["Customer"].values, np.memmap)
+            Q.simulate_until_max_time(10)
+            recs = sorted(Q.get_all_records(), key=lambda r: r.id_number)
+            self.assertEqual([r.arrival_date for r in recs], [0.5, 1.0, 1.2, 3.0])
+            self.assertEqual([round(r.service_time, 8) for r in recs], [0.4, 0.3, 1.0, 0.2])
+            self.assertEqual(
+                sorted((ind.id_number, ind.agent) for ind in Q.nodes[-1].all_individuals),
+                [(1, 7), (2, 3), (3, 5), (4, 1)],
+            )
+
+            np.save(filename, np.array([[0.1, 2.0], [0.3, 4.0], [0.2, 6.0]]))
+            N = ciw.create_network(
+                arrival_distributions=[ciw.dists.Trace(filename, column=0)],
+                service_distributions=[ciw.dists.Trace(filename, column=0, attributes={"size": 1})],
+                number_of_servers=[float("inf")],
+            )
+            Q = ciw.Simulation(N)
+            Q.simulate_until_max_time(1.0)
+            inds = sorted(Q.nodes[-1].all_individuals, key=lambda ind: ind.id_number)
+            self.assertEqual([ind.size for ind in inds], [2.0, 4.0, 6.0, 2.0])
+            del Q, N, T
+
+    def test_trace_summary_stats(self):
+        T = ciw.dists.Trace(np.array([0.9, 0.7, 0.5, 0.3, 0.1]), chunk_size=2)
+        self.assertAlmostEqual(T.mean, 0.5)
+        self.assertAlmostEqual(T.variance, 0.08)
+        self.assertTrue(math.isnan(T.median))
+        self.assertEqual(T.upper_limit, 0.9)
+        self.assertEqual(T.lower_limit, 0.1)
+        T = ciw.dists.Trace(np.array([0.5, 1.0, 1.2, 3.0]), timestamps=True, chunk_size=3)
+        self.assertAlmostEqual(T.mean, 0.75)
+        self.assertAlmostEqual(T.upper_limit, 1.8)
+        self.assertAlmostEqual(T.lower_limit, 0.2)
+
     def test_pmf_object(self):
         Pmf = ciw.dists.Pmf([3.7, 3.8, 4.1], [0.2, 0.5, 0.3])
         ciw.seed(5)
@@ -1812,11 +1899,13 @@ class TestSampling(unittest.TestCase):
         expected = [0.0928, 0.2694, 0.4268, 0.701, 0.011, 0.239, 0.0966, 0.1567, 0.0834, 0.291,]
         self.assertEqual(samples, expected)
 
-        expected_dates = [0]
+        expected_dates = [Pi.last_date]
         for t in Pi.inter_arrivals:
             expected_dates.append(expected_dates[-1] + t)
         self.assertEqual(Pi.dates, expected_dates[:-1])
         self.assertLessEqual(Pi.dates[-1], Pi.max_sample_date)
+        self.assertEqual(round(Pi.dates[1] - Pi.dates[0], 4), 0.006)
+        self.assertEqual(round(Pi._sample(), 4), 0.006)
 
         self.assertRaises(
             ValueError,
@@ -1861,6 +1950,37 @@ class TestSampling(unittest.TestCase):
             15
         )
 
+    def test_poissoninterval_sampled_lazily(self):
+        Pi = ciw.dists.PoissonIntervals(
+            rates=[50, 20], endpoints=[1, 2], max_sample_date=10 ** 9
+        )
+        self.assertEqual(Pi.interval_dates, [])
+        self.assertIsNone(Pi.interval)
+        Pi.seed(3)
+        date = 0.0
+        for _ in range(1000):
+            date += Pi.sample()
+            self.assertLessEqual(len(Pi.interval_dates), 150)
+            self.assertTrue(Pi.interval[0] <= date <= Pi.interval[1])
+        self.assertEqual(Pi.last_date, date)
+
+        Q = copy.deepcopy(Pi)
+        self.assertEqual([Q.sample() for _ in range(50)], [Pi.sample() for _ in range(50)])
+
+        Pi.seed(3)
+        Sq = ciw.dists.PoissonIntervals(rates=[50, 20], endpoints=[1, 2], max_sample_date=30)
+        Sq.seed(3)
+        dates = Sq.dates
+        self.assertEqual(Sq.last_date, 0.0)
+        self.assertEqual(len(dates), len(Sq.inter_arrivals))
+        samples = [Pi.sample() for _ in range(len(dates) - 1)]
+        self.assertEqual(samples, Sq.inter_arrivals[:-1])
+        self.assertEqual([Sq.sample() for _ in range(len(dates) - 1)], samples)
+        self.assertEqual(Sq.sample(), float("inf"))
+        self.assertEqual(Sq.sample(), float("inf"))
+        self.assertEqual(Sq.dates, [dates[-1]])
+        self.assertEqual(list(Sq.sample_many(2)), [float("inf"), float("inf")])
+
     def test_poissoninterval_rate_zero(self):
         ciw.seed(5)
         Pi = ciw.dists.PoissonIntervals(
@@ -2064,7 +2184,7 @@ class TestSampling(unittest.TestCase):
             round(Nt.simulation.service_times[Nt.id_number]['Customer']._sample(), 4)
             for _ in range(10)
         ]
-        expected = [0.0108, 0.0623, 0.1092, 0.026, 0.2578, 0.0648, 0.4333, 0.0275, 0.0187, 0.0707,]
+        expected = [0.042, 0.4688, 0.1828, 0.2008, 1.556, 0.1005, 0.3814, 0.276, 0.5871, 0.0567]
         self.assertEqual(samples, expected)
 
         samples = [
@@ -2119,6 +2239,118 @@ class TestSampling(unittest.TestCase):
         self.assertTrue(math.isinf(Pi.upper_limit))
         self.assertEqual(Pi.lower_limit, 0.0)
 
+    def test_piecewise_dist_object(self):
+        Pw = ciw.dists.Piecewise(
+            distributions=[
+                ciw.dists.Deterministic(0.5),
+                ciw.dists.Deterministic(0.25),
+                ciw.dists.Deterministic(0.75),
+                ciw.dists.Deterministic(1.5),
+            ],
+            breakpoints=[12, 14, 20],
+            cycle_length=24,
+        )
+        self.assertEqual(str(Pw), "Piecewise")
+        dates = [0.0, 9.5, 12.0, 13.25, 14.0, 17.0, 22.0, 24.0, 33.2, 60.5]
+        self.assertEqual([Pw._sample(t) for t in dates], [0.5, 0.5, 0.25, 0.25, 0.75, 0.75, 1.5, 0.5, 0.5, 0.25])
+        self.assertEqual(Pw.sample(), 0.5)
+        self.assertEqual(Pw.upper_limit, 1.5)
+        self.assertEqual(Pw.lower_limit, 0.25)
+        self.assertTrue(math.isnan(Pw.mean))
+
+        Pw = ciw.dists.Piecewise([ciw.dists.Deterministic(2.0), ciw.dists.Deterministic(3.0)], [10])
+        self.assertEqual([Pw.sample(t) for t in [0.0, 9.9, 10.0, 1000.0]], [2.0, 2.0, 3.0, 3.0])
+        Pw = ciw.dists.Piecewise([ciw.dists.Deterministic(2.0)], [], cycle_length=5)
+        self.assertEqual(Pw.sample(17.0), 2.0)
+
+        self.assertRaises(ValueError, ciw.dists.Piecewise, [ciw.dists.Deterministic(1)], [3])
+        self.assertRaises(ValueError, ciw.dists.Piecewise, [ciw.dists.Deterministic(1)] * 2, [-3])
+        self.assertRaises(ValueError, ciw.dists.Piecewise, [ciw.dists.Deterministic(1)] * 3, [3, 3])
+        self.assertRaises(ValueError, ciw.dists.Piecewise, [ciw.dists.Deterministic(1)] * 3, [3, 5], 5)
+        self.assertRaises(ValueError, ciw.dists.Piecewise, [ciw.dists.Deterministic(1)], [], 0)
+
+    def test_piecewise_samples_in_chunks(self):
+        Ex = ciw.dists.Exponential(2.0)
+        Em = ciw.dists.Empirical([1, 2, 3])
+        Pw = ciw.dists.Piecewise([Ex, Em], [5])
+        self.assertIsNot(Pw.distributions[0], Ex)
+        self.assertEqual(Pw.chunked, [False, False])
+        Pw.seed(3)
+        Ex.seed(ciw.derive_seed(3, 0))
+        Em.seed(ciw.derive_seed(3, 1))
+        self.assertEqual([Pw.sample(1.0) for _ in range(20)], [Ex.sample() for _ in range(20)])
+        integers = [Pw.sample(7.0) for _ in range(20)]
+        self.assertEqual(integers, [Em.sample() for _ in range(20)])
+        self.assertTrue(all(isinstance(s, int) for s in integers))
+
+        Pw = ciw.dists.Piecewise([Ex, ciw.dists.Poisson(2.0)], [5], chunk_size=100)
+        self.assertEqual(Pw.chunked, [True, False])
+        Pw.seed(3)
+        samples = [Pw.sample(1.0) for _ in range(250)]
+        Ex.seed(ciw.derive_seed(3, 0))
+        self.assertEqual(samples, list(Ex.sample_many(100)) + list(Ex.sample_many(100)) + list(Ex.sample_many(50)))
+        self.assertTrue(all(isinstance(s, float) for s in samples))
+        self.assertEqual(Pw.buffer_indices[0], 50)
+        self.assertTrue(all(isinstance(Pw.sample(7.0), int) for _ in range(20)))
+        Pw.seed(3)
+        self.assertEqual([Pw.sample(1.0) for _ in range(250)], samples)
+
+        Pw.seed(3, antithetic=True)
+        self.assertEqual(Pw.chunked, [False, False])
+        Ex.seed(ciw.derive_seed(3, 0), antithetic=True)
+        self.assertEqual([Pw.sample(1.0) for _ in range(20)], [Ex.sample() for _ in range(20)])
+
+        Tr = ciw.dists.Trace(np.array([[1.0, 7.0], [2.0, 8.0]]), attributes={"size": 1})
+        self.assertFalse(Pw.can_sample_in_chunks(Tr))
+        self.assertTrue(Pw.can_sample_in_chunks(ciw.dists.Trace(np.array([1.0, 2.0]))))
+
+    def test_piecewise_antithetic(self):
+        P1 = ciw.dists.Piecewise([ciw.dists.Exponential(2.0), ciw.dists.Exponential(1.0)], [5])
+        P2 = ciw.dists.Piecewise([ciw.dists.Exponential(2.0), ciw.dists.Exponential(1.0)], [5])
+        P1.seed(5)
+        P2.seed(5, antithetic=True)
+        samples1 = [P1.sample(t % 10) for t in range(1000)]
+        samples2 = [P2.sample(t % 10) for t in range(1000)]
+        self.assertLess(st.correlation(samples1, samples2), -0.5)
+
+    def test_sampling_piecewise_dist(self):
+        class TimeDependentDist(ciw.dists.Distribution):
+            def sample(self, t, ind=None):
+                if t % 10 < 4.0:
+                    return 1.0
+                if t % 10 < 7.0:
+                    return 0.25
+                return 0.5
+
+        class TimeDependentBatches(ciw.dists.Distribution):
+            def sample(self, t, ind=None):
+                return 3 if t < 20 else 1
+
+        def make_network(arrivals, batches):
+            return ciw.create_network(
+                arrival_distributions=[arrivals],
+                service_distributions=[ciw.dists.Deterministic(0.3)],
+                batching_distributions=[batches],
+                number_of_servers=[2],
+            )
+
+        Q1 = ciw.Simulation(make_network(TimeDependentDist(), TimeDependentBatches()), seed=0)
+        Q2 = ciw.Simulation(
+            make_network(
+                ciw.dists.Piecewise(
+                    [ciw.dists.Deterministic(1.0), ciw.dists.Deterministic(0.25), ciw.dists.Deterministic(0.5)],
+                    [4.0, 7.0],
+                    cycle_length=10,
+                ),
+                ciw.dists.Piecewise([ciw.dists.Deterministic(3), ciw.dists.Deterministic(1)], [20]),
+            ),
+            seed=0,
+        )
+        Q1.simulate_until_max_time(50)
+        Q2.simulate_until_max_time(50)
+        self.assertEqual(Q1.get_all_records(), Q2.get_all_records())
+        self.assertEqual(len(Q2.get_all_records()), 195)
+
     def test_geometric_dist_object(self):
         Ge = ciw.dists.Geometric(0.3)
         ciw.seed(5)
@@ -2273,3 +2505,74 @@ class TestSampling(unittest.TestCase):
             ciw.seed(0)
             D, n, places = params
             compare_theoretical_to_observed(D=D, n=n, places=places, self=self)
+
+    def test_sample_many(self):
+        ciw.seed(0)
+        dists = [
+            (ciw.dists.Uniform(2.2, 3.3), 2),
+            (ciw.dists.Deterministic(4.4), 7),
+            (ciw.dists.Triangular(1.1, 2.2, 6.6), 2),
+            (ciw.dists.Triangular(1.5, 1.5, 1.5), 7),
+            (ciw.dists.Exponential(4.4), 2),
+            (ciw.dists.Gamma(0.6, 1.2), 1),
+            (ciw.dists.Normal(0.5, 1.0), 1),
+            (ciw.dists.Lognormal(0.8, 0.2), 1),
+            (ciw.dists.Weibull(0.9, 0.8), 1),
+            (ciw.dists.Empirical([8.0, 8.0, 8.0, 8.8, 8.8, 12.3]), 1),
+            (ciw.dists.Sequential([0.2, 0.4, 0.6, 0.8]), 7),
+            (ciw.dists.Trace(np.array([0.2, 0.4, 0.6, 0.8]), chunk_size=3), 7),
+            (ciw.dists.Pmf([3.7, 3.8, 4.1], [0.2, 0.5, 0.3]), 1),
+            (ciw.dists.Erlang(5, 3), 1),
+        ]
+        for D, places in dists:
+            samples = D.sample_many(20000)
+            self.assertEqual(samples.shape, (20000,))
+            self.assertTrue((samples >= 0).all())
+            self.assertAlmostEqual(samples.mean(), D.mean, places=places)
+
+        self.assertFalse(hasattr(ciw.dists.Poisson(1.5), "sample_many"))
+        self.assertEqual(list(ciw.dists.Sequential([0.2, 0.4, 0.6]).sample_many(4)), [0.2, 0.4, 0.6, 0.2])
+
+    def test_seeded_distributions(self):
+        dists = [
+            lambda: ciw.dists.Uniform(2.2, 3.3),
+            lambda: ciw.dists.Exponential(4.4),
+            lambda: ciw.dists.Gamma(0.6, 1.2),
+            lambda: ciw.dists.Normal(0.5, 1.0),
+            lambda: ciw.dists.Lognormal(0.8, 0.2),
+            lambda: ciw.dists.Weibull(0.9, 0.8),
+            lambda: ciw.dists.Empirical([8.0, 8.0, 8.8, 12.3]),
+            lambda: ciw.dists.Pmf([3.7, 3.8, 4.1], [0.2, 0.5, 0.3]),
+            lambda: ciw.dists.Erlang(5, 3),
+            lambda: ciw.dists.Binomial(10, 0.3),
+            lambda: ciw.dists.Poisson(1.5),
+            lambda: ciw.dists.Geometric(0.3),
+            lambda: ciw.dists.Exponential(1.0) + ciw.dists.Uniform(0.1, 0.2),
+            lambda: ciw.dists.MixtureDistribution([ciw.dists.Exponential(1.0), ciw.dists.Gamma(2, 1)], [0.4, 0.6]),
+            lambda: ciw.dists.PoissonIntervals([2, 3], [1, 2], 20),
+        ]
+        for make in dists:
+            D1, D2 = make(), make()
+            D1.seed(7)
+            ciw.seed(0)
+            samples1 = [D1.sample() for _ in range(20)]
+            D2.seed(7)
+            ciw.seed(1)
+            samples2 = [D2.sample() for _ in range(20)]
+            self.assertEqual(samples1, samples2)
+
+        # Seeding leaves the global streams untouched
+        ciw.seed(3)
+        r1, n1 = random(), ciw.rng.random()
+        ciw.seed(3)
+        D = ciw.dists.Gamma(0.6, 1.2)
+        D.seed(7)
+        D.sample(), D.sample_many(5)
+        self.assertEqual((r1, n1), (random(), ciw.rng.random()))
+
+        # Distributions that are not seeded use the global streams
+        D = ciw.dists.Exponential(2.0)
+        ciw.seed(3)
+        s1 = D.sample()
+        ciw.seed(3)
+        self.assertEqual(s1, D.sample())
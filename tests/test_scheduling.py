@@ -3,6 +3,7 @@ import ciw
 from decimal import Decimal
 from collections import Counter
 import math
+import pickle
 
 N_schedule = ciw.create_network(
     arrival_distributions={
@@ -178,6 +179,34 @@ class TestScheduling(unittest.TestCase):
             ],
         )
 
+    def test_servers_are_reused_after_shift_changes(self):
+        class CountedServer(ciw.Server):
+            number_created = 0
+
+            def __new__(cls, *args, **kwargs):
+                cls.number_created += 1
+                return super().__new__(cls)
+
+        N = ciw.create_network(
+            arrival_distributions=[ciw.dists.Exponential(4.0)],
+            service_distributions=[ciw.dists.Exponential(1.0)],
+            number_of_servers=[ciw.Schedule(numbers_of_servers=[5, 3, 6], shift_end_dates=[1.0, 2.0, 3.0])],
+        )
+        ciw.seed(0)
+        Q = ciw.Simulation(N, server_class=CountedServer)
+        Q.simulate_until_max_time(60)
+        node = Q.transitive_nodes[0]
+        self.assertGreater(node.highest_id, 150)
+        self.assertLess(CountedServer.number_created, 40)
+        self.assertEqual(node.number_of_killed_servers, node.highest_id - len(node.servers))
+        self.assertEqual([s.id_number for s in node.servers], sorted(s.id_number for s in node.servers))
+        self.assertTrue(all(not s.killed for s in node.servers))
+
+        self.assertEqual(round(node.server_utilisation, 8), 0.56307993)
+        utilisation = node.server_utilisation
+        node.find_server_utilisation()
+        self.assertEqual(node.server_utilisation, utilisation)
+
     def test_take_servers_off_duty_preempt_method(self):
         N = N_schedule
         N.service_centres[0].number_of_servers.preemption = 'resample'
@@ -310,8 +339,9 @@ class TestScheduling(unittest.TestCase):
         Q.simulate_until_max_time(19.0)
 
         nd = Q.transitive_nodes[0]
-        self.assertEqual(nd.overtime, [0.0, 1.0, 3.0, 2.0, 3.0])
-        self.assertEqual(sum(nd.overtime) / len(nd.overtime), 1.8)
+        self.assertEqual(nd.killed_servers_overtime, 9.0)
+        self.assertEqual(nd.number_of_killed_servers, 5)
+        self.assertEqual(nd.killed_servers_overtime / nd.number_of_killed_servers, 1.8)
 
     def test_overtime_exact(self):
         N = ciw.create_network(
@@ -323,17 +353,10 @@ class TestScheduling(unittest.TestCase):
         Q.simulate_until_max_time(19.0)
 
         nd = Q.transitive_nodes[0]
-        self.assertEqual(
-            nd.overtime,
-            [
-                Decimal("0.0"),
-                Decimal("1.0"),
-                Decimal("3.0"),
-                Decimal("2.0"),
-                Decimal("3.0"),
-            ],
-        )
-        self.assertEqual(sum(nd.overtime) / len(nd.overtime), Decimal("1.8"))
+        self.assertEqual(nd.killed_servers_overtime, Decimal("9.0"))
+        self.assertIsInstance(nd.killed_servers_overtime, Decimal)
+        self.assertEqual(nd.number_of_killed_servers, 5)
+        self.assertEqual(nd.killed_servers_overtime / nd.number_of_killed_servers, Decimal("1.8"))
 
     def test_preemptive_schedules_resume_options(self):
         """
@@ -745,6 +768,76 @@ class TestScheduling(unittest.TestCase):
         observed_service_dates = [r.service_start_date for r in recs]
         self.assertEqual(observed_service_dates, expected_service_dates)
 
+    def test_interrupted_queue(self):
+        """
+        Tests that interrupted individuals restart service in order of
+        priority class then arrival date, including when some are
+        blocked and released before restarting service.
+        """
+        N = ciw.create_network(
+            arrival_distributions={
+                "Class 0": [ciw.dists.Exponential(1.0), None],
+                "Class 1": [ciw.dists.Exponential(2.0), None],
+            },
+            service_distributions={
+                "Class 0": [ciw.dists.Exponential(1.0), ciw.dists.Exponential(0.5)],
+                "Class 1": [ciw.dists.Exponential(1.0), ciw.dists.Exponential(0.5)],
+            },
+            number_of_servers=[
+                ciw.Schedule(numbers_of_servers=[4, 1, 3, 0], shift_end_dates=[3, 4, 7, 8], preemption="resume"),
+                1,
+            ],
+            queue_capacities=[float("inf"), 1],
+            routing={"Class 0": [[0.0, 0.5], [0.0, 0.0]], "Class 1": [[0.0, 0.5], [0.0, 0.0]]},
+            priority_classes={"Class 0": 0, "Class 1": 1},
+        )
+        ciw.seed(0)
+        Q = ciw.Simulation(N)
+        node = Q.transitive_nodes[0]
+        number_blocked_while_interrupted = 0
+        for event in Q.iter_events(200):
+            interrupted = [ind for ind in node.all_individuals if ind.interrupted]
+            expected = sorted(interrupted, key=lambda ind: (ind.priority_class, ind.arrival_date))
+            self.assertEqual(node.interrupted_individuals, expected)
+            self.assertEqual(node.number_interrupted_individuals, len(expected))
+            number_blocked_while_interrupted += any(ind.is_blocked for ind in interrupted)
+        self.assertGreater(number_blocked_while_interrupted, 0)
+        self.assertGreater(len(Q.get_all_records(only=["interrupted service"])), 0)
+        self.assertEqual(Q.transitive_nodes[1].interrupted_queue, [])
+
+        ind1, ind2, ind3 = ciw.Individual(1, priority_class=1), ciw.Individual(2), ciw.Individual(3)
+        Q = ciw.Simulation(N)
+        node = Q.transitive_nodes[0]
+        for ind, arrival_date in [(ind1, 1.0), (ind2, 3.0), (ind3, 2.0)]:
+            ind.arrival_date = arrival_date
+            ind.interrupted = True
+            node.push_interrupted_individual(ind)
+        self.assertEqual(node.interrupted_individuals, [ind3, ind2, ind1])
+        ind3.interrupted = False
+        node.number_interrupted_individuals -= 1
+        self.assertEqual(node.interrupted_individuals, [ind2, ind1])
+        self.assertEqual(node.pop_interrupted_individual(), ind2)
+        self.assertEqual((node.number_interrupted_individuals, node.interrupted_individuals), (1, [ind1]))
+
+    def test_interrupted_individuals_only_for_inspection(self):
+        """
+        Tests that the simulation never sorts the interrupted queue through
+        the interrupted_individuals property.
+        """
+        class UninspectedNode(ciw.Node):
+            @property
+            def interrupted_individuals(self):
+                raise AssertionError("interrupted_individuals used by the simulation")
+
+        N = ciw.create_network(
+            arrival_distributions=[ciw.dists.Exponential(2.0)],
+            service_distributions=[ciw.dists.Exponential(1.0)],
+            number_of_servers=[ciw.Schedule(numbers_of_servers=[4, 1], shift_end_dates=[3, 4], preemption="resume")],
+        )
+        Q = ciw.Simulation(N, node_class=UninspectedNode, seed=1)
+        Q.simulate_until_max_time(100)
+        self.assertGreater(len(Q.get_all_records(only=["interrupted service"])), 0)
+
     def test_invalid_preemption_options(self):
         self.assertRaises(ValueError, lambda: ciw.Schedule(numbers_of_servers=[2, 1], shift_end_dates=[10, 12], preemption='something'))
         self.assertRaises(ValueError, lambda: ciw.Slotted(slots=[2, 3], slot_sizes=[4, 1], capacitated=False, preemption='resume'))
@@ -930,3 +1023,62 @@ class TestScheduling(unittest.TestCase):
         expected_service_dates = [0.5, 20.5, 20.5, 20.5, 20.5, 20.5, 20.5, 30.5, 50.5, 50.5]
         self.assertEqual(expected_service_dates, [r.service_start_date for r in recs])
 
+
+    def test_schedule_timelines(self):
+        for offset in [0.0, 7.5]:
+            S = ciw.Schedule(numbers_of_servers=[2, 0, 1, 3], shift_end_dates=[10, 30, 35, 100], offset=offset)
+            S.initialise()
+            changes = [(S.next_shift_change_date, S.next_c)]
+            for _ in range(60):
+                S.get_next_shift()
+                changes.append((S.next_shift_change_date, S.next_c))
+            self.assertEqual([S.get_change(i) for i in range(61)], changes)
+
+            for date in [0.0, 5.0, 7.5, 10.0, 17.5, 99.0, 107.5, 250.0, 1234.5]:
+                index = S.find_next_change_index(date)
+                self.assertGreater(changes[index][0], date)
+                if index > 0:
+                    self.assertLessEqual(changes[index - 1][0], date)
+                self.assertEqual(S.get_next_change_after(date), changes[index])
+
+            S = ciw.Slotted(slots=[1.5, 2, 3, 4], slot_sizes=[3, 2, 5, 3], offset=offset)
+            S.initialise()
+            slots = [(S.next_slot_date, S.slot_size)]
+            for _ in range(60):
+                S.get_next_slot()
+                slots.append((S.next_slot_date, S.slot_size))
+            self.assertEqual([S.get_change(i) for i in range(61)], slots)
+
+            for date in [0.0, 1.5, 2.7, 4.0, 7.5, 9.0, 13.2]:
+                index = S.find_next_change_index(date)
+                self.assertGreater(slots[index][0], date)
+                if index > 0:
+                    self.assertLessEqual(slots[index - 1][0], date)
+                self.assertEqual(S.get_next_change_after(date), slots[index])
+
+    def test_schedules_shared_across_nodes(self):
+        def make_network(schedules):
+            return ciw.create_network(
+                arrival_distributions=[ciw.dists.Exponential(1), ciw.dists.Exponential(1), ciw.dists.Exponential(1)],
+                service_distributions=[ciw.dists.Exponential(0.5), ciw.dists.Exponential(0.5), ciw.dists.Exponential(0.5)],
+                number_of_servers=schedules,
+                routing=[[0.0, 0.3, 0.3], [0.0, 0.0, 0.5], [0.2, 0.0, 0.0]],
+            )
+
+        def make_schedule():
+            return ciw.Schedule(numbers_of_servers=[3, 1, 2], shift_end_dates=[10, 25, 40], preemption='resume')
+
+        roster = make_schedule()
+        shared = make_network([roster, roster, roster])
+        separate = make_network([make_schedule(), make_schedule(), make_schedule()])
+
+        Q1 = ciw.Simulation(shared, seed=3)
+        Q1.simulate_until_max_time(200)
+        Q2 = ciw.Simulation(separate, seed=3)
+        Q2.simulate_until_max_time(200)
+        self.assertEqual(Q1.get_all_records(), Q2.get_all_records())
+        self.assertEqual([nd.schedule_index for nd in Q1.transitive_nodes], [15, 15, 15])
+
+        copied = pickle.loads(pickle.dumps(roster))
+        self.assertEqual(copied.get_change(15), roster.get_change(15))
+        self.assertEqual(copied.find_next_change_index(37.5), roster.find_next_change_index(37.5))
@@ -9,6 +9,8 @@ import csv
 from itertools import cycle
 import types
 import math
+import random
+import numpy as np
 
 N_params = ciw.create_network(
     arrival_distributions={
@@ -1306,6 +1308,50 @@ class TestSimulation(unittest.TestCase):
             [24.5, 26.0, 47.0, 47.5],
         )
 
+    def test_baulking_tables(self):
+        """
+        Baulking tables give the same results as the equivalent baulking
+        functions, with the last entry holding for larger numbers of
+        customers. They may be given as lists, tuples or NumPy arrays.
+        """
+        def make_network(baulking_functions):
+            return ciw.create_network(
+                arrival_distributions={
+                    "A": [ciw.dists.Exponential(3.0), None],
+                    "B": [ciw.dists.Exponential(1.0), ciw.dists.Exponential(2.0)],
+                },
+                service_distributions={
+                    "A": [ciw.dists.Exponential(2.0), ciw.dists.Exponential(3.0)],
+                    "B": [ciw.dists.Exponential(2.0), ciw.dists.Exponential(3.0)],
+                },
+                routing={"A": [[0.0, 0.5], [0.0, 0.0]], "B": [[0.0, 0.5], [0.0, 0.0]]},
+                number_of_servers=[1, 2],
+                baulking_functions=baulking_functions,
+            )
+
+        def baulk_a(n, Q=None, next_ind=None, next_node=None):
+            return min(n / 10, 1.0)
+
+        def baulk_b(n, Q=None, next_ind=None, next_node=None):
+            return 0.0 if n < 2 else 0.3
+
+        tables = {
+            "A": [[n / 10 for n in range(11)], None],
+            "B": [(0.0, 0.0, 0.3), np.array([0.0, 0.0, 0.3])],
+        }
+        functions = {"A": [baulk_a, None], "B": [baulk_b, baulk_b]}
+        results = []
+        for baulking_functions in [tables, functions]:
+            Q = ciw.Simulation(make_network(baulking_functions), seed=8)
+            Q.simulate_until_max_time(500)
+            results.append(Q.get_all_records())
+        self.assertEqual(results[0], results[1])
+        self.assertGreater(len([r for r in results[0] if r.record_type == "baulk" and r.node == 2]), 10)
+        self.assertEqual(Q.transitive_nodes[1].baulking_tables, {})
+        Q = ciw.Simulation(make_network(tables))
+        self.assertEqual(Q.transitive_nodes[1].baulking_tables, {"B": [0.0, 0.0, 0.3]})
+        self.assertIsInstance(Q.transitive_nodes[1].baulking_tables["B"][2], float)
+
     def test_state_dependent_baulking(self):
         def my_baulking_function(n, Q, next_ind=None, next_node=None):
             total_population = sum(node.number_of_individuals for node in Q.transitive_nodes)
@@ -1837,6 +1883,132 @@ class TestSimulation(unittest.TestCase):
         self.assertEqual([r.destination for r in nd_2], [-1])
         self.assertEqual([r.record_type for r in nd_2], ['service'])
 
+    def test_seed_gives_reproducible_results(self):
+        N = ciw.create_network(
+            arrival_distributions=[ciw.dists.Exponential(3.0), ciw.dists.Exponential(1.0)],
+            service_distributions=[ciw.dists.Exponential(4.0), ciw.dists.Gamma(2, 0.2)],
+            routing=[[0.2, 0.5], [0.3, 0.1]],
+            number_of_servers=[1, 2],
+            reneging_time_distributions=[ciw.dists.Exponential(0.5), None],
+            baulking_functions=[lambda n, Q, next_ind, next_node: 0.1 * n, None],
+        )
+        results = []
+        for z in [0, 1]:
+            ciw.seed(z)
+            Q = ciw.Simulation(N, seed=12)
+            Q.simulate_until_max_time(100)
+            results.append(Q.get_all_records(only=["service", "baulk", "renege"]))
+        self.assertEqual(results[0], results[1])
+
+        Q = ciw.Simulation(N, seed=13)
+        Q.simulate_until_max_time(100)
+        self.assertNotEqual(Q.get_all_records(only=["service", "baulk", "renege"]), results[0])
+
+        # Later unseeded simulations use the global streams again
+        ciw.seed(5)
+        Q = ciw.Simulation(N)
+        Q.simulate_until_max_time(100)
+        recs = Q.get_all_records()
+        self.assertIs(N.customer_classes["Customer"].routing.routers[0].rng, random)
+        self.assertIs(Q.rng, random)
+        ciw.seed(5)
+        Q = ciw.Simulation(N)
+        Q.simulate_until_max_time(100)
+        self.assertEqual(recs, Q.get_all_records())
+
+    def test_seed_gives_common_random_numbers(self):
+        def arrivals_and_services(number_of_servers, baulking_functions):
+            N = ciw.create_network(
+                arrival_distributions=[ciw.dists.Exponential(3.0)],
+                service_distributions=[ciw.dists.Exponential(4.0)],
+                number_of_servers=[number_of_servers],
+                baulking_functions=baulking_functions,
+            )
+            Q = ciw.Simulation(N, seed=3)
+            Q.simulate_until_max_time(200)
+            recs = Q.get_all_records(only=["service", "baulk"])
+            arrivals = sorted((r.id_number, r.arrival_date) for r in recs if r.arrival_date < 150)
+            services = {r.id_number: round(r.service_time, 10) for r in recs if r.record_type == "service"}
+            return arrivals, services
+
+        arrivals1, services1 = arrivals_and_services(1, None)
+        arrivals2, services2 = arrivals_and_services(2, None)
+        arrivals3, services3 = arrivals_and_services(1, [lambda n, Q, next_ind, next_node: 0.2 * n])
+        self.assertEqual(arrivals1, arrivals2)
+        self.assertEqual(arrivals1, arrivals3)
+        self.assertEqual(
+            {i: services2[i] for i in services1 if i in services2},
+            {i: services1[i] for i in services1 if i in services2},
+        )
+        self.assertGreater(len(services1), len(services3))
+
+    def test_seed_with_class_changes_and_flexible_routing(self):
+        N = ciw.create_network(
+            arrival_distributions={
+                "Adult": [ciw.dists.Exponential(2.0), ciw.dists.Exponential(1.0)],
+                "Child": [ciw.dists.Exponential(1.0), None],
+            },
+            service_distributions={
+                "Adult": [ciw.dists.Exponential(3.0), ciw.dists.Exponential(3.0)],
+                "Child": [ciw.dists.Exponential(3.0), ciw.dists.Exponential(3.0)],
+            },
+            routing={
+                "Adult": ciw.routing.FlexibleProcessBased(lambda ind, simulation: [[1, 2]], rule="any", choice="random"),
+                "Child": ciw.routing.FlexibleProcessBased(lambda ind, simulation: [[1, 2]], rule="any", choice="jsq"),
+            },
+            class_change_time_distributions={
+                "Adult": {"Child": ciw.dists.Exponential(0.5)},
+                "Child": {"Adult": ciw.dists.Exponential(0.5)},
+            },
+            class_change_matrices=[
+                {"Adult": {"Adult": 0.5, "Child": 0.5}, "Child": {"Adult": 0.5, "Child": 0.5}},
+                {"Adult": {"Adult": 0.5, "Child": 0.5}, "Child": {"Adult": 0.5, "Child": 0.5}},
+            ],
+            number_of_servers=[1, 1],
+        )
+        results = []
+        for z in [0, 1]:
+            ciw.seed(z)
+            Q = ciw.Simulation(N, seed=4)
+            Q.simulate_until_max_time(50)
+            results.append(Q.get_all_records())
+        self.assertEqual(results[0], results[1])
+        self.assertIsInstance(N.customer_classes["Adult"].routing.rng, random.Random)
+        self.assertIsNot(Q.class_change_times["Adult"]["Child"], N.customer_classes["Adult"].class_change_time_distributions["Child"])
+
+    def test_seed_with_service_in_random_order(self):
+        N = ciw.create_network(
+            arrival_distributions=[ciw.dists.Exponential(2.0)],
+            service_distributions=[ciw.dists.Exponential(2.2)],
+            service_disciplines=[ciw.disciplines.SIRO],
+            number_of_servers=[1],
+        )
+        results = []
+        for z in [0, 1]:
+            random.seed(z)
+            Q = ciw.Simulation(N, seed=7)
+            Q.simulate_until_max_time(100)
+            results.append(Q.get_all_records())
+        self.assertEqual(results[0], results[1])
+        self.assertIsInstance(Q.transitive_nodes[0].discipline_rng, random.Random)
+        self.assertNotEqual(
+            [r.id_number for r in results[0]],
+            sorted(r.id_number for r in results[0]),
+        )
+
+    def test_seed_shared_router_once(self):
+        router = ciw.routing.TransitionMatrix([[0.3]])
+        seeds = []
+        router.seed = lambda z, antithetic=False: seeds.append(z)
+        N = ciw.create_network(
+            arrival_distributions={"A": [ciw.dists.Exponential(1.0)], "B": [ciw.dists.Exponential(1.0)]},
+            service_distributions={"A": [ciw.dists.Exponential(2.0)], "B": [ciw.dists.Exponential(2.0)]},
+            routing={"A": router, "B": router},
+            number_of_servers=[1],
+        )
+        ciw.Simulation(N, seed=3)
+        self.assertEqual(seeds, [None, None, ciw.derive_seed(3, "routing", "A")])
+
 
 class TestServiceDisciplines(unittest.TestCase):
     def test_first_in_first_out(self):
@@ -1997,6 +2169,119 @@ class TestServiceDisciplines(unittest.TestCase):
         self.assertEqual(end_dates, [7.14, 7.34, 9.24, 9.44, 12.38, 12.58, 14.48, 14.68])
 
 
+    def test_shortest_processing_time(self):
+        N = ciw.create_network(
+            arrival_distributions=[ciw.dists.Deterministic(1)],
+            service_distributions=[ciw.dists.Sequential([3.5, 2.0, 0.5, 1.0, 0.1])],
+            service_disciplines=[ciw.disciplines.SPT()],
+            number_of_servers=[1],
+        )
+        Q = ciw.Simulation(N)
+        Q.simulate_until_max_time(9)
+        recs = sorted(Q.get_all_records(), key=lambda dr: dr.service_start_date)
+        self.assertEqual([r.id_number for r in recs], [1, 3, 5, 4, 2, 8])
+        self.assertEqual([round(r.service_time, 10) for r in recs], [3.5, 0.5, 0.1, 1.0, 2.0, 0.5])
+        self.assertEqual([round(r.service_end_date, 10) for r in recs], [4.5, 5.0, 5.1, 6.1, 8.1, 8.6])
+
+    def test_earliest_deadline_first(self):
+        deadlines = {"Urgent": 2.0, "Routine": 10.0}
+
+        def set_due_date(node, individual):
+            individual.due_date = node.now + deadlines[individual.customer_class]
+
+        N = ciw.create_network(
+            arrival_distributions={
+                "Urgent": [ciw.dists.Sequential([2.0, float("inf")])],
+                "Routine": [ciw.dists.Sequential([0.5, 0.5, float("inf")])],
+            },
+            service_distributions={
+                "Urgent": [ciw.dists.Deterministic(2.0)],
+                "Routine": [ciw.dists.Deterministic(2.0)],
+            },
+            service_disciplines=[ciw.disciplines.EDF()],
+            number_of_servers=[1],
+        )
+        Q = ciw.Simulation(N)
+        Q.add_hook("on_arrival", set_due_date)
+        Q.simulate_until_max_time(20)
+        recs = sorted(Q.get_all_records(), key=lambda dr: dr.service_start_date)
+        self.assertEqual([r.customer_class for r in recs], ["Routine", "Urgent", "Routine"])
+        self.assertEqual([r.service_start_date for r in recs], [0.5, 2.5, 4.5])
+
+        edf = ciw.disciplines.EDF(due_date=lambda ind: ind.arrival_date)
+        individuals = [ciw.Individual(i) for i in range(3)]
+        for ind, arrival_date in zip(individuals, [4.0, 1.0, 1.0]):
+            ind.arrival_date = arrival_date
+        self.assertIs(edf(individuals, 5.0), individuals[1])
+
+    def test_keyed_disciplines_match_choosing_from_lists(self):
+        """
+        The keyed disciplines, chosen from heaps, serve customers in the same
+        order as choosing the customer with the smallest key from the list of
+        waiting customers, with priorities, reneging, class changes and
+        preemption.
+        """
+        def make_network(discipline, preemption):
+            return ciw.create_network(
+                arrival_distributions={
+                    "A": [ciw.dists.Exponential(1.0), ciw.dists.Exponential(0.5)],
+                    "B": [ciw.dists.Exponential(1.5), None],
+                },
+                service_distributions={
+                    "A": [ciw.dists.Exponential(1.1), ciw.dists.Exponential(2.0)],
+                    "B": [ciw.dists.Uniform(0.1, 1.5), ciw.dists.Exponential(2.0)],
+                },
+                routing={"A": [[0.0, 0.3], [0.2, 0.0]], "B": [[0.0, 0.5], [0.0, 0.0]]},
+                number_of_servers=[2, 1],
+                priority_classes=({"A": 0, "B": 1}, [preemption, preemption]),
+                service_disciplines=[discipline, discipline],
+                reneging_time_distributions={
+                    "A": [None, None],
+                    "B": [ciw.dists.Exponential(0.3), ciw.dists.Exponential(0.3)],
+                },
+                class_change_time_distributions={"B": {"A": ciw.dists.Exponential(0.4)}},
+            )
+
+        class ListSPT:
+            presample_service_time = True
+
+            def __call__(self, individuals, t):
+                return min(individuals, key=lambda ind: ind.presampled_service_time)
+
+        due_date = lambda ind: ind.arrival_date + 2 * ind.id_number % 7
+        cases = [
+            (ciw.disciplines.SPT(), ListSPT(), False),
+            (ciw.disciplines.EDF(due_date), lambda inds, t: min(inds, key=due_date), False),
+            (ciw.disciplines.EDF(due_date), lambda inds, t: min(inds, key=due_date), "resume"),
+            (ciw.disciplines.StaticKey(lambda ind: -ind.id_number), lambda inds, t: max(inds, key=lambda ind: ind.id_number), "restart"),
+        ]
+        for keyed, by_list, preemption in cases:
+            results = []
+            for discipline in [keyed, by_list]:
+                Q = ciw.Simulation(make_network(discipline, preemption), seed=11)
+                Q.simulate_until_max_time(300)
+                results.append(sorted((r.id_number, r.node, r.record_type, r.service_start_date, r.exit_date) for r in Q.get_all_records(only=["service", "renege", "interrupted service"])))
+            self.assertEqual(results[0], results[1])
+            self.assertGreater(len(results[0]), 500)
+
+    def test_keyed_disciplines_with_preemptive_schedules(self):
+        def make_network(discipline):
+            return ciw.create_network(
+                arrival_distributions=[ciw.dists.Exponential(2.0)],
+                service_distributions=[ciw.dists.Exponential(1.5)],
+                number_of_servers=[ciw.Schedule(numbers_of_servers=[2, 0, 1], shift_end_dates=[10, 12, 20], preemption="resume")],
+                service_disciplines=[discipline],
+            )
+
+        due_date = lambda ind: ind.arrival_date % 5
+        results = []
+        for discipline in [ciw.disciplines.EDF(due_date), lambda inds, t: min(inds, key=due_date)]:
+            Q = ciw.Simulation(make_network(discipline), seed=3)
+            Q.simulate_until_max_time(200)
+            results.append(sorted((r.id_number, r.record_type, r.service_start_date, r.exit_date) for r in Q.get_all_records(only=["service", "interrupted service"])))
+        self.assertEqual(results[0], results[1])
+        self.assertIn("interrupted service", [r[1] for r in results[0]])
+
     def test_names_for_customer_classes(self):
         N = ciw.create_network(
             arrival_distributions={
@@ -2024,3 +2309,204 @@ class TestServiceDisciplines(unittest.TestCase):
         self.assertEqual(round(mean_adult_wait, 8), 0.00301455)
         self.assertEqual(round(mean_child_wait, 8), 0.00208601)
 
+
+class TestIterEvents(unittest.TestCase):
+    def test_run_until_resumes_exactly(self):
+        ciw.seed(5)
+        Q = ciw.Simulation(N_params)
+        Q.simulate_until_max_time(20)
+        expected_recs = Q.get_all_records()
+
+        ciw.seed(5)
+        Q = ciw.Simulation(N_params)
+        for t in [3, 7.5, 7.5, 12, 20]:
+            Q.run_until(t)
+            self.assertEqual(Q.current_time, t)
+            self.assertTrue(all(r.exit_date < t for r in Q.get_all_records()))
+        self.assertEqual(Q.get_all_records(), expected_recs)
+
+        Q.run_until(15)
+        self.assertEqual(Q.current_time, 20)
+
+    def test_run_until_resumes_exactly_with_simultaneous_events(self):
+        def make_network():
+            return ciw.create_network(
+                arrival_distributions=[ciw.dists.Deterministic(1.0), ciw.dists.Deterministic(1.0)],
+                service_distributions=[ciw.dists.Deterministic(0.5), ciw.dists.Deterministic(1.0)],
+                number_of_servers=[1, 1],
+                routing=[[0.2, 0.3], [0.3, 0.2]],
+            )
+
+        Q = ciw.Simulation(make_network(), seed=3)
+        Q.run_until(50)
+        expected_recs = Q.get_all_records()
+        self.assertEqual(len(expected_recs), 126)
+
+        for step in [0.25, 0.5, 1.0]:
+            Q = ciw.Simulation(make_network(), seed=3)
+            for i in range(1, int(50 / step) + 1):
+                Q.run_until(i * step)
+            self.assertEqual(Q.get_all_records(), expected_recs)
+
+        Q = ciw.Simulation(make_network(), seed=3)
+        Q.simulate_until_max_time(60)
+        expected_recs = Q.get_all_records()
+        Q = ciw.Simulation(make_network(), seed=3)
+        for t in range(1, 31):
+            Q.run_until(t)
+        Q.simulate_until_max_time(60)
+        self.assertEqual(Q.get_all_records(), expected_recs)
+
+    def test_iter_events(self):
+        N = ciw.create_network(
+            arrival_distributions=[ciw.dists.Deterministic(3.0)],
+            service_distributions=[ciw.dists.Deterministic(2.0)],
+            number_of_servers=[1],
+        )
+        Q = ciw.Simulation(N)
+        events = Q.iter_events(10)
+        self.assertEqual(next(events), (3.0, 0, "arrival"))
+        self.assertEqual(Q.current_time, 3.0)
+        self.assertEqual(len(Q.get_all_records()), 0)
+        self.assertEqual(next(events), (5.0, 1, "end_service"))
+        self.assertEqual(len(Q.get_all_records()), 1)
+        self.assertEqual(
+            list(events),
+            [(6.0, 0, "arrival"), (8.0, 1, "end_service"), (9.0, 0, "arrival")],
+        )
+        self.assertEqual(Q.current_time, 9.0)
+
+        self.assertEqual(list(Q.iter_events(13)), [(11.0, 1, "end_service"), (12.0, 0, "arrival")])
+        self.assertEqual([r.exit_date for r in Q.get_all_records()], [5.0, 8.0, 11.0])
+
+    def test_iter_events_without_arrivals(self):
+        N = ciw.create_network(
+            arrival_distributions=[None],
+            service_distributions=[ciw.dists.Deterministic(2.0)],
+            number_of_servers=[1],
+        )
+        Q = ciw.Simulation(N)
+        self.assertEqual(list(Q.iter_events()), [])
+
+
+class TestHooks(unittest.TestCase):
+    def test_hooks(self):
+        N = ciw.create_network(
+            arrival_distributions=[ciw.dists.Deterministic(1.0), None],
+            service_distributions=[ciw.dists.Deterministic(0.5), ciw.dists.Deterministic(2.4)],
+            routing=[[0.0, 1.0], [0.0, 0.0]],
+            number_of_servers=[1, 1],
+            queue_capacities=[float("inf"), 0],
+            reneging_time_distributions=[ciw.dists.Deterministic(2.2), None],
+        )
+        Q = ciw.Simulation(N)
+        events = []
+        for event in ciw.simulation.HOOK_EVENTS:
+            Q.add_hook(event, lambda node, ind, event=event: events.append((event, node.id_number, ind.id_number, Q.current_time)))
+        Q.simulate_until_max_time(5.2)
+        self.assertEqual(
+            events,
+            [
+                ("on_arrival", 1, 1, 1.0),
+                ("on_service_start", 1, 1, 1.0),
+                ("on_service_end", 1, 1, 1.5),
+                ("on_arrival", 2, 1, 1.5),
+                ("on_service_start", 2, 1, 1.5),
+                ("on_arrival", 1, 2, 2.0),
+                ("on_service_start", 1, 2, 2.0),
+                ("on_service_end", 1, 2, 2.5),
+                ("on_block", 1, 2, 2.5),
+                ("on_arrival", 1, 3, 3.0),
+                ("on_service_end", 2, 1, 3.9),
+                ("on_service_start", 1, 3, 3.9),
+                ("on_arrival", 2, 2, 3.9),
+                ("on_service_start", 2, 2, 3.9),
+                ("on_arrival", 1, 4, 4.0),
+                ("on_service_end", 1, 3, 4.4),
+                ("on_block", 1, 3, 4.4),
+                ("on_arrival", 1, 5, 5.0),
+            ],
+        )
+
+    def test_hooks_at_shift_changes_and_renege(self):
+        N = ciw.create_network(
+            arrival_distributions=[ciw.dists.Sequential([1.0, 0.1, float("inf")])],
+            service_distributions=[ciw.dists.Deterministic(2.0)],
+            number_of_servers=[ciw.Schedule(numbers_of_servers=[1, 0, 1], shift_end_dates=[2.0, 3.0, 10.0], preemption="resume")],
+            reneging_time_distributions=[ciw.dists.Deterministic(2.5)],
+        )
+        Q = ciw.Simulation(N)
+        events = []
+        for event in ["on_service_start", "on_renege", "on_shift_change"]:
+            Q.add_hook(event, lambda node, ind, event=event: events.append((event, ind if ind is None else ind.id_number, Q.current_time)))
+        Q.simulate_until_max_time(10)
+        self.assertEqual(
+            events,
+            [
+                ("on_shift_change", None, 0.0),
+                ("on_service_start", 1, 1.0),
+                ("on_shift_change", None, 2.0),
+                ("on_shift_change", None, 3.0),
+                ("on_service_start", 1, 3.0),
+                ("on_renege", 2, 3.6),
+            ],
+        )
+
+        N = ciw.create_network(
+            arrival_distributions=[ciw.dists.Sequential([1.0, float("inf")])],
+            service_distributions=[ciw.dists.Deterministic(2.0)],
+            number_of_servers=[ciw.Schedule(numbers_of_servers=[0, 1], shift_end_dates=[2.0, 10.0])],
+        )
+        Q = ciw.Simulation(N)
+        starts = []
+        Q.add_hook("on_service_start", lambda node, ind: starts.append((ind.id_number, Q.current_time)))
+        Q.simulate_until_max_time(10)
+        self.assertEqual(starts, [(1, 2.0)])
+
+    def test_hooks_at_preemption_and_slotted_services(self):
+        N = ciw.create_network(
+            arrival_distributions={
+                "Low": [ciw.dists.Sequential([1.0, float("inf")])],
+                "High": [ciw.dists.Sequential([1.5, float("inf")])],
+            },
+            service_distributions={"Low": [ciw.dists.Deterministic(1.0)], "High": [ciw.dists.Deterministic(1.0)]},
+            number_of_servers=[1],
+            priority_classes=({"Low": 1, "High": 0}, ["restart"]),
+        )
+        Q = ciw.Simulation(N)
+        starts = []
+        Q.add_hook("on_service_start", lambda node, ind: starts.append((ind.customer_class, Q.current_time)))
+        Q.simulate_until_max_time(10)
+        self.assertEqual(starts, [("Low", 1.0), ("High", 1.5), ("Low", 2.5)])
+
+        N = ciw.create_network(
+            arrival_distributions=[ciw.dists.Sequential([0.5, 0.1, float("inf")])],
+            service_distributions=[ciw.dists.Deterministic(0.3)],
+            number_of_servers=[ciw.Slotted(slots=[1.0, 2.0], slot_sizes=[1, 1])],
+        )
+        Q = ciw.Simulation(N)
+        starts = []
+        Q.add_hook("on_service_start", lambda node, ind: starts.append((ind.id_number, Q.current_time)))
+        Q.simulate_until_max_time(3)
+        self.assertEqual(starts, [(1, 1.0), (2, 2.0)])
+
+    def test_hooks_processor_sharing(self):
+        N = ciw.create_network(
+            arrival_distributions=[ciw.dists.Sequential([1.0, 0.1, float("inf")])],
+            service_distributions=[ciw.dists.Deterministic(1.0)],
+            number_of_servers=[1],
+        )
+        Q = ciw.Simulation(N, node_class=ciw.PSNode)
+        starts = []
+        Q.add_hook("on_service_start", lambda node, ind: starts.append((ind.id_number, Q.current_time)))
+        Q.simulate_until_max_time(10)
+        self.assertEqual(starts, [(1, 1.0), (2, 2.0)])
+
+    def test_add_hook_raises_error(self):
+        N = ciw.create_network(
+            arrival_distributions=[ciw.dists.Exponential(1.0)],
+            service_distributions=[ciw.dists.Exponential(2.0)],
+            number_of_servers=[1],
+        )
+        Q = ciw.Simulation(N)
+        self.assertRaises(ValueError, Q.add_hook, "on_departure", print)
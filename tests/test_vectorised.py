@@ -0,0 +1,292 @@
+import unittest
+import ciw
+import numpy as np
+
+
+def records_by_id(records):
+    return sorted(records, key=lambda r: r.id_number)
+
+
+class TestVectorised(unittest.TestCase):
+    def test_fifo_service_start_dates_single_server(self):
+        arrival_dates = np.array([1.0, 2.0, 2.5, 7.0])
+        service_times = np.array([2.0, 1.0, 3.0, 0.5])
+        starts, server_ids = ciw.vectorised.fifo_service_start_dates(arrival_dates, service_times, 1)
+        self.assertEqual(list(starts), [1.0, 3.0, 4.0, 7.0])
+        self.assertEqual(list(server_ids), [1, 1, 1, 1])
+
+    def test_fifo_service_start_dates_multi_server(self):
+        arrival_dates = np.array([1.0, 2.0, 2.5, 3.0, 7.0])
+        service_times = np.array([2.0, 4.0, 3.0, 0.5, 0.5])
+        starts, server_ids = ciw.vectorised.fifo_service_start_dates(arrival_dates, service_times, 2)
+        self.assertEqual(list(starts), [1.0, 2.0, 3.0, 6.0, 7.0])
+        self.assertEqual(list(server_ids), [1, 2, 1, 1, 1])
+
+    def test_fifo_service_start_dates_infinite_servers(self):
+        arrival_dates = np.array([1.0, 2.0, 2.5])
+        service_times = np.array([2.0, 4.0, 3.0])
+        starts, server_ids = ciw.vectorised.fifo_service_start_dates(arrival_dates, service_times, float("inf"))
+        self.assertEqual(list(starts), [1.0, 2.0, 2.5])
+
+    def test_deterministic_destination(self):
+        self.assertEqual(ciw.vectorised.deterministic_destination(ciw.routing.Leave()), -1)
+        self.assertEqual(ciw.vectorised.deterministic_destination(ciw.routing.Direct(to=2)), 2)
+        self.assertEqual(ciw.vectorised.deterministic_destination(ciw.routing.Probabilistic([1, 2], [0.0, 1.0])), 2)
+        self.assertEqual(ciw.vectorised.deterministic_destination(ciw.routing.Probabilistic([1], [0.0])), -1)
+        self.assertIsNone(ciw.vectorised.deterministic_destination(ciw.routing.Probabilistic([1], [0.5])))
+        self.assertIsNone(ciw.vectorised.deterministic_destination(ciw.routing.Cycle([1, 2])))
+
+    def test_deterministic_route(self):
+        routing = ciw.routing.NetworkRouting(
+            [ciw.routing.Direct(to=3), ciw.routing.Leave(), ciw.routing.Probabilistic([2], [1.0])]
+        )
+        self.assertEqual(ciw.vectorised.deterministic_route(routing, 1), (1, 3, 2))
+        self.assertEqual(ciw.vectorised.deterministic_route(routing, 2), (2,))
+        routing = ciw.routing.NetworkRouting([ciw.routing.Direct(to=2), ciw.routing.Direct(to=1)])
+        self.assertIsNone(ciw.vectorised.deterministic_route(routing, 1))
+        routing = ciw.routing.NetworkRouting([ciw.routing.Direct(to=2), ciw.routing.Probabilistic([1], [0.5])])
+        self.assertIsNone(ciw.vectorised.deterministic_route(routing, 1))
+
+    def test_feed_forward_order(self):
+        self.assertEqual(ciw.vectorised.feed_forward_order([(1, 2, 3)], 3), [1, 2, 3])
+        self.assertEqual(ciw.vectorised.feed_forward_order([(3, 1), (2, 1)], 3), [3, 2, 1])
+        self.assertIsNone(ciw.vectorised.feed_forward_order([(1, 2), (2, 1)], 2))
+        self.assertIsNone(ciw.vectorised.feed_forward_order([(1, 2, 1)], 2))
+
+    def test_fast_path_matches_event_engine(self):
+        """
+        With the same sequences of inter-arrival and service times, the fast
+        path and the event engine give exactly the same records.
+        """
+        ciw.seed(3)
+        interarrivals = list(ciw.rng.exponential(1.0, 300))
+        services = list(ciw.rng.exponential(2.0, 300))
+        for c in [1, 2, 3, float("inf")]:
+            all_records, utilisations = [], []
+            for fast_path in [False, True]:
+                N = ciw.create_network(
+                    arrival_distributions=[ciw.dists.Sequential(interarrivals)],
+                    service_distributions=[ciw.dists.Sequential(services)],
+                    number_of_servers=[c],
+                )
+                Q = ciw.Simulation(N, fast_path=fast_path)
+                self.assertEqual(Q.fast_path, fast_path)
+                Q.simulate_until_max_time(150)
+                all_records.append(records_by_id(Q.get_all_records(include_incomplete=True)))
+                utilisations.append(Q.transitive_nodes[0].server_utilisation)
+            self.assertEqual(len(all_records[0]), len(all_records[1]))
+            for engine_record, fast_record in zip(*all_records):
+                for field in engine_record._fields:
+                    engine_value = getattr(engine_record, field)
+                    fast_value = getattr(fast_record, field)
+                    if isinstance(engine_value, float) and isinstance(fast_value, float):
+                        self.assertAlmostEqual(engine_value, fast_value)
+                    else:
+                        self.assertEqual(engine_value, fast_value)
+            if c == float("inf"):
+                self.assertIsNone(utilisations[1])
+            else:
+                self.assertAlmostEqual(utilisations[0], utilisations[1])
+
+    def test_fast_path_multiple_classes(self):
+        N = ciw.create_network(
+            arrival_distributions={
+                "A": [ciw.dists.Exponential(1.0)],
+                "B": [ciw.dists.Deterministic(0.5)],
+                "C": [None],
+            },
+            service_distributions={
+                "A": [ciw.dists.Exponential(5.0)],
+                "B": [ciw.dists.Uniform(0.1, 0.2)],
+                "C": [ciw.dists.Exponential(5.0)],
+            },
+            routing={"A": [[0.0]], "B": [[0.0]], "C": [[0.0]]},
+            number_of_servers=[2],
+        )
+        ciw.seed(0)
+        Q = ciw.Simulation(N, fast_path=True)
+        self.assertTrue(Q.fast_path)
+        Q.simulate_until_max_time(100)
+        recs = Q.get_all_records()
+        self.assertEqual(Q.nodes[0].number_of_individuals_per_class["B"], 199)
+        self.assertEqual(sum(r.customer_class == "B" for r in recs), 199)
+        self.assertEqual(set(r.customer_class for r in recs), {"A", "B"})
+        self.assertEqual([r.exit_date for r in recs], sorted(r.exit_date for r in recs))
+        self.assertEqual(len(set(r.id_number for r in recs)), len(recs))
+        self.assertEqual(Q.get_all_records(only=["baulk"]), [])
+        self.assertEqual(Q.nodes[-1].number_of_completed_individuals, len(recs))
+
+    def test_fast_path_incomplete_records(self):
+        N = ciw.create_network(
+            arrival_distributions=[ciw.dists.Deterministic(1.0)],
+            service_distributions=[ciw.dists.Deterministic(2.5)],
+            number_of_servers=[1],
+        )
+        Q = ciw.Simulation(N, fast_path=True)
+        Q.simulate_until_max_time(6.5)
+        self.assertEqual([r.id_number for r in Q.get_all_records()], [1, 2])
+        incomplete = Q.get_all_records(only=[], include_incomplete=True)
+        self.assertEqual([r.id_number for r in incomplete], [3, 4, 5, 6])
+        self.assertEqual([r.service_start_date for r in incomplete], [6.0, None, None, None])
+        self.assertEqual(Q.transitive_nodes[0].number_of_individuals, 4)
+        self.assertEqual(Q.current_time, 6.5)
+
+    def test_fast_path_cannot_resume(self):
+        N = ciw.create_network(
+            arrival_distributions=[ciw.dists.Exponential(1.0)],
+            service_distributions=[ciw.dists.Exponential(2.0)],
+            number_of_servers=[1],
+        )
+        Q = ciw.Simulation(N, fast_path=True)
+        Q.simulate_until_max_time(10)
+        self.assertRaises(ValueError, Q.simulate_until_max_time, 20)
+
+    def test_fast_path_falls_back_to_event_engine(self):
+        def network(**kwargs):
+            params = {
+                "arrival_distributions": [ciw.dists.Exponential(1.0)],
+                "service_distributions": [ciw.dists.Exponential(2.0)],
+                "number_of_servers": [1],
+            }
+            params.update(kwargs)
+            return ciw.create_network(**params)
+
+        ineligible = [
+            (network(number_of_servers=[1, 1], arrival_distributions=[ciw.dists.Exponential(1.0)] * 2, service_distributions=[ciw.dists.Exponential(2.0)] * 2, routing=[[0.0, 0.5], [0.0, 0.0]]), {}),
+            (network(system_capacity=10), {}),
+            (network(), {"tracker": ciw.trackers.SystemPopulation()}),
+            (network(), {"profiler": ciw.Profiler()}),
+            (network(), {"exact": 26}),
+            (network(number_of_servers=[ciw.Schedule(numbers_of_servers=[1, 2], shift_end_dates=[5, 10])]), {}),
+            (network(queue_capacities=[5]), {}),
+            (network(service_disciplines=[ciw.disciplines.LIFO]), {}),
+            (network(baulking_functions=[lambda n, Q, next_ind, next_node: 0.0]), {}),
+            (network(batching_distributions=[ciw.dists.Deterministic(2)]), {}),
+            (network(arrival_distributions=[ciw.dists.Poisson(2.0)]), {}),
+            (network(service_distributions=[ciw.dists.Poisson(2.0)]), {}),
+            (network(routing=ciw.routing.FlexibleProcessBased(lambda ind, simulation: [], "any", "random")), {}),
+            (network(routing=[[0.5]]), {}),
+            (network(reneging_time_distributions=[ciw.dists.Deterministic(3.0)]), {}),
+            (network(arrival_distributions=[None]), {}),
+        ]
+        for N, kwargs in ineligible:
+            Q = ciw.Simulation(N, fast_path=True, **kwargs)
+            self.assertFalse(Q.fast_path)
+
+        Q = ciw.Simulation(network(), fast_path=True)
+        self.assertTrue(Q.fast_path)
+        arrivals = []
+        Q.add_hook("on_arrival", lambda node, ind: arrivals.append(ind))
+        self.assertFalse(ciw.vectorised.is_vectorisable(Q))
+        self.assertFalse(Q.fast_path)
+        Q.simulate_until_max_time(20)
+        self.assertIsNone(Q.fast_path_records)
+        self.assertEqual(len(arrivals), len(Q.get_all_records()) + len(Q.transitive_nodes[0].all_individuals))
+
+        N = network(class_change_matrices=[{"A": {"A": 0.0, "B": 1.0}, "B": {"A": 1.0, "B": 0.0}}], arrival_distributions={"A": [ciw.dists.Exponential(1.0)], "B": [ciw.dists.Exponential(1.0)]}, service_distributions={"A": [ciw.dists.Exponential(2.0)], "B": [ciw.dists.Exponential(2.0)]})
+        self.assertFalse(ciw.Simulation(N, fast_path=True).fast_path)
+
+    def test_fast_path_matches_event_engine_for_feed_forward_networks(self):
+        ciw.seed(4)
+        sequences = [list(ciw.rng.exponential(1.0, 300)) for _ in range(9)]
+        routings = [
+            {
+                "A": ciw.routing.NetworkRouting([ciw.routing.Direct(to=2), ciw.routing.Direct(to=3), ciw.routing.Leave()]),
+                "B": ciw.routing.TransitionMatrix([[0.0, 0.0, 1.0], [0.0, 0.0, 1.0], [0.0, 0.0, 0.0]]),
+            },
+            {
+                "A": ciw.routing.ProcessBased(lambda ind, simulation: [2, 3] if ind.starting_node == 1 and ind.id_number % 2 else [3]),
+                "B": ciw.routing.ProcessBased(lambda ind, simulation: [3]),
+            },
+            {
+                "A": ciw.routing.ProcessBased(
+                    lambda ind, simulation: "long" if ind.starting_node == 1 and ind.id_number % 2 else "short",
+                    routes={"long": [2, 3], "short": [3]},
+                ),
+                "B": ciw.routing.ProcessBased(lambda ind, simulation: 0, routes=[[3]]),
+            },
+        ]
+        for routing in routings:
+            all_records, utilisations = [], []
+            for fast_path in [False, True]:
+                N = ciw.create_network(
+                    arrival_distributions={
+                        "A": [ciw.dists.Sequential(sequences[0]), ciw.dists.Sequential(sequences[1]), None],
+                        "B": [ciw.dists.Sequential(sequences[2]), None, None],
+                    },
+                    service_distributions={
+                        "A": [ciw.dists.Sequential([s / 2 for s in sequences[k]]) for k in range(3, 6)],
+                        "B": [ciw.dists.Sequential([s / 2 for s in sequences[k]]) for k in range(6, 9)],
+                    },
+                    number_of_servers=[1, 2, float("inf")],
+                    routing=routing,
+                )
+                Q = ciw.Simulation(N, fast_path=fast_path)
+                Q.simulate_until_max_time(100)
+                self.assertEqual(Q.fast_path, fast_path)
+                all_records.append(
+                    sorted(Q.get_all_records(include_incomplete=True), key=lambda r: (r.id_number, r.node))
+                )
+                utilisations.append([node.server_utilisation for node in Q.transitive_nodes])
+            self.assertEqual(len(all_records[0]), len(all_records[1]))
+            for engine_record, fast_record in zip(*all_records):
+                for field in engine_record._fields:
+                    engine_value = getattr(engine_record, field)
+                    fast_value = getattr(fast_record, field)
+                    if isinstance(engine_value, float) and isinstance(fast_value, float):
+                        self.assertAlmostEqual(engine_value, fast_value)
+                    else:
+                        self.assertEqual(engine_value, fast_value)
+            self.assertAlmostEqual(utilisations[0][0], utilisations[1][0])
+            self.assertAlmostEqual(utilisations[0][1], utilisations[1][1])
+            self.assertIsNone(utilisations[1][2])
+
+    def test_fast_path_falls_back_for_networks_that_are_not_feed_forward(self):
+        N = ciw.create_network(
+            arrival_distributions=[ciw.dists.Exponential(1.0), ciw.dists.Exponential(1.0)],
+            service_distributions=[ciw.dists.Exponential(2.0), ciw.dists.Exponential(2.0)],
+            number_of_servers=[1, 1],
+            routing=[[0.0, 1.0], [1.0, 0.0]],
+        )
+        self.assertFalse(ciw.Simulation(N, fast_path=True).fast_path)
+
+        N = ciw.create_network(
+            arrival_distributions={
+                "A": [ciw.dists.Exponential(1.0), None],
+                "B": [None, ciw.dists.Exponential(1.0)],
+            },
+            service_distributions={
+                "A": [ciw.dists.Exponential(2.0), ciw.dists.Exponential(2.0)],
+                "B": [ciw.dists.Exponential(2.0), ciw.dists.Exponential(2.0)],
+            },
+            number_of_servers=[1, 1],
+            routing={"A": [[0.0, 1.0], [0.0, 0.0]], "B": [[0.0, 0.0], [1.0, 0.0]]},
+        )
+        self.assertFalse(ciw.Simulation(N, fast_path=True).fast_path)
+
+        N = ciw.create_network(
+            arrival_distributions=[ciw.dists.Exponential(1.0)],
+            service_distributions=[ciw.dists.Exponential(2.0)],
+            number_of_servers=[1],
+            routing=ciw.routing.ProcessBased(lambda ind, simulation: [1]),
+        )
+        ciw.seed(0)
+        Q = ciw.Simulation(N, fast_path=True)
+        self.assertTrue(Q.fast_path)
+        self.assertRaises(ValueError, Q.simulate_until_max_time, 20)
+        self.assertIsNone(Q.fast_path_records)
+
+        N = ciw.create_network(
+            arrival_distributions=[ciw.dists.Sequential([1, 2, 3]), None],
+            service_distributions=[ciw.dists.Deterministic(0.5), ciw.dists.Deterministic(0.5)],
+            number_of_servers=[1, 1],
+            routing=ciw.routing.ProcessBased(lambda ind, simulation: [2] if ind.id_number < 3 else [2, 1]),
+        )
+        Q = ciw.Simulation(N, fast_path=True)
+        self.assertRaises(ValueError, Q.simulate_until_max_time, 11)
+        Q = ciw.Simulation(N)
+        Q.simulate_until_max_time(11)
+        first_arrivals = {}
+        for r in Q.get_all_records(only=["service", "incomplete"], include_incomplete=True):
+            first_arrivals.setdefault(r.id_number, r.arrival_date)
+        self.assertEqual(sorted(first_arrivals.values()), [1, 3, 6, 7, 9])